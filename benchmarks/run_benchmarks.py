@@ -0,0 +1,278 @@
+# benchmarks/run_benchmarks.py
+# Sıcak yollar için bağımsız benchmark koşucusu (pytest-benchmark gerektirmez).
+# Senaryolar harita boyutu x birim sayısı matrisidir (15x10 ... 500x500, 5 ... 2000 birim); her senaryo
+# tohumlu olarak üretilir: insan birimleri haritanın sol, AI birimleri sağ üçte birinde, ~%8 engel.
+# Ölçülenler:
+#   movement_range / attack_range / attack_zone   Unit.get_tiles_in_movement_range / ..._attack_range / get_attack_zone_coordinates
+#   threat_rebuild / threat_coords                  ThreatMap (eski Game._calculate_ai_threat_tiles'ın yerini aldı)
+#   choose_action[<strateji>]                       her AIStrategy.choose_action (arama stratejileri --include-search ile)
+#   ai_turn                                         bütün AI turu, beklemesiz (process_ai_turn'un fast mode karşılığı)
+#   save_load                                       save_format ile kaydet + oku + haritayı yeniden kur
+#   render_gameplay                                 pygame kuruluysa SDL dummy video sürücüsüyle Game.render_gameplay
+# Sonuçlar JSON olarak yazılır; --compare ile önceki bir sonuç dosyasına göre oranlar basılır:
+#   python benchmarks/run_benchmarks.py --quick --out bench.json --compare old.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCH_DIR), "src")
+if SRC_DIR not in sys.path: sys.path.insert(0, SRC_DIR)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # pygame kuruluysa pencere açılmasın
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game_core import save_format  # noqa: E402
+from game_core.constants import PLAYER_HUMAN_ID, PLAYER_AI_ID  # noqa: E402
+from game_core.game_state import GameState  # noqa: E402
+from game_core.map import Map  # noqa: E402
+from game_core.threat_map import ThreatMap  # noqa: E402
+from game_core.unit import Unit  # noqa: E402
+
+MAP_SIZES = ((15, 10), (50, 50), (150, 150), (500, 500))  # (cols, rows)
+UNIT_COUNTS = (5, 50, 500, 2000)
+QUICK_MAP_SIZES = MAP_SIZES[:2]
+QUICK_UNIT_COUNTS = UNIT_COUNTS[:2]
+UNIT_TYPES = ("Piyade", "Tank", "Topcu")
+FAST_STRATEGIES = ("SimpleAggressiveStrategy", "DefensiveStrategy")
+SEARCH_STRATEGIES = ("LookaheadStrategy", "MCTSStrategy")
+SEARCH_MAX_UNITS = 50  # Arama stratejileri süre bütçelidir; büyük senaryolarda sadece bütçeyi ölçerler
+OBSTACLE_RATIO = 0.08
+TARGET_SECONDS = 0.05  # Bir ölçüm turunun en az süresi (döngü sayısı buna göre ayarlanır)
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def build_level_data(cols, rows, unit_count, seed):
+    rng = random.Random(seed)
+    third = max(1, cols // 3)
+    cells = {"player": [(x, y) for x in range(third) for y in range(rows)],
+             "ai": [(x, y) for x in range(cols - third, cols) for y in range(rows)]}
+    per_side = {"player": (unit_count + 1) // 2, "ai": unit_count // 2}
+    level_data = {"level_name": f"bench {cols}x{rows}/{unit_count}", "map_cols": cols, "map_rows": rows,
+                  "player_units": [], "ai_units": []}
+    taken = set()
+    for side, key, player_id in (("player", "player_units", PLAYER_HUMAN_ID), ("ai", "ai_units", PLAYER_AI_ID)):
+        for x, y in rng.sample(cells[side], min(per_side[side], len(cells[side]))):
+            level_data[key].append({"type": rng.choice(UNIT_TYPES), "grid_pos": [x, y], "player_id": player_id,
+                                    "strategy_id": rng.choice(FAST_STRATEGIES)})
+            taken.add((x, y))
+    middle = [(x, y) for x in range(third, cols - third) for y in range(rows)]
+    level_data["obstacles"] = [list(cell) for cell in rng.sample(middle, int(len(middle) * OBSTACLE_RATIO))
+                               if cell not in taken]
+    return level_data
+
+
+def build_state(cols, rows, unit_count, seed):
+    state = GameState()
+    Unit._id_counter = 0
+    with quiet():
+        state.setup_level(1, build_level_data(cols, rows, unit_count, seed), is_new_game_session=True, seed=seed)
+    return state
+
+
+def measure(func, repeat, setup=None):
+    """func'ı en az TARGET_SECONDS sürecek kadar döngüyle repeat kez ölçer; çağrı başına süreler döndürür.
+    setup verilirse her çağrıdan önce (ölçüm dışında) çalışır ve döngü sayısı 1 olur."""
+    loops = 1
+    if setup is None:
+        while True:
+            with quiet():
+                started = time.perf_counter()
+                for _ in range(loops): func()
+                elapsed = time.perf_counter() - started
+            if elapsed >= TARGET_SECONDS or loops >= 1 << 20: break
+            loops *= 2 if elapsed > TARGET_SECONDS / 10 else 10
+    samples = []
+    for _ in range(repeat):
+        with quiet():
+            if setup is None:
+                started = time.perf_counter()
+                for _ in range(loops): func()
+                samples.append((time.perf_counter() - started) / loops)
+            else:
+                setup()
+                started = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - started)
+    return loops, samples
+
+
+def _sample_units(state, player_id, count=8):
+    units = state.living_units(player_id)
+    step = max(1, len(units) // count)
+    return units[::step][:count]
+
+
+def bench_scenario(cols, rows, unit_count, seed, repeat, include_search, name_filter):
+    state = build_state(cols, rows, unit_count, seed)
+    game_map = state.game_map
+    params = {"cols": cols, "rows": rows, "units": len(game_map.units), "seed": seed}
+    results = []
+
+    def run(name, func, setup=None):
+        if name_filter and name_filter not in name: return
+        loops, samples = measure(func, repeat, setup)
+        results.append({"name": name, "params": params, "loops": loops, "repeat": repeat,
+                        "min_s": min(samples), "median_s": statistics.median(samples),
+                        "mean_s": statistics.fmean(samples)})
+
+    ai_units = _sample_units(state, PLAYER_AI_ID)
+    run("movement_range", lambda: [u.get_tiles_in_movement_range(game_map) for u in ai_units])
+    run("attack_range", lambda: [u.get_tiles_in_attack_range(game_map) for u in ai_units])
+    run("attack_zone", lambda: [u.get_attack_zone_coordinates(game_map) for u in ai_units])
+
+    threat_map = ThreatMap(game_map, PLAYER_AI_ID)
+    run("threat_rebuild", threat_map.rebuild)
+
+    def threat_coords():
+        threat_map.version += 1  # Önbelleği atla: her seferinde yeniden hesapla
+        threat_map.threatened_coords()
+    run("threat_coords", threat_coords)
+
+    strategies = FAST_STRATEGIES + (SEARCH_STRATEGIES if include_search and unit_count <= SEARCH_MAX_UNITS else ())
+    for strategy_id in strategies:
+        strategy = state.ai_strategies[strategy_id]
+        if strategy_id == "MCTSStrategy": strategy.search.workers = 1
+        state.current_player_id = PLAYER_AI_ID
+        run(f"choose_action[{strategy_id}]", lambda: [strategy.choose_action(u, state) for u in ai_units])
+
+    turn_state = {}
+
+    def fresh_turn():
+        turn_state["state"] = build_state(cols, rows, unit_count, seed)
+        turn_state["state"].current_player_id = PLAYER_AI_ID
+        turn_state["state"].reset_unit_actions_for_player(PLAYER_AI_ID)
+    run("ai_turn", lambda: turn_state["state"].play_ai_turn(PLAYER_AI_ID), setup=fresh_turn)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench_save.json")
+
+        def save_load():
+            data = save_format.build_save(game_map, [u for u in game_map.units if u.is_alive()],
+                                          current_player_id=state.current_player_id)
+            save_format.write_save(path, data)
+            loaded = save_format.read_save(path)
+            loaded_rows, loaded_cols, walkable, cost = save_format.decode_terrain(loaded["terrain"])
+            loaded_map = Map(loaded_rows, loaded_cols, game_map.tile_size)
+            loaded_map.create_grid_from_layers(walkable, cost)
+            for record in save_format.iter_unit_records(loaded):
+                unit = state.unit_factory.create_unit(record["unit_type"], record["grid_x"], record["grid_y"],
+                                                      record["player_id"])
+                loaded_map.add_unit(unit, unit.grid_x, unit.grid_y)
+        run("save_load", save_load)
+
+    results.extend(bench_render(state, params, repeat, name_filter))
+    return results
+
+
+_render_game = None
+_render_data_dir = None  # Game'in kullanıcı veritabanı/kayıt/günlük klasörleri: oyuncunun gerçek verisine dokunulmaz
+
+
+def bench_render(state, params, repeat, name_filter):
+    """pygame varsa Game.render_gameplay'i (soğuk: önbelleksiz ilk kare, sıcak: değişmeyen kare) ölçer."""
+    global _render_game, _render_data_dir
+    if name_filter and name_filter not in "render_gameplay": return []
+    try:
+        import pygame  # noqa: F401
+        from game_core.game import Game, GAME_STATE_GAMEPLAY
+    except ImportError:
+        return [{"name": "render_gameplay", "params": params, "skipped": "pygame not installed"}]
+    with quiet():
+        if _render_game is None:
+            _render_data_dir = tempfile.TemporaryDirectory(prefix="bench_render_")
+            _render_game = Game(screen_width=800, screen_height=600, data_dir=_render_data_dir.name)
+        game = _render_game
+        game.state = state
+        game.initialized_successfully = True
+        game.current_game_state = GAME_STATE_GAMEPLAY
+    results = []
+    for name, setup in (("render_gameplay[cold]", game.map_renderer.invalidate),
+                        ("render_gameplay[warm]", None)):
+        loops, samples = measure(game.render_gameplay, repeat, setup)
+        results.append({"name": name, "params": params, "loops": loops, "repeat": repeat, "min_s": min(samples),
+                        "median_s": statistics.median(samples), "mean_s": statistics.fmean(samples)})
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _result_key(result):
+    p = result["params"]
+    return result["name"], p["cols"], p["rows"], p["units"]
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {_result_key(r): r for r in json.load(f)["results"] if "median_s" in r}
+    print(f"\nCompared with {baseline_path} (median, new / old):")
+    for result in results:
+        old = baseline.get(_result_key(result))
+        if not old or "median_s" not in result: continue
+        ratio = result["median_s"] / old["median_s"] if old["median_s"] else float('inf')
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        name, cols, rows, units = _result_key(result)
+        print(f"  {name:<40} {cols}x{rows}/{units:<5} {ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time pathing, threat, AI, save/load and render hot paths.")
+    parser.add_argument("--quick", action="store_true", help="only the two smallest map sizes and unit counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--filter", default=None, help="only benchmarks whose name contains this text")
+    parser.add_argument("--include-search", action="store_true",
+                        help="also time LookaheadStrategy / MCTSStrategy (time-budgeted) on small scenarios")
+    parser.add_argument("--out", default=None, help="JSON output path (default: benchmarks/results/<rev>-<time>.json)")
+    parser.add_argument("--compare", default=None, help="previous JSON result to compare medians against")
+    args = parser.parse_args(argv)
+
+    map_sizes, unit_counts = (QUICK_MAP_SIZES, QUICK_UNIT_COUNTS) if args.quick else (MAP_SIZES, UNIT_COUNTS)
+    results = []
+    for cols, rows in map_sizes:
+        for unit_count in unit_counts:
+            if unit_count > cols * rows // 4: continue  # Harita bu kadar birimi sığdıramaz
+            started = time.perf_counter()
+            scenario = bench_scenario(cols, rows, unit_count, args.seed, args.repeat, args.include_search, args.filter)
+            results.extend(scenario)
+            print(f"{cols}x{rows} / {unit_count} units: {len(scenario)} benchmarks in {time.perf_counter() - started:.1f}s")
+            for result in scenario:
+                if "median_s" in result: print(f"    {result['name']:<40} {result['median_s'] * 1000:10.3f} ms")
+                else: print(f"    {result['name']:<40} skipped ({result['skipped']})")
+
+    revision = _git_revision()
+    report = {"meta": {"revision": revision, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "quick": args.quick, "repeat": args.repeat, "seed": args.seed},
+              "results": results}
+    out_path = args.out or os.path.join(BENCH_DIR, "results",
+                                        f"{revision or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {out_path}")
+    if args.compare: compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
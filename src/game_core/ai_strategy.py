@@ -1,15 +1,48 @@
 # src/game_core/ai_strategy.py
+import logging
 import random
+import time
 from .commands import MoveUnitCommand, AttackCommand
+from .search import SearchState, AlphaBetaSearch, ACTION_MOVE, ACTION_ATTACK
+from .mcts import RootParallelMCTS
+from .flow_field import UNREACHABLE
+from .influence_map import InfluenceMaps
 from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID  # Sabitleri import et
 
+logger = logging.getLogger(__name__)
+
 
 class AIStrategy:
     """Yapay zeka stratejileri için ana sınıf."""
+    # Kararı sadece birimlerin konum/canına bağlı stratejiler GameState.decision_cache'ten faydalanabilir
+    cache_decisions = True
 
     def choose_action(self, ai_unit, game_instance):
         raise NotImplementedError("Subclasses should implement this!")
 
+    def close(self):
+        """Stratejinin tuttuğu dış kaynakları (süreç havuzu vb.) bırakır; sonraki kararda gerekirse yeniden açılır."""
+        pass
+
+    @staticmethod
+    def enemy_threat_map(ai_unit, game_instance):
+        """Rakip oyuncunun tehdit haritası (GameState.threat_maps); yoksa None."""
+        threat_maps = getattr(game_instance, "threat_maps", None)
+        if not threat_maps: return None
+        enemy_id = PLAYER_HUMAN_ID if ai_unit.player_id == PLAYER_AI_ID else PLAYER_AI_ID
+        return threat_maps.get(enemy_id)
+
+    @staticmethod
+    def influence_maps(game_instance):
+        """Güncel etki haritaları (GameState.influence_maps); yoksa o an için kurulur."""
+        cache = getattr(game_instance, "influence_maps", None)
+        return cache.current() if cache else InfluenceMaps(game_instance.game_map)
+
+    @staticmethod
+    def random_source(game_instance):
+        """Oyunun tohumlu RNG'si (GameState.rng); yoksa random modülü. Tekrar oynatma için stratejiler bunu kullanmalı."""
+        return getattr(game_instance, "rng", None) or random
+
 
 class SimpleAggressiveStrategy(AIStrategy):
     def choose_action(self, ai_unit, game_instance):
@@ -27,22 +60,26 @@ class SimpleAggressiveStrategy(AIStrategy):
             killable_targets = [t for t in potential_targets if t.health <= ai_unit.attack_power]
             if killable_targets:
                 best_target = min(killable_targets, key=lambda t: t.health)
-                print(
-                    f"AI (Aggressive ID:{ai_unit.id}) -> ATTACK (Killable): {best_target.unit_type} (ID:{best_target.id})")
+                logger.debug("AI (Aggressive ID:%s) -> ATTACK (Killable): %s (ID:%s)", ai_unit.id,
+                             best_target.unit_type, best_target.id)
                 return AttackCommand(ai_unit, best_target, game_map)
             best_target = min(potential_targets, key=lambda t: t.health)
-            print(
-                f"AI (Aggressive ID:{ai_unit.id}) -> ATTACK (Lowest HP): {best_target.unit_type} (ID:{best_target.id})")
+            logger.debug("AI (Aggressive ID:%s) -> ATTACK (Lowest HP): %s (ID:%s)", ai_unit.id, best_target.unit_type,
+                         best_target.id)
             return AttackCommand(ai_unit, best_target, game_map)
 
-        enemy_units = [u for u in game_map.units if u.player_id == PLAYER_HUMAN_ID and u.is_alive()]
-        if not enemy_units: print(f"AI (Aggressive ID:{ai_unit.id}) -> No enemies for movement."); return None
+        nearest = game_map.spatial_index.nearest(ai_unit.grid_x, ai_unit.grid_y, 1, enemy_of=ai_unit.player_id)
+        if not nearest: logger.debug("AI (Aggressive ID:%s) -> No enemies for movement.", ai_unit.id); return None
+
+        closest_enemy = nearest[0]
+        min_distance = abs(ai_unit.grid_x - closest_enemy.grid_x) + abs(ai_unit.grid_y - closest_enemy.grid_y)
 
-        closest_enemy = None;
-        min_distance = float('inf')
-        for enemy in enemy_units:
-            distance = abs(ai_unit.grid_x - enemy.grid_x) + abs(ai_unit.grid_y - enemy.grid_y)
-            if distance < min_distance: min_distance = distance; closest_enemy = enemy
+        handled, flow_move = self._flow_field_move(ai_unit, game_instance)
+        if handled:
+            if flow_move is None: logger.debug("AI (Aggressive ID:%s) -> HOLD (no closer tile)", ai_unit.id); return None
+            logger.debug("AI (Aggressive ID:%s) -> MOVE to (%s,%s) along flow field", ai_unit.id, flow_move.x_grid,
+                         flow_move.y_grid)
+            return MoveUnitCommand(ai_unit, flow_move.x_grid, flow_move.y_grid, game_map)
 
         if closest_enemy:
             possible_next_steps = []
@@ -57,7 +94,8 @@ class SimpleAggressiveStrategy(AIStrategy):
             elif closest_enemy.grid_y < ai_unit.grid_y:
                 preferred_steps.append((ai_unit.grid_x, ai_unit.grid_y - 1))
 
-            random.shuffle(preferred_steps)  # Biraz rastgelelik katmak için
+            rng = self.random_source(game_instance)
+            rng.shuffle(preferred_steps)  # Biraz rastgelelik katmak için
 
             valid_move_tiles = ai_unit.get_tiles_in_movement_range(game_map)
             best_move_tile_obj = None
@@ -74,17 +112,47 @@ class SimpleAggressiveStrategy(AIStrategy):
                     if new_dist < current_min_dist_to_target:
                         temp_best_moves.append(tile_obj)
                 if temp_best_moves:
-                    best_move_tile_obj = random.choice(temp_best_moves)
+                    # Yaklaştıran kareler arasından düşman tehdidi en az olanları tercih et
+                    threat_map = self.enemy_threat_map(ai_unit, game_instance)
+                    if threat_map:
+                        least_threat = min(threat_map.threat_count(t.x_grid, t.y_grid) for t in temp_best_moves)
+                        temp_best_moves = [t for t in temp_best_moves
+                                           if threat_map.threat_count(t.x_grid, t.y_grid) == least_threat]
+                    best_move_tile_obj = rng.choice(temp_best_moves)
                 elif valid_move_tiles:
-                    best_move_tile_obj = random.choice(valid_move_tiles)  # En kötü rastgele bir geçerli hamle
+                    best_move_tile_obj = rng.choice(valid_move_tiles)  # En kötü rastgele bir geçerli hamle
 
             if best_move_tile_obj:
-                print(
-                    f"AI (Aggressive ID:{ai_unit.id}) -> MOVE to ({best_move_tile_obj.x_grid},{best_move_tile_obj.y_grid}) towards {closest_enemy.unit_type} (ID:{closest_enemy.id})")
+                logger.debug("AI (Aggressive ID:%s) -> MOVE to (%s,%s) towards %s (ID:%s)", ai_unit.id,
+                             best_move_tile_obj.x_grid, best_move_tile_obj.y_grid,
+                             closest_enemy.unit_type, closest_enemy.id)
                 return MoveUnitCommand(ai_unit, best_move_tile_obj.x_grid, best_move_tile_obj.y_grid, game_map)
-        print(f"AI (Aggressive ID:{ai_unit.id}) -> No action decided.");
+        logger.debug("AI (Aggressive ID:%s) -> No action decided.", ai_unit.id);
         return None
 
+    def _flow_field_move(self, ai_unit, game_instance):
+        """Düşmanlara olan akış alanına (GameState.flow_fields) göre ulaşılabilir en iyi kare.
+        (False, None): alan yok ya da hiçbir düşmana yol yok (eski adım mantığı kullanılır);
+        (True, None): yerinde durmak en iyisi; (True, tile): gidilecek kare."""
+        flow_fields = getattr(game_instance, "flow_fields", None)
+        if not flow_fields: return False, None
+        enemy_id = PLAYER_HUMAN_ID if ai_unit.player_id == PLAYER_AI_ID else PLAYER_AI_ID
+        field = flow_fields.toward(enemy_id)
+        threat_map = self.enemy_threat_map(ai_unit, game_instance)
+
+        def score(grid_x, grid_y):  # Saldırı menzili içindeki kareler eşit iyi; eşitlikte daha az tehdit
+            distance = field.distance_at(grid_x, grid_y)
+            if distance == UNREACHABLE: return None
+            return max(0, distance - ai_unit.attack_range, ai_unit.min_attack_range - distance), threat_map.threat_count(grid_x, grid_y) if threat_map else 0
+
+        candidates = [(score(t.x_grid, t.y_grid), t) for t in ai_unit.get_tiles_in_movement_range(game_instance.game_map)]
+        candidates = [(key, t) for key, t in candidates if key is not None]
+        current = score(ai_unit.grid_x, ai_unit.grid_y)
+        if not candidates: return current is not None, None
+        best_key = min(key for key, _ in candidates)
+        if current is not None and best_key >= current: return True, None
+        return True, self.random_source(game_instance).choice([t for key, t in candidates if key == best_key])
+
 
 class DefensiveStrategy(AIStrategy):
     def choose_action(self, ai_unit, game_instance):
@@ -92,9 +160,8 @@ class DefensiveStrategy(AIStrategy):
             return None
 
         game_map = game_instance.game_map
-        enemy_units_in_map = [u for u in game_map.units if u.player_id == PLAYER_HUMAN_ID and u.is_alive()]
-        if not enemy_units_in_map:
-            # print(f"AI (ID:{ai_unit.id}) [Defensive] -> No enemies on map. Holding position.") # Bu logu azaltabiliriz
+        if not game_map.spatial_index.has_enemies(ai_unit.player_id):
+            logger.debug("AI (ID:%s) [Defensive] -> No enemies on map. Holding position.", ai_unit.id)
             return None
 
         attackable_tiles = ai_unit.get_tiles_in_attack_range(game_map)
@@ -109,64 +176,133 @@ class DefensiveStrategy(AIStrategy):
             killable_targets = [t for t in potential_targets if t.health <= ai_unit.attack_power]
             if killable_targets:
                 best_target = min(killable_targets, key=lambda t: t.health)
-                print(
-                    f"AI (ID:{ai_unit.id}) [Defensive] -> ATTACK (Killable): {best_target.unit_type} (ID:{best_target.id})")
+                logger.debug("AI (ID:%s) [Defensive] -> ATTACK (Killable): %s (ID:%s)", ai_unit.id,
+                             best_target.unit_type, best_target.id)
                 return AttackCommand(ai_unit, best_target, game_map)
 
             # Eğer canı %50'den fazlaysa veya düşmanın canı AI'nın canından daha azsa, saldır
             best_target_overall = min(potential_targets, key=lambda t: t.health)
             if ai_unit.health > ai_unit.max_health * 0.5 or best_target_overall.health < ai_unit.health:
-                print(
-                    f"AI (ID:{ai_unit.id}) [Defensive] -> ATTACK (Advantageous): {best_target_overall.unit_type} (ID:{best_target_overall.id})")
+                logger.debug("AI (ID:%s) [Defensive] -> ATTACK (Advantageous): %s (ID:%s)", ai_unit.id,
+                             best_target_overall.unit_type, best_target_overall.id)
                 return AttackCommand(ai_unit, best_target_overall, game_map)
             else:  # Canı az ve bariz avantaj yoksa, geri çekilmeyi düşün
-                print(
-                    f"AI (ID:{ai_unit.id}) [Defensive] -> Targets in range, but low health/no clear advantage. Considering retreat.")
-
-        # Geri Çekilme Mantığı (Eğer canı azsa veya saldıracak avantajlı hedef yoksa ve yakın tehdit varsa)
-        is_threatened_closely = False
-        closest_enemy_for_retreat = None
-        if enemy_units_in_map:
-            closest_enemy_for_retreat = min(enemy_units_in_map, key=lambda e: abs(ai_unit.grid_x - e.grid_x) + abs(
-                ai_unit.grid_y - e.grid_y))
-            distance_to_closest = abs(ai_unit.grid_x - closest_enemy_for_retreat.grid_x) + abs(
-                ai_unit.grid_y - closest_enemy_for_retreat.grid_y)
-            # Tehdit, düşmanın bir sonraki turda saldırabileceği kadar yakın olması demek olabilir.
-            # Şimdilik, düşmanın hareket + saldırı menzili içinde olup olmadığımızı kabaca kontrol edelim.
-            # Ortalama bir düşman piyadesinin hareket+saldırı menzili 3+1=4 diyelim.
-            if distance_to_closest <= 4:  # Eğer düşman 4 kare veya daha yakınsa tehdit var sayalım
-                is_threatened_closely = True
-
-        # Sadece canı %60'ın altındaysa VE yakın tehdit varsa geri çekilmeyi ciddi düşün
-        if ai_unit.health <= ai_unit.max_health * 0.6 and is_threatened_closely:
-            print(
-                f"AI (ID:{ai_unit.id}) [Defensive] -> Attempting to RETREAT (Health: {ai_unit.health}, Threatened Closely).")
+                logger.debug("AI (ID:%s) [Defensive] -> Targets in range, but low health/no clear advantage. "
+                             "Considering retreat.", ai_unit.id)
 
-            valid_move_tiles = ai_unit.get_tiles_in_movement_range(game_map)
-            possible_retreat_moves = []
-            current_distance_from_closest = abs(ai_unit.grid_x - closest_enemy_for_retreat.grid_x) + abs(
-                ai_unit.grid_y - closest_enemy_for_retreat.grid_y)
-
-            for tile_obj in valid_move_tiles:
-                new_distance_from_closest = abs(tile_obj.x_grid - closest_enemy_for_retreat.grid_x) + abs(
-                    tile_obj.y_grid - closest_enemy_for_retreat.grid_y)
-                # Daha uzağa GİDEBİLİYORSA VE o kare başka bir düşmanın direkt saldırı menzilinde değilse
-                # (Bu ikinci kontrol şimdilik eklenmedi, karmaşıklığı artırır)
-                if new_distance_from_closest > current_distance_from_closest:
-                    possible_retreat_moves.append(tile_obj)
+        # Geri Çekilme Mantığı: tehdit ve güvenli kare, tur başına bir kez kurulan etki haritalarından okunur
+        influence = self.influence_maps(game_instance)
+        player_id = ai_unit.player_id
+        incoming_here = influence.incoming_damage(player_id, ai_unit.grid_x, ai_unit.grid_y)
+        is_threatened_closely = incoming_here > 0  # Bir düşman bir sonraki turda (hareket + saldırı) buraya vurabilir
+
+        # Canı %60'ın altındayken tehdit varsa ya da gelebilecek hasar onu öldürecekse geri çekilmeyi düşün
+        if is_threatened_closely and (ai_unit.health <= ai_unit.max_health * 0.6 or incoming_here >= ai_unit.health):
+            logger.debug("AI (ID:%s) [Defensive] -> Attempting to RETREAT (Health: %s, incoming damage: %s).",
+                         ai_unit.id, ai_unit.health, incoming_here)
+
+            # Önce en az hasar gelebilecek kare, eşitlikte dost etkisinin en baskın olduğu kare
+            def retreat_key(tile_obj):
+                return (influence.incoming_damage(player_id, tile_obj.x_grid, tile_obj.y_grid),
+                        -influence.balance(player_id, tile_obj.x_grid, tile_obj.y_grid))
 
+            possible_retreat_moves = [t for t in ai_unit.get_tiles_in_movement_range(game_map)
+                                      if influence.incoming_damage(player_id, t.x_grid, t.y_grid) < incoming_here]
             if possible_retreat_moves:
-                best_retreat_tile = max(possible_retreat_moves,
-                                        key=lambda t: abs(t.x_grid - closest_enemy_for_retreat.grid_x) + abs(
-                                            t.y_grid - closest_enemy_for_retreat.grid_y))
-                print(
-                    f"AI (ID:{ai_unit.id}) [Defensive] -> RETREATING to ({best_retreat_tile.x_grid},{best_retreat_tile.y_grid})")
+                best_retreat_tile = min(possible_retreat_moves, key=retreat_key)
+                logger.debug("AI (ID:%s) [Defensive] -> RETREATING to (%s,%s)", ai_unit.id, best_retreat_tile.x_grid,
+                             best_retreat_tile.y_grid)
                 return MoveUnitCommand(ai_unit, best_retreat_tile.x_grid, best_retreat_tile.y_grid, game_map)
             else:
-                print(
-                    f"AI (ID:{ai_unit.id}) [Defensive] -> Wanted to retreat but no better tile found. Holding position.")
+                logger.debug("AI (ID:%s) [Defensive] -> Wanted to retreat but no safer tile found. Holding position.",
+                             ai_unit.id)
                 return None  # Kaçacak daha iyi yer yoksa pozisyonunu koru
 
         # Diğer tüm durumlarda (canı iyi, yakın tehdit yok veya saldıracak hedef yok vb.) pozisyonunu koru
-        print(f"AI (ID:{ai_unit.id}) [Defensive] -> HOLDING POSITION (Default defensive action).")
-        return None
\ No newline at end of file
+        logger.debug("AI (ID:%s) [Defensive] -> HOLDING POSITION (Default defensive action).", ai_unit.id)
+        return None
+
+class LookaheadStrategy(AIStrategy):
+    """Tarafın birimlerinin ortak eylem dizisini alfa-beta ile arar (search.py).
+    Turun ilk biriminde arama yapılır, bulunan plan sonraki birimler için hash'e göre saklanır;
+    durum plandan saparsa (ör. başka stratejili bir birim araya girdiyse) yeniden aranır."""
+    cache_decisions = False  # Kendi planını, sırası gelmemiş birimleri de içeren arama hash'iyle tutar
+
+    def __init__(self, turn_budget=0.5, max_depth=8, move_candidates=4):
+        self.turn_budget = turn_budget  # Tur başına toplam arama süresi (saniye)
+        self.search = AlphaBetaSearch(max_depth=max_depth, move_candidates=move_candidates)
+        self._plan = {}  # SearchState.hash -> eylem
+        self._budget_turn = None
+        self._budget_left = turn_budget
+
+    def _time_slice(self, game_instance, player_id):
+        turn_key = (id(game_instance), player_id, getattr(game_instance, "turns_taken_this_level", 0))
+        if turn_key != self._budget_turn:
+            self._budget_turn, self._budget_left = turn_key, self.turn_budget
+        return max(0.02, self._budget_left)  # Bütçe bittiyse bile en azından sığ bir arama yap
+
+    def choose_action(self, ai_unit, game_instance):
+        if not ai_unit.is_alive() or ai_unit.has_acted_this_turn: return None
+        game_map = game_instance.game_map
+        state = SearchState(game_instance, first_unit=ai_unit)
+        action = self._plan.get(state.hash)
+        if action is None or action[1] not in (-1, state.current_unit()):
+            time_slice = self._time_slice(game_instance, ai_unit.player_id)
+            started = time.perf_counter()
+            action, value = self.search.search(state, ai_unit.player_id, time_slice)
+            self._budget_left -= time.perf_counter() - started
+            self._plan = dict(self.search.principal_variation(state, ai_unit.player_id, limit=len(state.queue)))
+            logger.debug("AI (Lookahead ID:%s) searched depth %s, %s nodes, value %s", ai_unit.id,
+                         self.search.completed_depth, self.search.nodes, value)
+
+        kind, unit_index, arg = action
+        if kind == ACTION_ATTACK:
+            target = game_map.unit_by_id.get(state.ids[arg])
+            if target:
+                logger.debug("AI (Lookahead ID:%s) -> ATTACK: %s (ID:%s)", ai_unit.id, target.unit_type, target.id)
+                return AttackCommand(ai_unit, target, game_map)
+        elif kind == ACTION_MOVE:
+            target_x, target_y = arg % state.cols, arg // state.cols
+            logger.debug("AI (Lookahead ID:%s) -> MOVE to (%s,%s)", ai_unit.id, target_x, target_y)
+            return MoveUnitCommand(ai_unit, target_x, target_y, game_map)
+        logger.debug("AI (Lookahead ID:%s) -> HOLD", ai_unit.id)
+        return None
+
+
+class MCTSStrategy(AIStrategy):
+    """Her birim için Monte Carlo ağaç araması (mcts.py). Rollout'lar açgözlü politikayla oynanır;
+    arama kök paralel olarak süreç havuzuna dağıtılır, en çok ziyaret edilen kök eylemi seçilir.
+    AI turu zaten AITurnPipeline iş parçacığında hesaplandığından arama oyuncu turunu bloklamaz."""
+    cache_decisions = False  # Arama süreye bağlı ve süreçler arası: sonuç konumun saf fonksiyonu değil
+
+    def __init__(self, time_budget=0.3, iterations=None, workers=None, move_candidates=4, rollout_depth=20):
+        self.time_budget = time_budget  # Birim başına arama süresi (saniye); iterations verilirse o da sınırdır
+        self.iterations = iterations
+        self.search = RootParallelMCTS(workers=workers, move_candidates=move_candidates, rollout_depth=rollout_depth)
+
+    def close(self):
+        self.search.shutdown()
+
+    def choose_action(self, ai_unit, game_instance):
+        if not ai_unit.is_alive() or ai_unit.has_acted_this_turn: return None
+        game_map = game_instance.game_map
+        state = SearchState(game_instance, first_unit=ai_unit)
+        if state.is_terminal(): return None
+        seed = self.random_source(game_instance).getrandbits(32)  # Tohumlu oyunlarda işçi tohumları da sabit
+        action = self.search.search(state, ai_unit.player_id, self.time_budget, self.iterations, seed)
+        logger.debug("AI (MCTS ID:%s) %s playouts on %s worker(s)", ai_unit.id, self.search.last_playouts,
+                     max(1, self.search.workers))
+        if action is None: return None
+
+        kind, unit_index, arg = action
+        if kind == ACTION_ATTACK:
+            target = game_map.unit_by_id.get(state.ids[arg])
+            if target:
+                logger.debug("AI (MCTS ID:%s) -> ATTACK: %s (ID:%s)", ai_unit.id, target.unit_type, target.id)
+                return AttackCommand(ai_unit, target, game_map)
+        elif kind == ACTION_MOVE:
+            target_x, target_y = arg % state.cols, arg // state.cols
+            logger.debug("AI (MCTS ID:%s) -> MOVE to (%s,%s)", ai_unit.id, target_x, target_y)
+            return MoveUnitCommand(ai_unit, target_x, target_y, game_map)
+        logger.debug("AI (MCTS ID:%s) -> HOLD", ai_unit.id)
+        return None
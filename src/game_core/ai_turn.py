@@ -0,0 +1,112 @@
+# src/game_core/ai_turn.py
+# AI turunu ana döngüyü (çizim ve olay işleme) dondurmadan yürütür.
+# Kararlar (strategy.choose_action) arka plandaki bir iş parçacığında hesaplanır ve kuyruğa konur;
+# komutlar ise durumu sadece ana iş parçacığı değiştirsin diye ana döngüde, kare saatine göre uygulanır.
+import logging
+import queue
+import threading
+import time
+
+from .constants import PLAYER_AI_ID
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THINK_DELAY = 0.3  # Bir birimin kararı gösterilmeden önceki bekleme (saniye)
+DEFAULT_ACTION_DELAY = 0.6  # Bir eylem uygulandıktan sonraki bekleme (saniye)
+
+_STOP = object()
+
+
+class AITurnPipeline:
+    def __init__(self, state, player_id=PLAYER_AI_ID, think_delay=DEFAULT_THINK_DELAY,
+                 action_delay=DEFAULT_ACTION_DELAY, fast_mode=False):
+        self.state = state
+        self.player_id = player_id
+        # Hızlı modda (tekrar oynatma, testler) hiç bekleme yapılmaz
+        self.think_delay = 0 if fast_mode else think_delay
+        self.action_delay = 0 if fast_mode else action_delay
+        self.pending_units = list(state.units_to_act(player_id))
+        self.units_total = len(self.pending_units)
+        self.actions_taken = 0
+        self.finished = False
+        self._jobs = queue.Queue()
+        self._decisions = queue.Queue()
+        self._ready_decision = None  # (unit, command) - zamanı gelince uygulanacak
+        self._next_event_time = 0.0
+        self._worker = None
+
+    def start(self, now=None):
+        now = time.monotonic() if now is None else now
+        self._next_event_time = now + self.think_delay
+        self._worker = threading.Thread(target=self._work, name="ai-turn-worker", daemon=True)
+        self._worker.start()
+        self._request_next_decision()
+
+    def _work(self):
+        while True:
+            unit = self._jobs.get()
+            if unit is _STOP: return
+            try:
+                command = self.state.choose_ai_action(unit)
+            except Exception as e:  # Strateji hatası tüm oyunu düşürmesin, birim pas geçer
+                logger.warning("AI decision failed for unit %s: %s", unit.id, e)
+                command = None
+            self._decisions.put((unit, command))
+
+    def _request_next_decision(self):
+        while self.pending_units:
+            unit = self.pending_units.pop(0)
+            if unit.is_alive() and not unit.has_acted_this_turn:
+                self._jobs.put(unit)
+                return
+        self._finish()
+
+    def _finish(self):
+        self.finished = True
+        self._jobs.put(_STOP)
+        if self.player_id == PLAYER_AI_ID: self.state.ai_turn_processed_this_round = True
+
+    def cancel(self):
+        """Turu bitirir ve arka plandaki iş parçacığının çıkmasını bekler: dönüldüğünde GameState'e
+        (seviye kurulumu, kayıt yükleme) artık hiçbir AI kararı dokunmuyor olur."""
+        if not self.finished:
+            self.pending_units = []
+            self._finish()
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join()  # Sürmekte olan karar (Lookahead/MCTS ~0.3-0.5 sn) bitene kadar
+
+    def update(self, now=None):
+        """Ana döngüden her karede çağrılır. Bu karede uygulanan (unit, command, executed) üçlülerini döndürür."""
+        if self.finished: return []
+        now = time.monotonic() if now is None else now
+        applied = []
+        while not self.finished:
+            if self.state.game_over_flag:
+                self.cancel()
+                break
+            if self._ready_decision is None:
+                try:
+                    self._ready_decision = self._decisions.get_nowait()
+                except queue.Empty:
+                    break  # Karar hâlâ hesaplanıyor; bu kare beklemeden devam et
+            if now < self._next_event_time:
+                break  # Sıradaki eylemin gösterilme zamanı gelmedi
+            unit, command = self._ready_decision
+            self._ready_decision = None
+            executed = self.state.apply_ai_action(unit, command)
+            if executed: self.actions_taken += 1
+            applied.append((unit, command, executed))
+            self._next_event_time = now + (self.action_delay if command else 0) + self.think_delay
+            self._request_next_decision()
+        return applied
+
+    def run_to_completion(self):
+        """Kuyruğu beklemeden sonuna kadar işler (hızlı mod / başsız kullanım için)."""
+        self.think_delay = self.action_delay = 0
+        if self._worker is None: self.start()
+        applied = []
+        while not self.finished:
+            applied.extend(self.update())
+            if not self.finished and self._ready_decision is None:
+                self._ready_decision = self._decisions.get()
+        return applied
@@ -1,4 +1,7 @@
 # src/game_core/commands.py (YENİ KONUMU: src/game_core/commands.py)
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ICommand:
     def __init__(self, description="Generic Command"):
@@ -10,6 +13,10 @@ class ICommand:
     def undo(self):
         pass
 
+    def to_dict(self):
+        """Komut günlüğü (CommandJournal) için birim id'leriyle serileştirilmiş hali; desteklenmiyorsa None."""
+        return None
+
 
 class MoveUnitCommand(ICommand):
     def __init__(self, unit, new_grid_x, new_grid_y, game_map):
@@ -24,23 +31,26 @@ class MoveUnitCommand(ICommand):
 
     def execute(self):
         if self.unit.is_alive() and self.game_map.move_unit(self.unit, self.new_grid_x, self.new_grid_y):
-            print(f"Executed: {self.description}")
+            logger.debug("Executed: %s", self.description)
             self.executed_successfully = True
             return True
         else:
-            print(f"Failed to execute: {self.description} (Unit might be dead or target invalid)")
+            logger.info("Failed to execute: %s (Unit might be dead or target invalid)", self.description)
             self.executed_successfully = False
             return False
 
     def undo(self):
         if self.executed_successfully:
             if self.game_map.move_unit(self.unit, self.old_grid_x, self.old_grid_y):
-                print(
-                    f"Undid: {self.description}, {self.unit.unit_type} moved back to ({self.old_grid_x}, {self.old_grid_y})")
+                logger.debug("Undid: %s, %s moved back to (%s, %s)", self.description, self.unit.unit_type,
+                             self.old_grid_x, self.old_grid_y)
             else:
-                print(f"Failed to undo: {self.description}")
+                logger.warning("Failed to undo: %s", self.description)
         else:
-            print(f"Cannot undo a command that was not successfully executed: {self.description}")
+            logger.info("Cannot undo a command that was not successfully executed: %s", self.description)
+
+    def to_dict(self):
+        return {"command": "move", "unit_id": self.unit.id, "x": self.new_grid_x, "y": self.new_grid_y}
 
 
 class AttackCommand(ICommand):
@@ -55,7 +65,7 @@ class AttackCommand(ICommand):
 
     def execute(self):
         if not self.attacker.is_alive() or not self.target_unit.is_alive():
-            print(f"Attack failed: {self.attacker.unit_type} or {self.target_unit.unit_type} is not alive.")
+            logger.info("Attack failed: %s or %s is not alive.", self.attacker.unit_type, self.target_unit.unit_type)
             return False
 
         # Saldırı menzil kontrolü burada veya komut oluşturulmadan önce yapılmalı.
@@ -63,7 +73,7 @@ class AttackCommand(ICommand):
 
         self.damage_done = self.attacker.attack_power  # Basit saldırı, savunma vs. yok
         self.target_unit.take_damage(self.damage_done)
-        print(f"Executed: {self.description}, {self.target_unit.unit_type} health: {self.target_unit.health}")
+        logger.debug("Executed: %s, %s health: %s", self.description, self.target_unit.unit_type, self.target_unit.health)
 
         if not self.target_unit.is_alive():
             # Eğer hedef öldüyse, haritadan kaldır.
@@ -73,17 +83,34 @@ class AttackCommand(ICommand):
     def undo(self):
         # Basit bir undo: Canı geri ver. Eğer öldüyse haritaya geri eklemek daha karmaşık olabilir.
         if self.target_was_alive_before_attack:  # Sadece hasar geri verilecek
-            self.target_unit.health += self.damage_done
             # max_health'i geçmemesini sağla
-            if self.target_unit.health > self.target_unit.max_health:
-                self.target_unit.health = self.target_unit.max_health
-            print(f"Undid attack: {self.target_unit.unit_type} health restored to {self.target_unit.health}")
+            self.target_unit.set_health(min(self.target_unit.health + self.damage_done, self.target_unit.max_health))
+            logger.debug("Undid attack: %s health restored to %s", self.target_unit.unit_type, self.target_unit.health)
 
             # Eğer undo sırasında hedef ölü durumdan canlıya döndüyse ve haritadan silindiyse,
             # bu durumu ele almak gerekir. Şimdilik basit tutuyoruz.
             if not self.game_map.get_tile_at_grid_coords(self.target_unit.grid_x, self.target_unit.grid_y).unit_on_tile:
                 if self.target_unit.is_alive():  # Eğer canı geri gelince canlandıysa
-                    print(f"Attempting to re-add {self.target_unit.unit_type} to map (Undo might be complex)")
+                    logger.warning("Attempting to re-add %s to map (Undo might be complex)", self.target_unit.unit_type)
                     # self.game_map.add_unit(self.target_unit, self.target_unit.grid_x, self.target_unit.grid_y) # Bu sorunlu olabilir, tile doluysa vs.
         else:
-            print(f"Undo for attack not fully implemented if target died and was removed.")
\ No newline at end of file
+            logger.warning("Undo for attack not fully implemented if target died and was removed.")
+
+    @property
+    def unit(self):  # Komut geçmişi eylemi yapan birime 'unit' adıyla erişir (saldırılar da geri alınabilir)
+        return self.attacker
+
+    def to_dict(self):
+        return {"command": "attack", "unit_id": self.attacker.id, "target_id": self.target_unit.id}
+
+
+def command_from_dict(data, game_map):
+    """to_dict çıktısından komutu haritadaki birimlerle yeniden kurar. Birim bulunamazsa None döner."""
+    unit = game_map.unit_by_id.get(data.get("unit_id"))
+    if unit is None: return None
+    if data["command"] == "move":
+        return MoveUnitCommand(unit, data["x"], data["y"], game_map)
+    if data["command"] == "attack":
+        target = game_map.unit_by_id.get(data["target_id"])
+        return AttackCommand(unit, target, game_map) if target else None
+    raise ValueError(f"Unknown command type in journal: {data['command']}")
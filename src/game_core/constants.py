@@ -1,3 +1,4 @@
 # src/game_core/constants.py
 PLAYER_HUMAN_ID = 1
-PLAYER_AI_ID = 2
\ No newline at end of file
+PLAYER_AI_ID = 2
+NO_OWNER = 0  # Haritanın owner katmanında boş kare
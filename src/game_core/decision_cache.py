@@ -0,0 +1,68 @@
+# src/game_core/decision_cache.py
+# AI kararları için sınırlı (LRU) önbellek. Anahtar: (Map.position_hash, birim id, birimin karesi, strateji adı).
+# position_hash birim id'lerini içermez (aynı türden iki birim yer değiştirince hash aynı kalır); birimin
+# kendi karesi bu yüzden anahtarda ayrıca tutulur.
+# Aynı konum tekrar oluştuğunda (geri al / yeniden yap, tekrar oynatma, kendi kendine oynama) strateji
+# yeniden çalıştırılmaz; kayıtlı karar o anki harita üzerinde komuta çevrilip doğrulanarak kullanılır.
+# Kararlar birim nesnesi değil kare olarak saklanır: yer değiştirmiş (transpoze) konumlarda da geçerlidirler.
+from collections import OrderedDict
+
+from .commands import MoveUnitCommand, AttackCommand
+
+DEFAULT_MAX_ENTRIES = 4096
+
+DECISION_HOLD = ("hold",)
+
+
+def encode_decision(command):
+    if isinstance(command, AttackCommand): return "attack", command.target_unit.grid_x, command.target_unit.grid_y
+    if isinstance(command, MoveUnitCommand): return "move", command.new_grid_x, command.new_grid_y
+    if command is None: return DECISION_HOLD
+    return None  # Bilinmeyen komut türü önbelleğe alınmaz
+
+
+def decode_decision(decision, unit, game_map):
+    """Kayıtlı kararı komuta çevirir. (True, komut/None) ya da karar artık uygulanamıyorsa (False, None) döndürür."""
+    kind = decision[0]
+    if kind == "hold": return True, None
+    target_x, target_y = decision[1], decision[2]
+    if kind == "attack":
+        target = game_map.unit_at(target_x, target_y)
+        distance = abs(target_x - unit.grid_x) + abs(target_y - unit.grid_y)
+        if target and target.is_alive() and target.player_id != unit.player_id and \
+                unit.min_attack_range <= distance <= unit.attack_range:
+            return True, AttackCommand(unit, target, game_map)
+    elif kind == "move":
+        occupant = game_map.unit_at(target_x, target_y)
+        if game_map.is_walkable_at(target_x, target_y) and (occupant is None or occupant is unit):
+            reachable, _ = game_map.find_reachable(unit.grid_x, unit.grid_y, unit.movement_range, unit.player_id)
+            if (target_x, target_y) in reachable: return True, MoveUnitCommand(unit, target_x, target_y, game_map)
+    return False, None
+
+
+class DecisionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        decision = self._entries.get(key)
+        if decision is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return decision
+
+    def put(self, key, decision):
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
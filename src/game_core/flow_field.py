@@ -0,0 +1,67 @@
+# src/game_core/flow_field.py
+# Akış alanı (flow field): bir oyuncunun bütün birimlerinden aynı anda başlatılan tek bir en kısa yol
+# taramasıyla her kareye "en yakın o oyuncu birimine yürüme maliyeti" yazılır (çok kaynaklı Dijkstra;
+# bütün maliyetler 1 ise BFS ile aynı sonucu verir). Engellerin arkasındaki düşmana giden yol da bulunur.
+# AI birimleri kendi ulaşabildikleri kareler arasından değeri en küçük olanı seçer: birim başına O(erişim).
+# Alan, arazi (Map.terrain_version) ya da hedef oyuncunun birim konumları (SpatialIndex.version) değişmedikçe
+# yeniden hesaplanmaz; böylece bir AI turundaki bütün birimler aynı alanı paylaşır.
+import heapq
+from array import array
+
+from .map import NEIGHBOR_OFFSETS
+
+UNREACHABLE = 0xFFFFFFFF
+
+
+class FlowField:
+    def __init__(self, game_map, target_player_id):
+        self.cols, self.rows = game_map.cols, game_map.rows
+        self.target_player_id = target_player_id
+        self.distances = array('I', [UNREACHABLE]) * (self.cols * self.rows)
+        self._build(game_map)
+
+    def _build(self, game_map):
+        # Birimler alanda engel sayılmaz: hedefler kaynaktır, hareket eden taraf her adımda yer değiştirir
+        cols, rows, walkable, tile_cost, distances = self.cols, self.rows, game_map.walkable, game_map.cost, self.distances
+        frontier = []
+        for unit in game_map.spatial_index.units_of(self.target_player_id):
+            idx = unit.grid_y * cols + unit.grid_x
+            distances[idx] = 0
+            frontier.append((0, idx))
+        heapq.heapify(frontier)
+        while frontier:
+            cost, idx = heapq.heappop(frontier)
+            if cost > distances[idx]: continue
+            x, y = idx % cols, idx // cols
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < cols and 0 <= ny < rows): continue
+                nidx = ny * cols + nx
+                if not walkable[nidx]: continue
+                new_cost = cost + tile_cost[idx]  # Kaynağa doğru yürürken girilen karenin maliyeti
+                if new_cost < distances[nidx]:
+                    distances[nidx] = new_cost
+                    heapq.heappush(frontier, (new_cost, nidx))
+
+    def distance_at(self, grid_x, grid_y):
+        if 0 <= grid_x < self.cols and 0 <= grid_y < self.rows: return self.distances[grid_y * self.cols + grid_x]
+        return UNREACHABLE
+
+
+class FlowFieldCache:
+    """Hedef oyuncu başına bir akış alanı; arazi veya hedef birimlerin konumları değişince yeniden kurulur."""
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self._fields = {}  # target_player_id -> ((terrain_version, konum versiyonu), FlowField)
+        self.builds = 0
+
+    def toward(self, target_player_id):
+        game_map = self.game_map
+        key = (game_map.terrain_version, game_map.spatial_index.version(target_player_id))
+        cached = self._fields.get(target_player_id)
+        if cached and cached[0] == key: return cached[1]
+        field = FlowField(game_map, target_player_id)
+        self._fields[target_player_id] = (key, field)
+        self.builds += 1
+        return field
@@ -1,32 +1,43 @@
+import logging
 import pygame
 import time
-import json
 import os
 
 from .map import Map
-from .tile import Tile
-from .unit_factory import UnitFactory
-from .ai_strategy import SimpleAggressiveStrategy
 from .unit import Unit
 from .unit_states import IdleState, SelectedState
 from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
-from .ai_strategy import SimpleAggressiveStrategy, DefensiveStrategy
-
+from .ai_turn import AITurnPipeline, DEFAULT_THINK_DELAY, DEFAULT_ACTION_DELAY
+from ui.map_renderer import MapRenderer
+from ui.text_cache import TextSurfaceCache
+from ui.highlight_overlay import HighlightOverlay
+from ui.profiler_overlay import ProfilerOverlay
+from . import save_format
+from .user_store import create_user_store
+from .leaderboard import Leaderboard
+from .journal import CommandJournal
+from .profiler import profiler
+from .game_state import GameState, load_level_data, MAX_LEVELS, RESULT_LEVEL_CLEARED
+
+logger = logging.getLogger(__name__)
 
 USERS_FILE_NAME_BASE = "users.json"
+USERS_DB_FILE_NAME_BASE = "users.db"
 BASE_SAVE_FILENAME = "savegame.json"
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SRC_DIR = os.path.dirname(SCRIPT_DIR)
 PROJECT_ROOT_DIR = os.path.dirname(SRC_DIR)
 
-LEVELS_DIR = os.path.join(SRC_DIR, "levels")
-LEVEL_FILE_PREFIX = os.path.join(LEVELS_DIR, "level")
 SAVES_DIR = os.path.join(PROJECT_ROOT_DIR, "saves")
-USERS_FILE_NAME = os.path.join(PROJECT_ROOT_DIR, USERS_FILE_NAME_BASE)
+PROFILES_DIR = os.path.join(PROJECT_ROOT_DIR, "profiles")  # F4 ile dışa aktarılan Chrome trace dosyaları
+JOURNALS_DIR = os.path.join(PROJECT_ROOT_DIR, "journals")  # Oyun başına komut günlükleri (replay.py ile oynatılır)
+USERS_FILE_NAME = os.path.join(PROJECT_ROOT_DIR, USERS_FILE_NAME_BASE)  # Eski depo; ilk açılışta veritabanına aktarılır
+USERS_DB_FILE_NAME = os.path.join(PROJECT_ROOT_DIR, USERS_DB_FILE_NAME_BASE)
 
-MAX_LEVELS = 5
 STATE_NAME_TO_CLASS_MAP = {"IdleState": IdleState, "SelectedState": SelectedState}
+# Pencere tekrar görünür olduğunda ekranın tamamı yeniden çizilmeli (pygame 1'de VIDEOEXPOSE, 2'de WINDOWEXPOSED)
+WINDOW_EXPOSE_EVENTS = tuple(getattr(pygame, name) for name in ("VIDEOEXPOSE", "WINDOWEXPOSED") if hasattr(pygame, name))
 
 GAME_STATE_MAIN_MENU = "main_menu"
 GAME_STATE_GAMEPLAY = "gameplay"
@@ -143,18 +154,44 @@ ALL_THEMES = {  # Bu sözlük zaten vardı, içeriği yukarıdaki gibi olacak
 
 # --- TEMA TANIMLARI SONU ---
 
+
+def _state_attr(name):
+    """Game üzerindeki bir özelliği GameState'teki aynı isimli alana yönlendirir."""
+    return property(lambda self: getattr(self.state, name),
+                    lambda self, value: setattr(self.state, name, value))
+
+
 class Game:
-    def __init__(self, screen_width, screen_height):
+    # Oyun kuralları ve durum GameState'te; Game sadece girdi, çizim ve menüleri yönetir.
+    game_map = _state_attr("game_map")
+    map_cols = _state_attr("map_cols")
+    map_rows = _state_attr("map_rows")
+    tile_size = _state_attr("tile_size")
+    current_player_id = _state_attr("current_player_id")
+    current_level_number = _state_attr("current_level_number")
+    turns_taken_this_level = _state_attr("turns_taken_this_level")
+    command_history = _state_attr("command_history")
+    game_over_flag = _state_attr("game_over_flag")
+    ai_turn_processed_this_round = _state_attr("ai_turn_processed_this_round")
+    unit_factory = _state_attr("unit_factory")
+    ai_strategies = _state_attr("ai_strategies")
+    default_ai_strategy = _state_attr("default_ai_strategy")
+    threat_maps = _state_attr("threat_maps")
+
+    def __init__(self, screen_width, screen_height, data_dir=None):
         pygame.init()
+        # Kullanıcı verisi (veritabanı, kayıtlar, günlükler, profil izleri) data_dir altında tutulur;
+        # verilmezse proje kökü. Benchmark/testler geçici bir klasör vererek oyuncunun verisine dokunmaz.
+        data_dir = data_dir or PROJECT_ROOT_DIR
+        self.saves_dir = os.path.join(data_dir, os.path.basename(SAVES_DIR))
+        self.profiles_dir = os.path.join(data_dir, os.path.basename(PROFILES_DIR))
+        self.journals_dir = os.path.join(data_dir, os.path.basename(JOURNALS_DIR))
+        self.users_file = os.path.join(data_dir, USERS_FILE_NAME_BASE)
+        self.users_db_file = os.path.join(data_dir, USERS_DB_FILE_NAME_BASE)
+        self.state = GameState(tile_size=40)
         self.screen_width = screen_width;
         self.screen_height = screen_height
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height));
-        self.unit_factory = UnitFactory()
-        self.ai_strategies = {
-            "SimpleAggressiveStrategy": SimpleAggressiveStrategy(),
-            "DefensiveStrategy": DefensiveStrategy()  # !!! YENİ STRATEJİ EKLENDİ !!!
-        }
-        self.default_ai_strategy = self.ai_strategies["SimpleAggressiveStrategy"]
         pygame.display.set_caption("Hexa Komutanı")
         try:
             self.font_small = pygame.font.SysFont(None, 24); self.font_medium = pygame.font.SysFont(None,
@@ -168,23 +205,12 @@ class Game:
         self.running = False;
         self.current_game_state = GAME_STATE_MAIN_MENU
         self.selected_unit = None;
-        self.command_history = [];
         self.highlighted_tiles_for_move = [];
         self.highlighted_tiles_for_attack = []
         self.feedback_message = "";
         self.feedback_message_timer = 0;
         self.feedback_message_duration = 120
-        self.game_over_flag = False;
-        self.current_level_number = 1;
-        self.turns_taken_this_level = 0
-        self.tile_size = 40;
         self.initialized_successfully = False
-        self.unit_factory = UnitFactory()
-        self.ai_strategies = {
-            "SimpleAggressiveStrategy": SimpleAggressiveStrategy(),
-            "DefensiveStrategy": DefensiveStrategy()
-        }
-        self.default_ai_strategy = self.ai_strategies["SimpleAggressiveStrategy"]
         self.main_menu_buttons = {};
         self.login_screen_elements = {};
         self.register_screen_elements = {}
@@ -197,98 +223,74 @@ class Game:
         self.available_themes = ALL_THEMES;
         self.active_theme_name = "default";
         self.active_theme = self.available_themes[self.active_theme_name]
-        self.game_map = None;
-        self.map_cols = 0;
-        self.map_rows = 0;
-        self.current_player_id = PLAYER_HUMAN_ID;
-        self.ai_turn_processed_this_round = False
-        self.ai_threat_tiles = set()  #  AI tarafından tehdit edilen (x,y) koordinatlarını tutacak set !!!
         self.show_ai_threat_display = False  # Bu gösterimin aktif olup olmadığını tutan bayrak !!!
+        self.map_renderer = MapRenderer()  # Karo katmanı önbelleği ve kirli alan takibi
+        self.text_cache = TextSurfaceCache()  # Yazı Surface'leri (etiketler, HUD, menüler)
+        self.compress_saves = False  # True ise kayıtlar gzip ile yazılır (okuma her iki durumu da tanır)
+        self.highlight_overlay = HighlightOverlay()  # Vurguların birleşik saydam katmanı
+        self.ai_turn_pipeline = None  # Devam eden AI turu (AITurnPipeline)
+        self.ai_think_delay = DEFAULT_THINK_DELAY  # AI eylemleri arasındaki bekleme (saniye)
+        self.ai_action_delay = DEFAULT_ACTION_DELAY
+        self.ai_fast_mode = False  # True ise AI turu hiç beklemeden oynanır (tekrar oynatma/test)
+        self.profiler = profiler  # F3: ölçümü ve ekrandaki paneli aç/kapat, F4: izi profiles/ altına yaz
+        self.profiler_overlay = ProfilerOverlay()
         self._ensure_data_dirs_exist();
+        self.user_store = create_user_store(self.users_db_file, self.users_file)
+        self.leaderboard = Leaderboard(self.user_store)  # Seviye başına en iyi skorlar (skor tablosu ekranı)
+        self.scoreboard_page = 0  # Skor tablosunda gösterilen sayfa (seviye başına max_scores_display satır)
         self.load_user_preferences()
 
+    def render_text(self, font, text, antialias, color):
+        """font.render yerine kullanılır; aynı yazı tekrar rasterize edilmez."""
+        return self.text_cache.render(font, text, antialias, color)
+
     def _ensure_data_dirs_exist(self):
-        user_file_dir = os.path.dirname(USERS_FILE_NAME)
+        user_file_dir = os.path.dirname(self.users_file)
         if user_file_dir and not os.path.exists(user_file_dir):  # Ana dizinse bu zaten true olur
             try:
                 os.makedirs(user_file_dir, exist_ok=True)
             except OSError as e:
-                print(f"Error creating dir for '{USERS_FILE_NAME}':{e}")
-        if not os.path.exists(USERS_FILE_NAME):
+                logger.error("Error creating dir for '%s':%s", self.users_file, e)
+        if not os.path.exists(self.saves_dir):
             try:
-                with open(USERS_FILE_NAME, 'w', encoding='utf-8') as f:
-                    json.dump({}, f)
-                print(f"'{USERS_FILE_NAME}' created at:{os.path.abspath(USERS_FILE_NAME)}")
-            except IOError as e:
-                print(f"Error creating '{USERS_FILE_NAME}':{e}")
-        if not os.path.exists(SAVES_DIR):
-            try:
-                os.makedirs(SAVES_DIR, exist_ok=True);print(f"Saves directory '{SAVES_DIR}' created.")
+                os.makedirs(self.saves_dir, exist_ok=True);logger.info("Saves directory '%s' created.", self.saves_dir)
             except OSError as e:
-                print(f"Error creating saves directory '{SAVES_DIR}':{e}")
+                logger.error("Error creating saves directory '%s':%s", self.saves_dir, e)
 
     def _get_user_save_filename(self):
         if self.current_user: safe_username = "".join(
-            c if c.isalnum() else "_" for c in self.current_user);return os.path.join(SAVES_DIR,
+            c if c.isalnum() else "_" for c in self.current_user);return os.path.join(self.saves_dir,
                                                                                       f"{safe_username.lower()}_{BASE_SAVE_FILENAME}")
         return None
 
-    def _load_users(self):
-        self._ensure_data_dirs_exist()
-        try:
-            with open(USERS_FILE_NAME, 'r', encoding='utf-8') as f:
-                ud = json.load(f)
-            if not isinstance(ud, dict): return {}
-            return ud
-        except(FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_users(self, users_data):
-        try:
-            with open(USERS_FILE_NAME, 'w', encoding='utf-8') as f:
-                json.dump(users_data, f, indent=4, ensure_ascii=False)
-            return True
-        except IOError:
-            return False
-
     def set_active_theme(self, theme_id):
         if theme_id in self.available_themes:
             self.active_theme_name = theme_id;
             self.active_theme = self.available_themes[theme_id]
             tdn = self.active_theme.get('name', theme_id)
-            print(f"Tema '{tdn}' olarak değiştirildi.")
+            logger.info("Tema '%s' olarak değiştirildi.", tdn)
             self.show_feedback_message(f"Tema: {tdn}", self.feedback_message_duration // 2)
-            if self.current_user:
-                users = self._load_users();
-                udo = users.get(self.current_user)
-                if isinstance(udo, dict):
-                    udo["theme"] = theme_id
-                elif isinstance(udo, str):
-                    users[self.current_user] = {"password": udo, "theme": theme_id, "scores": {}}
-                else:
-                    users[self.current_user] = {"password": "", "theme": theme_id, "scores": {}}
-                self._save_users(users)
+            if self.current_user: self.user_store.set_theme(self.current_user, theme_id)
             if self.current_game_state == GAME_STATE_GAMEPLAY and self.initialized_successfully: self.apply_theme_to_game_elements()
         else:
-            print(f"Uyarı: Tema ID '{theme_id}' bulunamadı. Varsayılan.");
+            logger.warning("Tema ID '%s' bulunamadı. Varsayılan.", theme_id);
             if self.active_theme_name != "default": self.active_theme_name = "default";self.active_theme = \
             self.available_themes["default"]
 
     def load_user_preferences(self):
         ttl = "default"
-        if self.current_user:
-            users = self._load_users();
-            ud = users.get(self.current_user)
-            if isinstance(ud, dict): ttl = ud.get("theme", "default")
+        if self.current_user: ttl = self.user_store.get_theme(self.current_user)
         self.set_active_theme(ttl)
 
     def apply_theme_to_game_elements(self):
-        if hasattr(self, 'game_map') and self.game_map and self.game_map.grid:
-            print("Applying theme to game elements (draw methods use active_theme directly)...")
+        if hasattr(self, 'game_map') and self.game_map:
+            logger.debug("Applying theme to game elements (draw methods use active_theme directly)...")
             pass
 
     def initialize_gameplay_state(self, level_to_load=1, is_new_game_session=True):
-        print(f"Initializing gameplay state for level {level_to_load}, new session: {is_new_game_session}")
+        logger.info("Initializing gameplay state for level %s, new session: %s", level_to_load, is_new_game_session)
+        self._cancel_ai_turn()
+        if is_new_game_session: self._start_journal()
         self.selected_unit = None;
         self.command_history = []
         self.highlighted_tiles_for_move = [];
@@ -303,89 +305,50 @@ class Game:
             self.initialized_successfully = False;self.show_feedback_message("Failed to initialize gameplay.",
                                                                              self.feedback_message_duration);return False
 
+    def _start_journal(self):
+        """Yeni oyun oturumu için günlük dosyası açar; seviyeler bu dosyaya bölüm olarak eklenir."""
+        self._close_journal()
+        try:
+            os.makedirs(self.journals_dir, exist_ok=True)
+            owner = "".join(c if c.isalnum() else "_" for c in (self.current_user or "guest")).lower()
+            path = os.path.join(self.journals_dir, f"{owner}_{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+            self.state.journal = CommandJournal(path)
+            logger.info("Command journal: %s", path)
+        except OSError as e:
+            logger.warning("Could not open command journal: %s", e)
+
+    def _close_journal(self):
+        if self.state.journal:
+            self.state.journal.close()
+            self.state.journal = None
+
     def _initialize_game_for_level(self, level_number, is_new_game_session=False):
         self.current_level_number = level_number;
         ld = self.load_level_data(level_number)
-        if not ld: print(f"Could not load level {level_number} data. Init aborted.");return False
-        self.map_cols = ld.get("map_cols", self.screen_width // self.tile_size);
-        self.map_rows = ld.get("map_rows", self.screen_height // self.tile_size)
-        self.game_map = Map(self.map_rows, self.map_cols, self.tile_size);
-        self.game_map.create_grid()
-        self.current_player_id = PLAYER_HUMAN_ID;
-        self.game_map.units = []
+        if not ld: logger.warning("Could not load level %s data. Init aborted.", level_number);return False
         self.selected_unit = None;
         self.clear_all_highlights()
-        if is_new_game_session: Unit._id_counter = 0
-        self.setup_units_from_level_data(ld)
-        self.game_over_flag = False;
-        self.reset_unit_actions_for_player(self.current_player_id)
+        self.state.setup_level(level_number, ld, is_new_game_session=is_new_game_session,
+                               default_cols=self.screen_width // self.tile_size,
+                               default_rows=self.screen_height // self.tile_size)
         ln = ld.get('level_name', f'Lvl {level_number}')
-        print(f"Level {level_number} ('{ln}') initialized.");
+        logger.info("Level %s ('%s') initialized.", level_number, ln);
         self.show_feedback_message(f"Level {level_number}: {ln}", self.feedback_message_duration)
         return True
 
     def reset_unit_actions_for_player(self, player_id):  # !!! METOD TANIMI BURADA !!!
-        if hasattr(self, 'game_map') and self.game_map and self.game_map.units:
-            for unit in self.game_map.units:
-                if unit.player_id == player_id: unit.has_acted_this_turn = False
-        if player_id == PLAYER_AI_ID: self.ai_turn_processed_this_round = False
+        self.state.reset_unit_actions_for_player(player_id)
 
     def load_level_data(self, level_number):
-        fn = f"{LEVEL_FILE_PREFIX}{level_number}.json"
         try:
-            with open(fn, 'r', encoding='utf-8') as f:
-                ld = json.load(f)
-            return ld
+            return load_level_data(level_number)
         except FileNotFoundError:
             self.show_feedback_message(f"Lvl File Not Found: lvl{level_number}.json", 9999);return None
         except Exception:
             self.show_feedback_message(f"Error Loading Lvl {level_number}!", 9999);return None
 
     def setup_units_from_level_data(self, level_data):
-        if "player_units" in level_data:
-            for unit_info in level_data["player_units"]:
-                # JSON'dan "grid_pos" listesini oku
-                grid_x = unit_info["grid_pos"][0]
-                grid_y = unit_info["grid_pos"][1]
-                player_id = unit_info["player_id"]
-                unit_type = unit_info["type"]
-
-                unit = self.unit_factory.create_unit(
-                    unit_type,
-                    grid_x,
-                    grid_y,
-                    player_id
-                )
-                if unit:  # Birim başarıyla oluşturulduysa haritaya ekle
-                    self.game_map.add_unit(unit, unit.grid_x, unit.grid_y)
-                else:
-                    print(f"Error: Could not create player unit from info: {unit_info}")
-
-        if "ai_units" in level_data:
-            for unit_info in level_data["ai_units"]:
-                # JSON'dan "grid_pos" listesini oku
-                grid_x = unit_info["grid_pos"][0]
-                grid_y = unit_info["grid_pos"][1]
-                player_id = unit_info["player_id"]
-                unit_type = unit_info["type"]
-
-                unit = self.unit_factory.create_unit(
-                    unit_type,
-                    grid_x,
-                    grid_y,
-                    player_id
-                )
-                if unit:
-                    if unit.player_id == PLAYER_AI_ID:  # Sadece AI birimleri için strateji ata
-                        strategy_id = unit_info.get("strategy_id", "SimpleAggressiveStrategy")  # Varsayılan strateji
-                        unit.ai_strategy_instance = self.ai_strategies.get(strategy_id, self.default_ai_strategy)
-                        if not unit.ai_strategy_instance:
-                            print(f"Warning: Unknown strategy_id '{strategy_id}' for AI unit. Using default.")
-                            unit.ai_strategy_instance = self.default_ai_strategy
-                        # print(f"DEBUG: AI Unit ID {unit.id} (Player {unit.player_id}) created with strategy: {unit.ai_strategy_instance.__class__.__name__}") # Bu log zaten var
-                    self.game_map.add_unit(unit, unit.grid_x, unit.grid_y)
-                else:
-                    print(f"Error: Could not create AI unit from info: {unit_info}")
+        self.state.setup_units_from_level_data(level_data)
 
     def show_feedback_message(self, message, duration_frames):
         self.feedback_message = message;
@@ -397,49 +360,58 @@ class Game:
         if not self.initialized_successfully or not self.game_map: self.show_feedback_message(
             "Cannot save: Gameplay not active.", self.feedback_message_duration);return
         usf = self._get_user_save_filename()
-        if not usf: print("Error: Could not determine user save file for saving.");return
-        print(f"Saving game to {usf} for user {self.current_user}...")
+        if not usf: logger.error("Could not determine user save file for saving.");return
+        logger.info("Saving game to %s for user %s...", usf, self.current_user)
         if self.selected_unit: self.selected_unit.is_graphically_selected = False
-        gsd = {"user": self.current_user, "current_player_id": self.current_player_id,
-               "current_level_number": self.current_level_number, "map_data": self.game_map.to_dict(),
-               "units_data": [u.to_dict() for u in self.game_map.units if u.is_alive()],
-               "next_unit_id": Unit._id_counter, "game_over_flag": self.game_over_flag,
-               "ai_turn_processed_this_round": self.ai_turn_processed_this_round,
-               "active_theme_name": self.active_theme_name, "turns_taken_this_level": self.turns_taken_this_level}
         try:
-            with open(usf, 'w', encoding='utf-8') as f:
-                json.dump(gsd, f, indent=4, ensure_ascii=False)
+            with self.profiler.span("io.save"):
+                gsd = save_format.build_save(
+                    self.game_map, [u for u in self.game_map.units if u.is_alive()],
+                    user=self.current_user, current_player_id=self.current_player_id,
+                    current_level_number=self.current_level_number, next_unit_id=Unit._id_counter,
+                    game_over_flag=self.game_over_flag, ai_turn_processed_this_round=self.ai_turn_processed_this_round,
+                    active_theme_name=self.active_theme_name, turns_taken_this_level=self.turns_taken_this_level)
+                save_format.write_save(usf, gsd, compress=self.compress_saves)
             self.show_feedback_message(f"Game Saved for {self.current_user}!", self.feedback_message_duration)
         except IOError as e:
-            print(f"Error saving game:{e}");self.show_feedback_message("Error Saving Game!",
+            logger.error("Error saving game:%s", e);self.show_feedback_message("Error Saving Game!",
                                                                        self.feedback_message_duration)
 
+    def export_profile_trace(self):
+        """Toplanan profil izini profiles/ altına Chrome trace (JSON) olarak yazar."""
+        path = os.path.join(self.profiles_dir, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            event_count = self.profiler.export_chrome_trace(path)
+            logger.info("Profiler trace (%s events) written to %s", event_count, path)
+            self.show_feedback_message(f"Trace saved: {os.path.basename(path)}", self.feedback_message_duration)
+        except OSError as e:
+            logger.error("Error writing profiler trace: %s", e);self.show_feedback_message("Error Saving Trace!",
+                                                                                  self.feedback_message_duration)
+
     def load_game(self):
         user_save_file = self._get_user_save_filename()
         if not user_save_file: return False
         if not os.path.exists(user_save_file): return False
-        print(f"Attempting to load game data from {user_save_file} for user {self.current_user}...")
+        logger.info("Attempting to load game data from %s for user %s...", user_save_file, self.current_user)
         try:
-            with open(user_save_file, 'r', encoding='utf-8') as f:
-                game_state_data = json.load(f)
+            with self.profiler.span("io.load"):
+                game_state_data = save_format.read_save(user_save_file)
+            self._cancel_ai_turn()
+            self._close_journal()  # Kayıttan devam eden oyun seviye başından tekrar oynatılamaz
             self.command_history = []
             loaded_theme_name = game_state_data.get("active_theme_name", "default")
             self.set_active_theme(loaded_theme_name)
             self.current_level_number = game_state_data.get("current_level_number", 1)
             self.turns_taken_this_level = game_state_data.get("turns_taken_this_level", 0)
-            map_info = game_state_data["map_data"]
-            self.map_rows = map_info["rows"];
-            self.map_cols = map_info["cols"]
-            self.game_map = Map(self.map_rows, self.map_cols, self.tile_size)
-            self.game_map.grid = []
-            for r_idx, row_data in enumerate(map_info["grid_tiles"]):
-                current_row = [];
-                self.game_map.grid.append(current_row)
-                for c_idx, tile_data in enumerate(row_data): current_row.append(
-                    Tile.from_dict(tile_data, self.tile_size))
+            if save_format.is_legacy_save(game_state_data):  # Eski biçim: kare başına bir sözlük
+                rows, cols, walkable, cost = save_format.decode_legacy_grid(game_state_data["map_data"])
+            else:
+                rows, cols, walkable, cost = save_format.decode_terrain(game_state_data["terrain"])
+            self.state.attach_map(Map(rows, cols, self.tile_size))
+            self.game_map.create_grid_from_layers(walkable, cost)
             self.game_map.units = []
             Unit._id_counter = game_state_data.get("next_unit_id", Unit._id_counter)
-            for unit_data in game_state_data["units_data"]:
+            for unit_data in save_format.iter_unit_records(game_state_data):
                 unit = self.unit_factory.create_unit(unit_data["unit_type"], unit_data["grid_x"], unit_data["grid_y"],
                                                      unit_data["player_id"])
                 unit.id = unit_data["id"];
@@ -450,6 +422,9 @@ class Game:
                 unit.attack_power = unit_data.get("attack_power", unit.attack_power);
                 unit.movement_range = unit_data.get("movement_range", unit.movement_range)
                 unit.attack_range = unit_data.get("attack_range", unit.attack_range);
+                unit.min_attack_range = unit_data.get("min_attack_range", unit.min_attack_range)
+                if unit_data.get("strategy_id"):
+                    unit.ai_strategy_instance = self.ai_strategies.get(unit_data["strategy_id"])
                 unit.has_acted_this_turn = unit_data.get("has_acted_this_turn", False)
                 state_name = unit_data.get("current_state_name", "IdleState");
                 state_class = STATE_NAME_TO_CLASS_MAP.get(state_name, IdleState)
@@ -463,13 +438,12 @@ class Game:
             self.clear_all_highlights()
             if not self.game_over_flag: self.reset_unit_actions_for_player(self.current_player_id)
             self.apply_theme_to_game_elements()
-            print("Game data parsed successfully for loading!");
+            logger.info("Game data parsed successfully for loading!");
             return True
         except FileNotFoundError:
-            print(f"Save file '{user_save_file}' not found."); return False
+            logger.info("Save file '%s' not found.", user_save_file); return False
         except Exception as e:
-            print(f"Error parsing game data from {user_save_file}: {e}"); import \
-                traceback; traceback.print_exc(); return False
+            logger.exception("Error parsing game data from %s: %s", user_save_file, e); return False
 
     def load_game_into_gameplay(self):
         if not self.current_user:
@@ -494,13 +468,13 @@ class Game:
 
     def draw_main_menu(self):
         self.screen.fill(self.active_theme.get("background_main_menu", (40, 40, 60)));
-        ts = self.font_large.render("Hexa Komutanı", 1, self.active_theme.get("title_main_menu", (200, 200, 255)));
+        ts = self.render_text(self.font_large, "Hexa Komutanı", 1, self.active_theme.get("title_main_menu", (200, 200, 255)));
         tr = ts.get_rect(center=(self.screen_width // 2, self.screen_height // 5));
         self.screen.blit(ts, tr);
         um = f"Giriş Yapıldı: {self.current_user}" if self.current_user else "Giriş Yapılmadı";
         uck = "user_message_loggedin" if self.current_user else "user_message_loggedout";
         uc = self.active_theme.get(uck, (255, 255, 255));
-        us = self.font_small.render(um, 1, uc);
+        us = self.render_text(self.font_small, um, 1, uc);
         ur = us.get_rect(center=(self.screen_width // 2, tr.bottom + 25));
         self.screen.blit(us, ur);
         bts = ["Yeni Oyun", "Oyun Yükle"];
@@ -524,10 +498,10 @@ class Game:
             cc = hc if b_rect.collidepoint(mp) else ic;
             pygame.draw.rect(self.screen, cc, b_rect, 0, 5);
             pygame.draw.rect(self.screen, bc, b_rect, 3, 5);
-            ts_b = self.font_medium.render(t, 1, trc);
+            ts_b = self.render_text(self.font_medium, t, 1, trc);
             txtr_b = ts_b.get_rect(center=b_rect.center);
             self.screen.blit(ts_b, txtr_b)
-        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.font_medium.render(
+        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.render_text(self.font_medium, 
             self.feedback_message, 1, self.active_theme.get("feedback_text_color"));bgr = fbs.get_rect(
             center=(self.screen_width // 2, self.screen_height - 40));bgr.inflate_ip(20, 10);bgs = pygame.Surface(
             bgr.size, pygame.SRCALPHA);bgs.fill(self.active_theme.get("feedback_bg_color"));self.screen.blit(bgs,
@@ -540,7 +514,7 @@ class Game:
             mp = event.pos
             for bt, rect in self.main_menu_buttons.items():
                 if rect.collidepoint(mp):
-                    print(f"Main menu button clicked:{bt}")
+                    logger.debug("Main menu button clicked:%s", bt)
                     if bt == "Yeni Oyun":
                         if not self.current_user: self.show_feedback_message("Yeni oyun için giriş yapın.",
                                                                              self.feedback_message_duration);self.current_game_state = GAME_STATE_LOGIN;self.active_input_field = "username_login";self.clear_input_fields();return
@@ -558,7 +532,7 @@ class Game:
                         self.current_game_state = GAME_STATE_THEME_SELECTION;self.show_feedback_message(
                             "Bir tema seçin", self.feedback_message_duration)
                     elif bt == "Skor Tablosu":
-                        self.current_game_state = GAME_STATE_SCOREBOARD;self.show_feedback_message("", 0)
+                        self.current_game_state = GAME_STATE_SCOREBOARD;self.scoreboard_page = 0;self.show_feedback_message("", 0)
                     elif bt == "Oyundan Çık":
                         self.running = False
                     break
@@ -570,7 +544,7 @@ class Game:
     def draw_login_screen(self):
         theme = self.active_theme;
         self.screen.fill(theme.get("login_bg", (30, 30, 40)));
-        ts = self.font_large.render("Giriş Yap", 1, theme.get("login_title_color", (200, 220, 255)));
+        ts = self.render_text(self.font_large, "Giriş Yap", 1, theme.get("login_title_color", (200, 220, 255)));
         tr = ts.get_rect(center=(self.screen_width // 2, self.screen_height // 5));
         self.screen.blit(ts, tr);
         iw = 300;
@@ -582,23 +556,23 @@ class Game:
         ab = theme.get("login_input_active_border_color");
         ib = theme.get("login_input_inactive_border_color");
         cy = self.screen_height // 2 - ih - fs - 10;
-        uls = self.font_small.render("Kullanıcı Adı:", 1, lc);
+        uls = self.render_text(self.font_small, "Kullanıcı Adı:", 1, lc);
         self.screen.blit(uls, ((self.screen_width - iw) // 2, cy - 20));
         ur = pygame.Rect((self.screen_width - iw) // 2, cy, iw, ih);
         self.login_screen_elements["username_input"] = ur;
         pygame.draw.rect(self.screen, ibg, ur, 0, 3);
         pygame.draw.rect(self.screen, ab if self.active_input_field == "username_login" else ib, ur, 2, 3);
-        uts = self.font_medium.render(self.input_texts["username_login"], 1, tc);
+        uts = self.render_text(self.font_medium, self.input_texts["username_login"], 1, tc);
         self.screen.blit(uts, (ur.x + 8, ur.y + (ih - uts.get_height()) // 2));
         cy += ih + fs * 2;
-        pls = self.font_small.render("Şifre:", 1, lc);
+        pls = self.render_text(self.font_small, "Şifre:", 1, lc);
         self.screen.blit(pls, ((self.screen_width - iw) // 2, cy - 20));
         pr = pygame.Rect((self.screen_width - iw) // 2, cy, iw, ih);
         self.login_screen_elements["password_input"] = pr;
         pygame.draw.rect(self.screen, ibg, pr, 0, 3);
         pygame.draw.rect(self.screen, ab if self.active_input_field == "password_login" else ib, pr, 2, 3);
         pd = "*" * len(self.input_texts["password_login"]);
-        pts = self.font_medium.render(pd, 1, tc);
+        pts = self.render_text(self.font_medium, pd, 1, tc);
         self.screen.blit(pts, (pr.x + 8, pr.y + (ih - pts.get_height()) // 2));
         cy += ih + fs * 2 + 10;
         bw = 140;
@@ -610,14 +584,14 @@ class Game:
         pygame.draw.rect(self.screen,
                          theme.get("login_button_primary_hover_color") if lbr.collidepoint(mph) else theme.get(
                              "login_button_primary_idle_color"), lbr, 0, 5);
-        lts = self.font_medium.render("Giriş Yap", 1, theme.get("login_button_text_color"));
+        lts = self.render_text(self.font_medium, "Giriş Yap", 1, theme.get("login_button_text_color"));
         self.screen.blit(lts, lts.get_rect(center=lbr.center));
         rlr = pygame.Rect(self.screen_width // 2 + bs // 2, cy, bw, bh);
         self.login_screen_elements["register_link_button"] = rlr;
         pygame.draw.rect(self.screen,
                          theme.get("login_button_secondary_hover_color") if rlr.collidepoint(mph) else theme.get(
                              "login_button_secondary_idle_color"), rlr, 0, 5);
-        rts = self.font_medium.render("Kayıt Ol", 1, theme.get("login_link_text_color"));
+        rts = self.render_text(self.font_medium, "Kayıt Ol", 1, theme.get("login_link_text_color"));
         self.screen.blit(rts, rts.get_rect(center=rlr.center));
         cy += bh + 15;
         bbr = pygame.Rect((self.screen_width - (bw * 1.5)) // 2, cy, bw * 1.5, bh);
@@ -625,9 +599,9 @@ class Game:
         pygame.draw.rect(self.screen,
                          theme.get("login_button_danger_hover_color") if bbr.collidepoint(mph) else theme.get(
                              "login_button_danger_idle_color"), bbr, 0, 5);
-        bts = self.font_medium.render("Ana Menüye Dön", 1, theme.get("login_button_text_color"));
+        bts = self.render_text(self.font_medium, "Ana Menüye Dön", 1, theme.get("login_button_text_color"));
         self.screen.blit(bts, bts.get_rect(center=bbr.center));
-        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.font_medium.render(
+        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.render_text(self.font_medium, 
             self.feedback_message, 1, self.active_theme.get("feedback_text_color"));bgr = fbs.get_rect(
             center=(self.screen_width // 2, self.screen_height - 40));bgr.inflate_ip(20, 10);bgs = pygame.Surface(
             bgr.size, pygame.SRCALPHA);bgs.fill(self.active_theme.get("feedback_bg_color"));self.screen.blit(bgs,
@@ -680,14 +654,7 @@ class Game:
         pw = self.input_texts["password_login"]
         if not un or not pw: self.show_feedback_message("Kullanıcı adı ve şifre giriniz!",
                                                         self.feedback_message_duration);return
-        users = self._load_users();
-        udo = users.get(un);
-        ls = False
-        if udo and isinstance(udo, dict) and udo.get("password") == pw:
-            ls = True
-        elif udo and isinstance(udo, str) and udo == pw:
-            ls = True;users[un] = {"password": pw, "theme": "default", "scores": {}};self._save_users(users)
-        if ls:
+        if self.user_store.check_password(un, pw):
             self.current_user = un;self.show_feedback_message(f"Hoşgeldin, {self.current_user}!",
                                                               self.feedback_message_duration);self.load_user_preferences();self.current_game_state = GAME_STATE_MAIN_MENU;self.clear_input_fields()
         else:
@@ -697,7 +664,7 @@ class Game:
     def draw_register_screen(self):
         theme = self.active_theme;
         self.screen.fill(theme.get("login_bg", (50, 40, 60)));
-        ts = self.font_large.render("Kayıt Ol", True, theme.get("login_title_color", (220, 200, 255)));
+        ts = self.render_text(self.font_large, "Kayıt Ol", True, theme.get("login_title_color", (220, 200, 255)));
         tr = ts.get_rect(center=(self.screen_width // 2, self.screen_height // 6));
         self.screen.blit(ts, tr);
         iw = 300;
@@ -717,33 +684,33 @@ class Game:
         btc = theme.get("login_button_text_color");
         ltc = theme.get("login_link_text_color");
         cy = tr.bottom + 30;
-        uls = self.font_small.render("Yeni Kullanıcı Adı:", 1, lc);
+        uls = self.render_text(self.font_small, "Yeni Kullanıcı Adı:", 1, lc);
         self.screen.blit(uls, ((self.screen_width - iw) // 2, cy - 20));
         urr = pygame.Rect((self.screen_width - iw) // 2, cy, iw, ih);
         self.register_screen_elements["username_input_reg"] = urr;
         pygame.draw.rect(self.screen, ibg, urr, 0, 3);
         pygame.draw.rect(self.screen, ab if self.active_input_field == "username_reg" else ib, urr, 2, 3);
-        urts = self.font_medium.render(self.input_texts["username_reg"], 1, tc);
+        urts = self.render_text(self.font_medium, self.input_texts["username_reg"], 1, tc);
         self.screen.blit(urts, (urr.x + 8, urr.y + (ih - urts.get_height()) // 2));
         cy += ih + fs * 2;
-        prls = self.font_small.render("Şifre:", 1, lc);
+        prls = self.render_text(self.font_small, "Şifre:", 1, lc);
         self.screen.blit(prls, ((self.screen_width - iw) // 2, cy - 20));
         prr = pygame.Rect((self.screen_width - iw) // 2, cy, iw, ih);
         self.register_screen_elements["password_input_reg"] = prr;
         pygame.draw.rect(self.screen, ibg, prr, 0, 3);
         pygame.draw.rect(self.screen, ab if self.active_input_field == "password_reg" else ib, prr, 2, 3);
         prd = "*" * len(self.input_texts["password_reg"]);
-        prts = self.font_medium.render(prd, 1, tc);
+        prts = self.render_text(self.font_medium, prd, 1, tc);
         self.screen.blit(prts, (prr.x + 8, prr.y + (ih - prts.get_height()) // 2));
         cy += ih + fs * 2;
-        pcls = self.font_small.render("Şifre Tekrar:", 1, lc);
+        pcls = self.render_text(self.font_small, "Şifre Tekrar:", 1, lc);
         self.screen.blit(pcls, ((self.screen_width - iw) // 2, cy - 20));
         pcr = pygame.Rect((self.screen_width - iw) // 2, cy, iw, ih);
         self.register_screen_elements["password_input_confirm_reg"] = pcr;
         pygame.draw.rect(self.screen, ibg, pcr, 0, 3);
         pygame.draw.rect(self.screen, ab if self.active_input_field == "password_confirm_reg" else ib, pcr, 2, 3);
         pcd = "*" * len(self.input_texts["password_confirm_reg"]);
-        pcts = self.font_medium.render(pcd, 1, tc);
+        pcts = self.render_text(self.font_medium, pcd, 1, tc);
         self.screen.blit(pcts, (pcr.x + 8, pcr.y + (ih - pcts.get_height()) // 2));
         cy += ih + fs * 2 + 10;
         bw = 140;
@@ -753,21 +720,21 @@ class Game:
         rbr = pygame.Rect(self.screen_width // 2 - bw - bs // 2, cy, bw, bh);
         self.register_screen_elements["register_button"] = rbr;
         pygame.draw.rect(self.screen, bph if rbr.collidepoint(mph) else bpi, rbr, 0, 5);
-        rbts = self.font_medium.render("Kayıt Ol", 1, btc);
+        rbts = self.render_text(self.font_medium, "Kayıt Ol", 1, btc);
         self.screen.blit(rbts, rbts.get_rect(center=rbr.center));
         llr = pygame.Rect(self.screen_width // 2 + bs // 2, cy, bw, bh);
         self.register_screen_elements["login_link_button_reg"] = llr;
         pygame.draw.rect(self.screen, bsh if llr.collidepoint(mph) else bsi, llr, 0, 5);
-        llts = self.font_medium.render("Giriş Yap", 1, ltc);
+        llts = self.render_text(self.font_medium, "Giriş Yap", 1, ltc);
         self.screen.blit(llts, llts.get_rect(center=llr.center));
         cy += bh + 15;
         bbmr = pygame.Rect((self.screen_width - (bw * 1.5)) // 2, cy, bw * 1.5, bh);
         self.register_screen_elements["back_button_menu_reg"] = bbmr;
         pygame.draw.rect(self.screen, bdh if bbmr.collidepoint(mph) else bdi, bbmr, 0, 5);
-        bmts = self.font_medium.render("Ana Menüye Dön", 1,
+        bmts = self.render_text(self.font_medium, "Ana Menüye Dön", 1,
                                        theme.get("login_button_text_color_danger", (255, 200, 200)));
         self.screen.blit(bmts, bmts.get_rect(center=bbmr.center));
-        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.font_medium.render(
+        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.render_text(self.font_medium, 
             self.feedback_message, 1, self.active_theme.get("feedback_text_color"));bgr = fbs.get_rect(
             center=(self.screen_width // 2, self.screen_height - 40));bgr.inflate_ip(20, 10);bgs = pygame.Surface(
             bgr.size, pygame.SRCALPHA);bgs.fill(self.active_theme.get("feedback_bg_color"));self.screen.blit(bgs,
@@ -835,11 +802,9 @@ class Game:
         self.input_texts["password_reg"] = "";self.input_texts["password_confirm_reg"] = "";return
         if len(pw) < 3: self.show_feedback_message("Şifre en az 3 karakter olmalı!",
                                                    self.feedback_message_duration);return
-        users = self._load_users()
-        if un in users: self.show_feedback_message("Bu kullanıcı adı zaten alınmış!",
-                                                   self.feedback_message_duration);return
-        users[un] = {"password": pw, "theme": "default", "scores": {}}
-        if self._save_users(users):
+        if self.user_store.user_exists(un): self.show_feedback_message("Bu kullanıcı adı zaten alınmış!",
+                                                                       self.feedback_message_duration);return
+        if self.user_store.create_user(un, pw):
             self.show_feedback_message("Kayıt başarılı! Şimdi giriş yapabilirsiniz.", self.feedback_message_duration)
             self.current_game_state = GAME_STATE_LOGIN;
             self.clear_input_fields();
@@ -854,11 +819,11 @@ class Game:
                                                                                  GAME_STATE_REGISTER,
                                                                                  GAME_STATE_THEME_SELECTION,
                                                                                  GAME_STATE_SCOREBOARD]:
-            print(
-                "Game could not be initialized properly (e.g. level files missing). Exiting or displaying error on screen.")
+            logger.error("Game could not be initialized properly (e.g. level files missing). "
+                         "Exiting or displaying error on screen.")
             if self.screen and pygame.get_init():
                 self.screen.fill((50, 0, 0))
-                error_surf = self.font_medium.render("FATAL: INIT FAILED. Check Console/Level Files.", True,
+                error_surf = self.render_text(self.font_medium, "FATAL: INIT FAILED. Check Console/Level Files.", True,
                                                      (255, 255, 255))
                 rect = error_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
                 self.screen.blit(error_surf, rect)
@@ -872,6 +837,7 @@ class Game:
         while self.running:
             self.dt = self.clock.tick(60) / 1000.0
 
+            frame_started_ns = time.perf_counter_ns()
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
@@ -882,6 +848,11 @@ class Game:
                 if self.feedback_message_timer == 0:
                     self.feedback_message = ""
 
+            if self.current_game_state != GAME_STATE_GAMEPLAY or any(
+                    event.type in WINDOW_EXPOSE_EVENTS for event in events):
+                # Menüler tüm ekranı kendileri çiziyor; oyuna dönüldüğünde ilk kare tam çizilmeli
+                self.map_renderer.invalidate_frame()
+
             if self.current_game_state == GAME_STATE_MAIN_MENU:
                 for event in events:
                     self.handle_main_menu_input(event)
@@ -909,22 +880,33 @@ class Game:
 
             elif self.current_game_state == GAME_STATE_GAMEPLAY:
                 if not self.initialized_successfully:
-                    print("Error: Gameplay state entered but not properly initialized. Returning to main menu.")
+                    logger.error("Gameplay state entered but not properly initialized. Returning to main menu.")
                     self.current_game_state = GAME_STATE_MAIN_MENU
                     self.show_feedback_message("Oyun başlatılamadı. Menüye dönülüyor.", self.feedback_message_duration)
                     continue
 
-                for event in events:
-                    self.handle_gameplay_events(event)
+                with self.profiler.span("frame.events"):
+                    for event in events:
+                        self.handle_gameplay_events(event)
 
                 if not self.game_over_flag:
                     if self.current_player_id == PLAYER_AI_ID and self.running and not self.ai_turn_processed_this_round:
-                        self.process_ai_turn()
-                    self.update_gameplay()
-
-                self.render_gameplay()
-
-        print("Exiting game loop...")
+                        with self.profiler.span("frame.ai"):
+                            self.process_ai_turn()
+                    with self.profiler.span("frame.update"):
+                        self.update_gameplay()
+
+                with self.profiler.span("frame.render"):
+                    self.render_gameplay()
+                if self.profiler.enabled:
+                    self.profiler.record("frame", frame_started_ns, time.perf_counter_ns() - frame_started_ns)
+
+        logger.info("Exiting game loop...")
+        logger.info("Text surface cache: %s", self.text_cache.stats())
+        self.user_store.close()
+        self._close_journal()
+        if self.ai_turn_pipeline: self.ai_turn_pipeline.cancel()
+        self.state.close()  # MCTS süreç havuzları
         if pygame.get_init():
             pygame.quit()
 
@@ -932,7 +914,7 @@ class Game:
     def draw_theme_selection_screen(self):
         theme = self.active_theme;
         self.screen.fill(theme.get("background_main_menu", (20, 20, 30)));
-        ts = self.font_large.render("Tema Seçimi", 1, theme.get("title_main_menu", (200, 220, 255)));
+        ts = self.render_text(self.font_large, "Tema Seçimi", 1, theme.get("title_main_menu", (200, 220, 255)));
         tr = ts.get_rect(center=(self.screen_width // 2, self.screen_height // 6));
         self.screen.blit(ts, tr);
         bh = 45;
@@ -965,7 +947,7 @@ class Game:
                 cc = hc
             pygame.draw.rect(self.screen, cc, br, 0, 5);
             pygame.draw.rect(self.screen, bc, br, 3 if isa else 2, 5);
-            tss = self.font_medium.render(tdn, 1, trc);
+            tss = self.render_text(self.font_medium, tdn, 1, trc);
             txtr = tss.get_rect(center=br.center);
             self.screen.blit(tss, txtr)
         bby = sy + nt * (bh + 10) + 30;
@@ -978,9 +960,9 @@ class Game:
         bbc = bhc if bbr.collidepoint(mp) else bic;
         pygame.draw.rect(self.screen, bbc, bbr, 0, 5);
         pygame.draw.rect(self.screen, bc, bbr, 2, 5);
-        bts = self.font_medium.render("Ana Menüye Dön", 1, theme.get("login_button_text_color"));
+        bts = self.render_text(self.font_medium, "Ana Menüye Dön", 1, theme.get("login_button_text_color"));
         self.screen.blit(bts, bts.get_rect(center=bbr.center));
-        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.font_medium.render(
+        if self.feedback_message_timer > 0 and self.feedback_message: fbs = self.render_text(self.font_medium, 
             self.feedback_message, 1, self.active_theme.get("feedback_text_color"));bgr = fbs.get_rect(
             center=(self.screen_width // 2, self.screen_height - 40));bgr.inflate_ip(20, 10);bgs = pygame.Surface(
             bgr.size, pygame.SRCALPHA);bgs.fill(self.active_theme.get("feedback_bg_color"));self.screen.blit(bgs,
@@ -1004,47 +986,42 @@ class Game:
     def draw_scoreboard_screen(self):
         theme = self.active_theme;
         self.screen.fill(theme.get("background_main_menu", (25, 25, 35)))
-        title_surf = self.font_large.render("Skor Tablosu", True, theme.get("title_main_menu", (200, 220, 255)))
+        title_surf = self.render_text(self.font_large, "Skor Tablosu", True, theme.get("title_main_menu", (200, 220, 255)))
         title_rect = title_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 8))
         self.screen.blit(title_surf, title_rect)
-        all_users_data = self._load_users();
-        level_scores = {}
-        for username, user_data_obj in all_users_data.items():
-            if isinstance(user_data_obj, dict):
-                user_scores = user_data_obj.get("scores", {})
-                for level_id_str, score in user_scores.items():
-                    if level_id_str not in level_scores: level_scores[level_id_str] = []
-                    level_scores[level_id_str].append((score, username))
+        level_numbers = self.leaderboard.levels()
         current_y = title_rect.bottom + 20;
         line_height = 28;
         score_text_color = theme.get("text_main_menu_button", (220, 220, 255));
         level_title_color = theme.get("title_main_menu", (200, 200, 255));
         max_scores_display = 5
-        if not level_scores:
-            no_scores_surf = self.font_medium.render("Henüz hiç skor kaydedilmemiş.", True, score_text_color)
+        if not level_numbers:
+            no_scores_surf = self.render_text(self.font_medium, "Henüz hiç skor kaydedilmemiş.", True, score_text_color)
             self.screen.blit(no_scores_surf, no_scores_surf.get_rect(center=(self.screen_width // 2, current_y + 50)))
         else:
-            sorted_level_ids = sorted(level_scores.keys(), key=lambda x: int(x.replace("level", "")))
-            for level_id_str in sorted_level_ids:
+            page_hint_surf = self.render_text(self.font_small, f"Sayfa {self.scoreboard_page + 1}  (<- / -> ile değiştir)",
+                                              True, score_text_color)
+            self.screen.blit(page_hint_surf, page_hint_surf.get_rect(center=(self.screen_width // 2, current_y)))
+            current_y += line_height
+            for level_number in level_numbers:
                 if current_y + line_height * (max_scores_display + 2) > self.screen_height - 80: break
-                level_display_num = level_id_str.replace("level", "")
-                level_title_surf = self.font_medium.render(f"--- Seviye {level_display_num} En İyiler ---", True,
+                level_display_num = level_number
+                level_title_surf = self.render_text(self.font_medium, f"--- Seviye {level_display_num} En İyiler ---", True,
                                                            level_title_color)
                 self.screen.blit(level_title_surf,
                                  level_title_surf.get_rect(center=(self.screen_width // 2, current_y)));
                 current_y += line_height
-                sorted_scores = sorted(level_scores[level_id_str], key=lambda x: x[0], reverse=True)[
-                                :max_scores_display]
+                sorted_scores = self.leaderboard.page(level_number, self.scoreboard_page, max_scores_display)
                 if not sorted_scores:
-                    no_score_level_surf = self.font_small.render("Bu seviye için skor yok.", True, score_text_color)
+                    no_score_level_surf = self.render_text(self.font_small, "Bu seviye için skor yok.", True, score_text_color)
                     self.screen.blit(no_score_level_surf,
                                      no_score_level_surf.get_rect(center=(self.screen_width // 2, current_y)));
                     current_y += line_height - 10
                 else:
-                    for rank, (score, username) in enumerate(sorted_scores):
+                    for rank, score, username in sorted_scores:
                         if current_y + line_height > self.screen_height - 80: break
-                        score_line = f"{rank + 1}. {username}: {score} Puan"
-                        score_surf = self.font_small.render(score_line, True, score_text_color)
+                        score_line = f"{rank}. {username}: {score} Puan"
+                        score_surf = self.render_text(self.font_small, score_line, True, score_text_color)
                         self.screen.blit(score_surf, score_surf.get_rect(center=(self.screen_width // 2, current_y)));
                         current_y += line_height - 8
                 current_y += 15
@@ -1060,11 +1037,11 @@ class Game:
         pygame.draw.rect(self.screen, back_button_color, back_button_rect, border_radius=5);
         pygame.draw.rect(self.screen, theme.get("button_main_menu_border", (120, 120, 150)), back_button_rect, 2,
                          border_radius=5)
-        back_text_surf = self.font_medium.render("Ana Menüye Dön", True,
+        back_text_surf = self.render_text(self.font_medium, "Ana Menüye Dön", True,
                                                  theme.get("login_button_text_color", (255, 255, 255)));
         self.screen.blit(back_text_surf, back_text_surf.get_rect(center=back_button_rect.center))
         if self.feedback_message_timer > 0 and self.feedback_message:
-            feedback_surf = self.font_medium.render(self.feedback_message, True,
+            feedback_surf = self.render_text(self.font_medium, self.feedback_message, True,
                                                     self.active_theme.get("feedback_text_color", (255, 200, 0)))
             bg_rect = feedback_surf.get_rect(center=(self.screen_width // 2, self.screen_height - 80));
             bg_rect.inflate_ip(20, 10)
@@ -1083,6 +1060,8 @@ class Game:
                 self.show_feedback_message("", 0)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: self.current_game_state = GAME_STATE_MAIN_MENU; self.show_feedback_message(
             "", 0)
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN): self.scoreboard_page += 1
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFT, pygame.K_PAGEUP): self.scoreboard_page = max(0, self.scoreboard_page - 1)
 
     # --- Kalan Gameplay Metodları ---
     def highlight_movable_tiles(self, unit):
@@ -1105,23 +1084,7 @@ class Game:
         self.clear_highlighted_tiles(); self.clear_highlighted_attack_tiles()
 
     def execute_command(self, command):  # !!! DÜZELTİLMİŞ HALİ !!!
-        command_successful = False
-        acting_unit = None
-        if command and hasattr(command, 'unit') and command.unit:
-            acting_unit = command.unit
-
-        if acting_unit:
-            if acting_unit.is_alive():
-                if command.execute():
-                    self.command_history.append(command)
-                    command_successful = True
-            # else: Hata mesajı execute içinde verilebilir veya burada da eklenebilir
-        elif command and hasattr(command, 'execute'):  # Birimsiz genel komut
-            if command.execute():
-                command_successful = True
-
-        if command_successful:
-            self.game_map.units = [u for u in self.game_map.units if u.is_alive()]
+        if self.state.execute_command(command):
             if self.selected_unit:
                 s_unit = self.selected_unit  # Okunurluk için
                 if not s_unit.is_alive() or \
@@ -1143,12 +1106,9 @@ class Game:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_u and self.current_player_id == PLAYER_HUMAN_ID and self.command_history and not self.game_over_flag:
                 # ... (undo kodu aynı) ...
-                lc = self.command_history.pop();
-                uu = None
-                if hasattr(lc, 'unit') and lc.unit: uu = lc.unit;uu.has_acted_this_turn = False;print(
-                    f"Undo: {uu.id} can act.")
-                lc.undo();
-                self.game_map.units = [u for u in self.game_map.units if u.is_alive()]
+                lc = self.state.undo_last_command();
+                uu = getattr(lc, 'unit', None)
+                if uu: logger.debug("Undo: %s can act.", uu.id)
                 self.selected_unit = None;
                 self.clear_all_highlights();
                 self.show_feedback_message(f"Action Undone{(f' for {uu.unit_type}' if uu else '')}",
@@ -1160,11 +1120,17 @@ class Game:
             if event.key == pygame.K_r and self.current_player_id == PLAYER_HUMAN_ID and not self.game_over_flag:  # !!! YENİ: 'R' TUŞU İLE GÖSTER/GİZLE !!!
                 self.show_ai_threat_display = not self.show_ai_threat_display
                 if self.show_ai_threat_display:
-                    self._calculate_ai_threat_tiles()  # Açıksa yeniden hesapla (AI hareket etmiş olabilir)
+                    # Tehdit haritası birimler hareket ettikçe güncelleniyor, burada yeniden hesaplamaya gerek yok
                     self.show_feedback_message("AI Tehdit Alanı Gösteriliyor", self.feedback_message_duration // 2)
                 else:
                     self.show_feedback_message("AI Tehdit Alanı Gizlendi", self.feedback_message_duration // 2)
 
+            if event.key == pygame.K_F3:  # Profil ölçümü ve paneli birlikte açılıp kapanır
+                self.profiler.set_enabled(self.profiler_overlay.toggle())
+                self.show_feedback_message(f"Profiler {'On' if self.profiler.enabled else 'Off'}",
+                                           self.feedback_message_duration // 2)
+            if event.key == pygame.K_F4: self.export_profile_trace()
+
             if event.key == pygame.K_ESCAPE and not self.game_over_flag:
                 self.show_feedback_message("Returning to Main Menu...", self.feedback_message_duration // 2)
                 if self.selected_unit: self.selected_unit.set_state(IdleState(self.selected_unit),
@@ -1176,42 +1142,7 @@ class Game:
             for unit in self.game_map.units:
                 if unit.is_alive(): unit.update(self.dt)
 
-    def render_gameplay(self):
-        if not self.initialized_successfully or not hasattr(self, 'game_map') or not self.game_map:
-            # ... (hata çizimi aynı) ...
-            return
-
-        self.screen.fill(self.active_theme.get("gameplay_bg", (30, 30, 30)))
-        if self.game_map: self.game_map.draw(self.screen, self.active_theme, self.font_small)  # font_small'u yolla
-
-        # Hareket ve Saldırı menzili vurguları (öncekiyle aynı)
-        move_highlight_color = self.active_theme.get("highlight_move", (0, 255, 0, 80))
-        attack_highlight_color = self.active_theme.get("highlight_attack", (255, 0, 0, 80))
-        for tile in self.highlighted_tiles_for_move:
-            highlight_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA);
-            highlight_surf.fill(move_highlight_color)
-            self.screen.blit(highlight_surf, (tile.pixel_x, tile.pixel_y))
-        for tile in self.highlighted_tiles_for_attack:
-            highlight_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA);
-            highlight_surf.fill(attack_highlight_color)
-            self.screen.blit(highlight_surf, (tile.pixel_x, tile.pixel_y))
-
-        # !!! YENİ: AI Tehdit Alanını Çizdirme !!!
-        if self.show_ai_threat_display:
-            #print(
-                #f"DEBUG: render_gameplay - show_ai_threat_display: {self.show_ai_threat_display}, content of ai_threat_tiles: {self.ai_threat_tiles}")
-            ai_threat_color = self.active_theme.get("ai_threat_range_color", (128, 0, 128, 70))
-            #if not self.ai_threat_tiles:  # Ekstra kontrol: Eğer set boşsa bir şey çizme
-                #print("DEBUG: ai_threat_tiles is empty, nothing to draw for AI threat.")
-
-            for gx, gy in self.ai_threat_tiles:
-                tile = self.game_map.get_tile_at_grid_coords(gx, gy)
-                if tile:
-                    threat_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
-                    threat_surf.fill(ai_threat_color)
-                    self.screen.blit(threat_surf, (tile.pixel_x, tile.pixel_y))
-
-        text_color = self.active_theme.get("gameplay_info_text_color", (230, 230, 230))
+    def _gameplay_status_text(self):
         level_turn_text_str = f"Lvl:{self.current_level_number} | Turn: P{self.current_player_id}({'Human' if self.current_player_id == PLAYER_HUMAN_ID else 'AI'}) | Turns: {self.turns_taken_this_level}"
         if self.game_over_flag:  # ... (oyun sonu mesajı) ...
             cf = self.feedback_message;
@@ -1227,40 +1158,80 @@ class Game:
             else:
                 lts = f"GAME OVER - Lvl {self.current_level_number}"
             level_turn_text_str = lts
-        level_turn_surface = self.font_medium.render(level_turn_text_str, True, text_color);
-        self.screen.blit(level_turn_surface, (10, 10))
-        cts = "'E'End|'K'Save|'U'Undo|'R'Threat|'ESC'Menu";
-        cts_s = self.font_small.render(cts, True, text_color);
-        r = cts_s.get_rect(bottomright=(self.screen_width - 10, self.screen_height - 10));
-        self.screen.blit(cts_s, r)  # 'R' Threat EKLENDİ
-        if self.feedback_message_timer > 0 and self.feedback_message and not (
-                self.game_over_flag and level_turn_text_str == self.feedback_message):
-            fs = self.font_medium.render(self.feedback_message, True,
-                                         self.active_theme.get("feedback_text_color", (255, 200, 0)));
-            bgr = fs.get_rect(center=(self.screen_width // 2, self.screen_height - 30));
-            bgr.inflate_ip(20, 10)
-            bgs = pygame.Surface(bgr.size, pygame.SRCALPHA);
-            bgs.fill(self.active_theme.get("feedback_bg_color", (20, 20, 20, 200)));
-            self.screen.blit(bgs, bgr.topleft);
-            self.screen.blit(fs, fs.get_rect(center=bgr.center))
-        pygame.display.flip()
+        return level_turn_text_str
+
+    def render_gameplay(self):
+        if not self.initialized_successfully or not hasattr(self, 'game_map') or not self.game_map:
+            # ... (hata çizimi aynı) ...
+            return
+
+        level_turn_text_str = self._gameplay_status_text()
+        show_feedback = self.feedback_message_timer > 0 and self.feedback_message and not (
+                self.game_over_flag and level_turn_text_str == self.feedback_message)
+        threat_map = self.threat_maps.get(PLAYER_AI_ID) if self.show_ai_threat_display else None
+
+        # Karo katmanı önbellekten gelir; birimler dışında ekrandaki her şey overlay_key'de.
+        # Hiçbir şey değişmediyse bu kare çizilmez, sadece birimler değiştiyse kirli alanlar güncellenir.
+        profiler = self.profiler
+        viewport = self.map_renderer.viewport(self.game_map, self.screen.get_size())
+        with profiler.span("render.tiles"):
+            static_layer = self.map_renderer.static_layer(self.game_map, self.active_theme, viewport)
+        move_coords = tuple((t.x_grid, t.y_grid) for t in self.highlighted_tiles_for_move)
+        attack_coords = tuple((t.x_grid, t.y_grid) for t in self.highlighted_tiles_for_attack)
+        overlay_key = (self.active_theme_name, level_turn_text_str, self.feedback_message if show_feedback else None,
+                       move_coords, attack_coords, threat_map.version if threat_map else None,
+                       self.profiler_overlay.frame_key())
+        needs_draw, dirty_rects = self.map_renderer.plan_frame(self.game_map, overlay_key)
+        if not needs_draw:
+            return
+
+        self.screen.fill(self.active_theme.get("gameplay_bg", (30, 30, 30)))
+        self.screen.blit(static_layer, (0, 0))
+        with profiler.span("render.units"):
+            self.game_map.draw_units(self.screen, self.active_theme, self.font_small, self.text_cache)
+
+        # Hareket/saldırı vurguları ve AI tehdit alanı tek bir önbellekli katmandan gelir;
+        # katman sadece vurgu kümeleri veya tehdit haritası değişince yeniden kurulur.
+        if move_coords or attack_coords or threat_map:
+            with profiler.span("render.overlays"):
+                overlay_surf = self.highlight_overlay.surface(
+                    viewport, self.tile_size, self.active_theme, move_coords, attack_coords,
+                    threat_map.threatened_coords() if threat_map else None, threat_map.version if threat_map else None)
+                self.screen.blit(overlay_surf, (0, 0))
+
+        with profiler.span("render.hud"):
+            text_color = self.active_theme.get("gameplay_info_text_color", (230, 230, 230))
+            level_turn_surface = self.render_text(self.font_medium, level_turn_text_str, True, text_color);
+            self.screen.blit(level_turn_surface, (10, 10))
+            cts = "'E'End|'K'Save|'U'Undo|'R'Threat|'F3'Profiler|'ESC'Menu";
+            cts_s = self.render_text(self.font_small, cts, True, text_color);
+            r = cts_s.get_rect(bottomright=(self.screen_width - 10, self.screen_height - 10));
+            self.screen.blit(cts_s, r)  # 'R' Threat EKLENDİ
+            if show_feedback:
+                fs = self.render_text(self.font_medium, self.feedback_message, True,
+                                             self.active_theme.get("feedback_text_color", (255, 200, 0)));
+                bgr = fs.get_rect(center=(self.screen_width // 2, self.screen_height - 30));
+                bgr.inflate_ip(20, 10)
+                bgs = pygame.Surface(bgr.size, pygame.SRCALPHA);
+                bgs.fill(self.active_theme.get("feedback_bg_color", (20, 20, 20, 200)));
+                self.screen.blit(bgs, bgr.topleft);
+                self.screen.blit(fs, fs.get_rect(center=bgr.center))
+        if self.profiler_overlay.visible:
+            panel = self.profiler_overlay.surface(profiler)
+            self.screen.blit(panel, panel.get_rect(topright=(self.screen_width - 10, 10)))
+        with profiler.span("render.present"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
 
     def end_turn(self):
-        if self.current_player_id == PLAYER_HUMAN_ID and not self.game_over_flag: self.turns_taken_this_level += 1; print(
-            f"DEBUG: Human ending turn. Turns: {self.turns_taken_this_level}")
         self.show_feedback_message(f"P{self.current_player_id} Ends Turn", self.feedback_message_duration // 2)
         if self.selected_unit: self.selected_unit.set_state(IdleState(self.selected_unit),
                                                             self);self.selected_unit = None
         self.clear_all_highlights();
-        self.command_history.clear()
-        np_id = PLAYER_AI_ID if self.current_player_id == PLAYER_HUMAN_ID else PLAYER_HUMAN_ID;
-        self.current_player_id = np_id
-        self.reset_unit_actions_for_player(self.current_player_id)
+        self.state.end_turn()
         if self.current_player_id == PLAYER_AI_ID: self.ai_turn_processed_this_round = False
-        elif self.current_player_id == PLAYER_HUMAN_ID:  # !!! İNSAN SIRASI BAŞLADIĞINDA !!!
-            self._calculate_ai_threat_tiles()  # AI tehdit alanını hesapla/güncelle
-            # self.show_ai_threat_display = True # İstersen her tur başında otomatik açılsın
-            # ya da oyuncu kendi tuşuyla açsın
         if not self.check_game_over(): self.show_feedback_message(f"P{self.current_player_id}'s Turn",
                                                                   self.feedback_message_duration)
 
@@ -1268,39 +1239,25 @@ class Game:
         if not hasattr(self, 'game_map') or not self.game_map:
             # Eğer game_map yoksa (örn: oyun düzgün başlatılamadıysa) erken çık
             if self.initialized_successfully:  # Ama oyunun başladığını düşünüyorsak hata ver
-                print("ERROR: check_game_over called without a valid game_map after successful init!")
+                logger.error("check_game_over called without a valid game_map after successful init!")
             return False
 
-        human_units_alive_list = [u for u in self.game_map.units if u.player_id == PLAYER_HUMAN_ID and u.is_alive()]
-        ai_units_alive = any(u.is_alive() for u in self.game_map.units if u.player_id == PLAYER_AI_ID)
-
-        human_has_units = len(human_units_alive_list) > 0
-
-        game_over_message = ""
-        level_cleared_by_human = False
-
         # current_level_number, o an oynanan seviyedir. Eğer bu seviye temizlenirse, skor bu seviye için kaydedilir.
         level_just_finished = self.current_level_number
 
-        if human_has_units and not ai_units_alive:  # İnsan kazandı
-            game_over_message = f"LEVEL {level_just_finished} CLEARED!"
-            level_cleared_by_human = True
-        elif not human_has_units and ai_units_alive:  # AI kazandı
-            game_over_message = f"LEVEL {level_just_finished} FAILED! AI Wins!"
-            self.game_over_flag = True  # Oyun genel olarak bitti (kayıp)
-        elif not human_has_units and not ai_units_alive and len(
-                self.game_map.units) == 0 and self.initialized_successfully:  # Harita tamamen boşaldıysa (beraberlik)
-            game_over_message = f"LEVEL {level_just_finished} FAILED! Draw!"
-            self.game_over_flag = True
+        # Kazanma/kaybetme/beraberlik kuralları GameState'te; burada skor ve seviye geçişi yönetiliyor
+        result = self.state.evaluate_game_over()
+        game_over_message = self.state.game_over_message(result) if result else ""
+        level_cleared_by_human = result == RESULT_LEVEL_CLEARED
 
         if game_over_message:  # Eğer bir sonuç mesajı oluştuysa (kazanma, kaybetme, beraberlik)
-            print(game_over_message)
+            logger.info("%s", game_over_message)
             self.show_feedback_message(game_over_message, 180)  # Mesajı ekranda göster
 
             if level_cleared_by_human:
                 # Skoru, seviye bittiğindeki tur sayısı ve kalan birimlerle hesapla
                 turns_for_this_level = self.turns_taken_this_level  # O seviyede harcanan tur
-                remaining_units_count = len(human_units_alive_list)  # Kalan insan birimi sayısı
+                remaining_units_count = len(self.state.living_units(PLAYER_HUMAN_ID))  # Kalan insan birimi sayısı
 
                 # _calculate_score metoduna doğru parametreleri yolla
                 calculated_score = self._calculate_score(turns_for_this_level, remaining_units_count)
@@ -1330,116 +1287,68 @@ class Game:
     def _record_score(self, score_to_record, level_number_cleared):  # PARAMETRE ALIYOR
         """Hesaplanan skoru mevcut kullanıcı için kaydeder."""
         if not self.current_user:
-            print("DEBUG: _record_score - No current_user to record score for.")
+            logger.debug("_record_score - No current_user to record score for.")
             return
 
         level_id_str = f"level{level_number_cleared}"
         # current_score (score_to_record) zaten parametre olarak geliyor.
-        print(
-            f"DEBUG: _record_score - User: {self.current_user}, Level Cleared: {level_id_str}, Score to Record: {score_to_record}")
-
-        users = self._load_users()
-        user_data_container = users.get(self.current_user)
-
-        if not isinstance(user_data_container, dict):
-            user_data_container = {"password": "", "theme": "default", "scores": {}}
-            users[self.current_user] = user_data_container
-            print(f"DEBUG: _record_score - User data for {self.current_user} initialized as dict.")
-
-        if "scores" not in user_data_container:
-            user_data_container["scores"] = {}
-            print(f"DEBUG: _record_score - 'scores' dict created for {self.current_user}.")
-
-        previous_best_score = user_data_container["scores"].get(level_id_str, 0)
-        print(f"DEBUG: _record_score - Previous best for {self.current_user} on {level_id_str}: {previous_best_score}")
-
-        score_updated = False
-        if score_to_record > previous_best_score:
-            user_data_container["scores"][level_id_str] = score_to_record
-            self.show_feedback_message(f"Yeni Yüksek Skor Lvl {level_number_cleared}: {score_to_record}!",
-                                       self.feedback_message_duration)
-            score_updated = True
-            print(f"DEBUG: _record_score - New high score recorded: {score_to_record}")
-        elif previous_best_score == 0 and score_to_record > 0:
-            user_data_container["scores"][level_id_str] = score_to_record
-            self.show_feedback_message(f"Skor Lvl {level_number_cleared}: {score_to_record}!",
-                                       self.feedback_message_duration)
-            score_updated = True
-            print(f"DEBUG: _record_score - First score recorded: {score_to_record}")
-        else:
-            print(
-                f"DEBUG: _record_score - Score {score_to_record} not higher than {previous_best_score}. Not overwriting.")
+        logger.debug("_record_score - User: %s, Level Cleared: %s, Score to Record: %s", self.current_user,
+                     level_id_str, score_to_record)
+
+        # Depo ve skor tablosu dizini birlikte güncellenir (O(log k)); yazma başarısızsa ikisi de değişmez
+        score_updated, previous_best_score = self.leaderboard.record(self.current_user, level_number_cleared,
+                                                                     score_to_record)
+        logger.debug("_record_score - Previous best for %s on %s: %s", self.current_user, level_id_str,
+                     previous_best_score)
 
         if score_updated:
-            if self._save_users(users):
-                print(f"DEBUG: _record_score - Users data saved for {self.current_user}.")
+            if previous_best_score == 0:
+                self.show_feedback_message(f"Skor Lvl {level_number_cleared}: {score_to_record}!",
+                                           self.feedback_message_duration)
+                logger.debug("_record_score - First score recorded: %s", score_to_record)
             else:
-                print(f"DEBUG: _record_score - FAILED to save users data for {self.current_user}.")
+                self.show_feedback_message(f"Yeni Yüksek Skor Lvl {level_number_cleared}: {score_to_record}!",
+                                           self.feedback_message_duration)
+                logger.debug("_record_score - New high score recorded: %s", score_to_record)
         else:
-            print(f"DEBUG: _record_score - No score update needed for {self.current_user} on {level_id_str}.")
+            logger.debug("_record_score - No score update for %s on %s (score %s, best %s).", self.current_user,
+                         level_id_str, score_to_record, previous_best_score)
 
     def _calculate_score(self, turns_for_level, num_remaining_human_units):  # PARAMETRE ALIYOR
         """Belirli bir seviye için oyuncunun skorunu hesaplar."""
-        print(
-            f"DEBUG: _calculate_score - Turns for level: {turns_for_level}, Remaining human units: {num_remaining_human_units}")
+        return self.state.calculate_score(turns_for_level, num_remaining_human_units)
 
-        base_score = 5000  # Seviyeyi bitirme bazı
-        score = base_score
-        print(f"DEBUG: _calculate_score - Base score: {score}")
-
-        unit_bonus = num_remaining_human_units * 100
-        score += unit_bonus
-        print(f"DEBUG: _calculate_score - Unit bonus: {unit_bonus}, Score after unit bonus: {score}")
-
-        turn_penalty = turns_for_level * 20
-        score -= turn_penalty
-        print(f"DEBUG: _calculate_score - Turn penalty: {turn_penalty}, Score after penalty: {score}")
+    def process_ai_turn(self):
+        """AI turunu ana döngüyü bloklamadan ilerletir: kararlar arka planda hesaplanır,
+        hazır olan eylemler her karede ai_think_delay/ai_action_delay aralıklarıyla uygulanır."""
+        if self.current_player_id != PLAYER_AI_ID or self.ai_turn_processed_this_round or not self.running or self.game_over_flag:
+            return
+        if self.ai_turn_pipeline is None:
+            self.ai_turn_pipeline = AITurnPipeline(self.state, PLAYER_AI_ID, think_delay=self.ai_think_delay,
+                                                   action_delay=self.ai_action_delay, fast_mode=self.ai_fast_mode)
+            if not self.ai_turn_pipeline.units_total:
+                logger.info("AI no units/all acted.")
+            else:
+                self.show_feedback_message("AI thinking...", self.feedback_message_duration // 2)
+            self.ai_turn_pipeline.start()
 
-        final_score = max(0, score)  # Minimum skor 0
-        print(f"DEBUG: _calculate_score - Final calculated score: {final_score}")
-        return final_score
+        for ai_unit, action_command, executed in self.ai_turn_pipeline.update():
+            if action_command:
+                self.show_feedback_message(f"AI: {action_command.description}", self.feedback_message_duration)
 
-    def process_ai_turn(self):
-        if self.current_player_id == PLAYER_AI_ID and not self.ai_turn_processed_this_round and self.running and not self.game_over_flag:
-            self.show_feedback_message("AI thinking...", self.feedback_message_duration // 2);
-            pygame.display.flip();
-            time.sleep(0.1)
-            ai_units_to_act = [u for u in self.game_map.units if
-                               u.player_id == PLAYER_AI_ID and u.is_alive() and not u.has_acted_this_turn]
-            if not ai_units_to_act: print(
-                "AI no units/all acted.");self.ai_turn_processed_this_round = True;self.end_turn();return
-
-            any_action_taken_by_ai_this_turn = False
-            for ai_unit in ai_units_to_act:
-                if not self.running or self.game_over_flag: break
-                if not ai_unit.is_alive() or ai_unit.has_acted_this_turn: continue
-                pygame.display.flip();
-                time.sleep(0.3)
-
-                # !!! DEĞİŞİKLİK: Her birim kendi stratejisini kullanıyor !!!
-                strategy_to_use = ai_unit.ai_strategy_instance if ai_unit.ai_strategy_instance else self.default_ai_strategy
-                print(f"DEBUG: AI Unit ID {ai_unit.id} using strategy: {strategy_to_use.__class__.__name__}")
-                action_command = strategy_to_use.choose_action(ai_unit, self)
-
-                if action_command:
-                    self.show_feedback_message(f"AI: {action_command.description}", self.feedback_message_duration)
-                    if self.execute_command(
-                            action_command):  # execute_command artık birimin eylem yapıp yapmadığını kontrol ETMİYOR
-                        ai_unit.has_acted_this_turn = True  # AI birimi eylemini yaptı olarak işaretle
-                        any_action_taken_by_ai_this_turn = True
-                    pygame.display.flip();
-                    time.sleep(0.6)
-                else:  # Eylem bulamadıysa da o birim için eylem hakkı bitmiş sayılır.
-                    ai_unit.has_acted_this_turn = True
-                    print(
-                        f"AI Unit {ai_unit.id} (Player {ai_unit.player_id}) using {strategy_to_use.__class__.__name__} could not find/execute a valid action.")
-
-            if not any_action_taken_by_ai_this_turn and ai_units_to_act:
+        if self.ai_turn_pipeline.finished:
+            pipeline = self.ai_turn_pipeline
+            self.ai_turn_pipeline = None
+            if not pipeline.actions_taken and pipeline.units_total:
                 self.show_feedback_message("AI: No valid actions found this turn.", self.feedback_message_duration)
-
             self.ai_turn_processed_this_round = True  # AI'nın bu tur için tüm birimleriyle işi bitti
             self.end_turn()
 
+    def _cancel_ai_turn(self):
+        if self.ai_turn_pipeline:
+            self.ai_turn_pipeline.cancel()
+            self.ai_turn_pipeline = None
+
     def handle_mouse_click(self, mouse_pos):
         if self.current_player_id != PLAYER_HUMAN_ID or self.game_over_flag: return
         ct = self.game_map.get_tile_from_pixel_coords(mouse_pos[0], mouse_pos[1]);
@@ -1451,21 +1360,8 @@ class Game:
         elif ct and not self.selected_unit:
             self.clear_all_highlights()
 
-    def _calculate_ai_threat_tiles(self):
-        self.ai_threat_tiles.clear()
-        if not hasattr(self, 'game_map') or not self.game_map:
-            return
-
-        # print("DEBUG: Calculating AI potential attack zone...") # YORUMA ALINDI veya SİLİNDİ
-        any_zone_found = False
-        for unit in self.game_map.units:
-            if unit.player_id == PLAYER_AI_ID and unit.is_alive():
-                zone_coords = unit.get_attack_zone_coordinates(self.game_map)
-                if zone_coords:
-                    any_zone_found = True
-                    # print(f"DEBUG: AI Unit ID {unit.id} at ({unit.grid_x},{unit.grid_y}) can attack coords: {zone_coords}") # YORUMA ALINDI veya SİLİNDİ
-                    self.ai_threat_tiles.update(zone_coords)
-
-        # if not any_zone_found: # YORUMA ALINDI veya SİLİNDİ
-        # print("DEBUG: No AI units have any potential attack zones currently.") # YORUMA ALINDI veya SİLİNDİ
-        # print(f"DEBUG: Final calculated AI threat zone coordinates: {self.ai_threat_tiles}") # YORUMA ALINDI veya SİLİNDİ
\ No newline at end of file
+    @property
+    def ai_threat_tiles(self):
+        """AI birimlerinin saldırabileceği (x, y) kareleri; AI tehdit haritasından okunur, tarama yapılmaz."""
+        threat_map = self.threat_maps.get(PLAYER_AI_ID) if self.threat_maps else None
+        return threat_map.threatened_coords() if threat_map else []
@@ -0,0 +1,347 @@
+# src/game_core/game_state.py
+# Oyunun pygame'den bağımsız çekirdeği: harita, birimler, tur sırası ve oyun sonu kontrolü.
+# Game (pygame arayüzü) bu sınıfın üzerine ince bir çizim katmanı olarak oturur,
+# Simulator ise aynı çekirdeği pencere açmadan toplu oyunlar için kullanır.
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+from .map import Map
+from .terrain import level_terrain
+from .threat_map import ThreatMap
+from .flow_field import FlowFieldCache
+from .influence_map import InfluenceMapCache
+from .snapshot import StateSnapshot
+from .decision_cache import DecisionCache, encode_decision, decode_decision
+from .profiler import profiler
+from .unit import Unit
+from .unit_factory import UnitFactory
+from .ai_strategy import SimpleAggressiveStrategy, DefensiveStrategy, LookaheadStrategy, MCTSStrategy
+from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(SCRIPT_DIR)
+
+LEVELS_DIR = os.path.join(SRC_DIR, "levels")
+LEVEL_FILE_PREFIX = os.path.join(LEVELS_DIR, "level")
+
+MAX_LEVELS = 5
+DEFAULT_TILE_SIZE = 40
+DEFAULT_MAP_COLS = 15
+DEFAULT_MAP_ROWS = 10
+
+# check_game_over sonuçları
+RESULT_LEVEL_CLEARED = "level_cleared"
+RESULT_LEVEL_FAILED = "level_failed"
+RESULT_DRAW = "draw"
+
+
+def load_level_data(level_number):
+    """levels/levelN.json dosyasını okur. Dosya yoksa FileNotFoundError fırlatır."""
+    fn = f"{LEVEL_FILE_PREFIX}{level_number}.json"
+    with open(fn, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def create_ai_strategies():
+    return {
+        "SimpleAggressiveStrategy": SimpleAggressiveStrategy(),
+        "DefensiveStrategy": DefensiveStrategy(),
+        "LookaheadStrategy": LookaheadStrategy(),
+        "MCTSStrategy": MCTSStrategy()
+    }
+
+
+class GameState:
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE):
+        self.tile_size = tile_size
+        self.unit_factory = UnitFactory()
+        self.ai_strategies = create_ai_strategies()
+        self.default_ai_strategy = self.ai_strategies["SimpleAggressiveStrategy"]
+        self.decision_cache = DecisionCache()
+
+        self.game_map = None
+        self.threat_maps = {}  # player_id -> o oyuncunun birimlerinin tehdit ettiği kareler
+        self.flow_fields = None  # FlowFieldCache: oyuncuların birimlerine olan yürüme mesafesi alanları
+        self.influence_maps = None  # InfluenceMapCache: etki ve bir sonraki turda gelebilecek hasar katmanları
+        self.map_cols = 0
+        self.map_rows = 0
+        self.current_player_id = PLAYER_HUMAN_ID
+        self.current_level_number = 1
+        self.turns_taken_this_level = 0
+        self.command_history = []
+        self.game_over_flag = False
+        self.ai_turn_processed_this_round = False
+        self.seed = None
+        self.rng = random.Random()  # Stratejilerin kullandığı tek rastgelelik kaynağı (tohumlu, tekrar oynatılabilir)
+        self.journal = None  # CommandJournal; None ise günlük tutulmaz
+        self.decision_times = None  # Liste verilirse her AI kararının süresi (saniye) eklenir (turnuva/benchmark)
+        self._result_journaled = False
+
+    # --- Seviye Kurulumu ---
+    def setup_level(self, level_number, level_data, is_new_game_session=False,
+                    default_cols=DEFAULT_MAP_COLS, default_rows=DEFAULT_MAP_ROWS, seed=None):
+        """seed verilmezse rastgele seçilir; seçilen tohum self.seed'de ve günlükte saklanır."""
+        self.current_level_number = level_number
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng.seed(self.seed)
+        self._result_journaled = False
+        self.turns_taken_this_level = 0
+        self.command_history = []
+        self.map_cols = level_data.get("map_cols", default_cols)
+        self.map_rows = level_data.get("map_rows", default_rows)
+        game_map = Map(self.map_rows, self.map_cols, self.tile_size)
+        game_map.create_grid_from_template(level_terrain(level_data, self.map_rows, self.map_cols))
+        self.attach_map(game_map)
+        self.current_player_id = PLAYER_HUMAN_ID
+        self.game_map.units = []
+        if is_new_game_session: Unit._id_counter = 0
+        first_unit_id = Unit._id_counter
+        self.setup_units_from_level_data(level_data)
+        self.game_over_flag = False
+        self.reset_unit_actions_for_player(self.current_player_id)
+        if self.journal:
+            # Seviye dosyası sonradan değişse de tekrar oynatılabilsin diye verinin kendisi (çözülmüş boyutlarla) yazılır
+            journal_level_data = dict(level_data, map_cols=self.map_cols, map_rows=self.map_rows)
+            self.journal.begin_level(level_number, self.seed, first_unit_id, journal_level_data)
+
+    def attach_map(self, game_map):
+        """Haritayı duruma bağlar ve harita gözlemcilerini (tehdit haritaları) kurar."""
+        self.game_map = game_map
+        self.map_rows, self.map_cols = game_map.rows, game_map.cols
+        self.flow_fields = FlowFieldCache(game_map)
+        self.influence_maps = InfluenceMapCache(game_map)
+        self.decision_cache.clear()  # Hash'ler arazi ve birim kimliklerini içermez, başka haritada geçersiz
+        self.threat_maps = {}
+        for player_id in (PLAYER_HUMAN_ID, PLAYER_AI_ID):
+            threat_map = ThreatMap(game_map, player_id)
+            threat_map.rebuild()
+            game_map.add_observer(threat_map)
+            self.threat_maps[player_id] = threat_map
+
+    def setup_units_from_level_data(self, level_data):
+        for unit_info in level_data.get("player_units", []):
+            unit = self._create_unit_from_info(unit_info)
+            if unit:  # Birim başarıyla oluşturulduysa haritaya ekle
+                self.game_map.add_unit(unit, unit.grid_x, unit.grid_y)
+            else:
+                logger.error("Could not create player unit from info: %s", unit_info)
+
+        for unit_info in level_data.get("ai_units", []):
+            unit = self._create_unit_from_info(unit_info)
+            if unit:
+                if unit.player_id == PLAYER_AI_ID:  # Sadece AI birimleri için strateji ata
+                    strategy_id = unit_info.get("strategy_id", "SimpleAggressiveStrategy")  # Varsayılan strateji
+                    unit.ai_strategy_instance = self.ai_strategies.get(strategy_id)
+                    if not unit.ai_strategy_instance:
+                        logger.warning("Unknown strategy_id '%s' for AI unit. Using default.", strategy_id)
+                        unit.ai_strategy_instance = self.default_ai_strategy
+                self.game_map.add_unit(unit, unit.grid_x, unit.grid_y)
+            else:
+                logger.error("Could not create AI unit from info: %s", unit_info)
+
+    def _create_unit_from_info(self, unit_info):
+        # JSON'dan "grid_pos" listesini oku
+        grid_x, grid_y = unit_info["grid_pos"][0], unit_info["grid_pos"][1]
+        return self.unit_factory.create_unit(unit_info["type"], grid_x, grid_y, unit_info["player_id"])
+
+    # --- Tur Yönetimi ---
+    def living_units(self, player_id):
+        if not self.game_map: return []
+        return [u for u in self.game_map.units if u.player_id == player_id and u.is_alive()]
+
+    def reset_unit_actions_for_player(self, player_id):
+        if self.game_map:
+            for unit in self.game_map.spatial_index.units_of(player_id): unit.has_acted_this_turn = False
+        if player_id == PLAYER_AI_ID: self.ai_turn_processed_this_round = False
+
+    def execute_command(self, command):
+        command_successful = False
+        acting_unit = getattr(command, 'unit', None) if command else None
+
+        if acting_unit:
+            snapshot = StateSnapshot(self) if acting_unit.is_alive() else None
+            if acting_unit.is_alive() and command.execute():
+                command.snapshot_before = snapshot  # Geri alma, komutun kendi undo'su yerine bu görüntüye döner
+                self.command_history.append(command)
+                command_successful = True
+        elif command and hasattr(command, 'execute'):  # Birimsiz genel komut
+            command_successful = bool(command.execute())
+
+        if command_successful:
+            self.game_map.units = [u for u in self.game_map.units if u.is_alive()]
+            if self.journal: self.journal.record_command(command, self.current_player_id)
+        return command_successful
+
+    def snapshot(self):
+        return StateSnapshot(self)
+
+    def restore(self, snapshot):
+        snapshot.restore(self)
+
+    def undo_last_command(self):
+        """Komut geçmişindeki son komutu geri alır ve döndürür (geçmiş boşsa None).
+        Komuttan önce alınan anlık görüntüye dönülür; ölen birimler de haritaya geri gelir."""
+        if not self.command_history: return None
+        command = self.command_history.pop()
+        snapshot = getattr(command, 'snapshot_before', None)
+        if snapshot:
+            snapshot.restore(self)
+        else:  # Görüntüsü olmayan (dışarıdan eklenmiş) komut: eski davranış
+            unit = getattr(command, 'unit', None)
+            if unit: unit.has_acted_this_turn = False
+            command.undo()
+            self.game_map.units = [u for u in self.game_map.units if u.is_alive()]
+        if self.journal: self.journal.record_undo()
+        return command
+
+    def end_turn(self):
+        """Sırayı diğer oyuncuya geçirir ve yeni oyuncunun birimlerinin eylem haklarını yeniler."""
+        if self.current_player_id == PLAYER_HUMAN_ID and not self.game_over_flag:
+            self.turns_taken_this_level += 1
+            logger.debug("Human ending turn. Turns: %s", self.turns_taken_this_level)
+        self.command_history.clear()
+        self.current_player_id = PLAYER_AI_ID if self.current_player_id == PLAYER_HUMAN_ID else PLAYER_HUMAN_ID
+        self.reset_unit_actions_for_player(self.current_player_id)
+        if self.journal:
+            self.journal.record_end_turn(self.current_player_id, self.turns_taken_this_level, self.state_hash())
+        return self.current_player_id
+
+    def state_hash(self):
+        """Birim konumları/canları ve tur bilgisinden kısa bir özet. Tekrar oynatma kontrol noktalarında karşılaştırılır."""
+        digest = hashlib.sha1()
+        digest.update(f"{self.current_level_number}|{self.current_player_id}|{self.turns_taken_this_level}".encode())
+        for unit in sorted(self.game_map.units, key=lambda u: u.id) if self.game_map else []:
+            if unit.is_alive():
+                digest.update(f"|{unit.id},{unit.unit_type},{unit.player_id},{unit.grid_x},{unit.grid_y},"
+                              f"{unit.health}".encode())
+        return digest.hexdigest()[:16]
+
+    def evaluate_game_over(self):
+        """Seviyenin bitip bitmediğini kontrol eder; bittiyse RESULT_* sabitlerinden birini döndürür.
+        Kayıp ve beraberlikte game_over_flag ayarlanır, seviye geçişine karar vermek çağırana kalır."""
+        result = self._evaluate_game_over()
+        if result and self.journal and not self._result_journaled:
+            self.journal.record_result(result, self.state_hash())
+            self._result_journaled = True
+        return result
+
+    def _evaluate_game_over(self):
+        if not self.game_map:
+            return None
+        human_has_units = self.game_map.spatial_index.has_units(PLAYER_HUMAN_ID)
+        ai_units_alive = self.game_map.spatial_index.has_units(PLAYER_AI_ID)
+
+        if human_has_units and not ai_units_alive:  # İnsan kazandı
+            return RESULT_LEVEL_CLEARED
+        if not human_has_units and ai_units_alive:  # AI kazandı
+            self.game_over_flag = True
+            return RESULT_LEVEL_FAILED
+        if not human_has_units and not ai_units_alive and len(self.game_map.units) == 0:  # Harita tamamen boşaldı
+            self.game_over_flag = True
+            return RESULT_DRAW
+        return None
+
+    def game_over_message(self, result):
+        level = self.current_level_number
+        if result == RESULT_LEVEL_CLEARED: return f"LEVEL {level} CLEARED!"
+        if result == RESULT_LEVEL_FAILED: return f"LEVEL {level} FAILED! AI Wins!"
+        if result == RESULT_DRAW: return f"LEVEL {level} FAILED! Draw!"
+        return ""
+
+    def calculate_score(self, turns_for_level, num_remaining_human_units):
+        """Belirli bir seviye için oyuncunun skorunu hesaplar."""
+        logger.debug("_calculate_score - Turns for level: %s, Remaining human units: %s", turns_for_level,
+                     num_remaining_human_units)
+
+        base_score = 5000  # Seviyeyi bitirme bazı
+        score = base_score
+        logger.debug("_calculate_score - Base score: %s", score)
+
+        unit_bonus = num_remaining_human_units * 100
+        score += unit_bonus
+        logger.debug("_calculate_score - Unit bonus: %s, Score after unit bonus: %s", unit_bonus, score)
+
+        turn_penalty = turns_for_level * 20
+        score -= turn_penalty
+        logger.debug("_calculate_score - Turn penalty: %s, Score after penalty: %s", turn_penalty, score)
+
+        final_score = max(0, score)  # Minimum skor 0
+        logger.debug("_calculate_score - Final calculated score: %s", final_score)
+        return final_score
+
+    # --- Yapay Zeka Eylemleri ---
+    def units_to_act(self, player_id):
+        return [u for u in self.living_units(player_id) if not u.has_acted_this_turn]
+
+    def close(self):
+        """Stratejilerin açık kaynaklarını (MCTS süreç havuzları) kapatır; oyun/simülasyon bitince çağrılır."""
+        for strategy in self.ai_strategies.values(): strategy.close()
+
+    def strategy_for(self, unit):
+        return unit.ai_strategy_instance if unit.ai_strategy_instance else self.default_ai_strategy
+
+    def assign_strategies(self, unit_strategy_ids):
+        """Birimlere {birim id: strategy_id} ile strateji atar ve atamayı günlüğe yazar: seviye dosyasından
+        farklı atamalar (Simulator, turnuva) olmadan tekrar oynatma AI kararlarını yeniden üretemez."""
+        for unit_id, strategy_id in unit_strategy_ids.items():
+            unit = self.game_map.unit_by_id.get(unit_id)
+            strategy = self.ai_strategies.get(strategy_id)
+            if unit is None or strategy is None:
+                logger.warning("Cannot assign strategy '%s' to unit %s.", strategy_id, unit_id)
+                continue
+            unit.ai_strategy_instance = strategy
+        if self.journal: self.journal.record_strategies(unit_strategy_ids)
+
+    def choose_ai_action(self, unit):
+        if self.decision_times is None and not profiler.enabled: return self._choose_ai_action(unit)
+        started = time.perf_counter_ns()
+        command = self._choose_ai_action(unit)
+        elapsed = time.perf_counter_ns() - started
+        if self.decision_times is not None: self.decision_times.append(elapsed / 1e9)
+        if profiler.enabled: profiler.record(f"ai.{self.strategy_for(unit).__class__.__name__}", started, elapsed)
+        return command
+
+    def _choose_ai_action(self, unit):
+        strategy_to_use = self.strategy_for(unit)
+        strategy_name = strategy_to_use.__class__.__name__
+        logger.debug("AI Unit ID %s using strategy: %s", unit.id, strategy_name)
+        position_hash = self.game_map.position_hash
+        # RNG her karar için (tohum, konum, birim) ile yeniden tohumlanır: karar konumun saf fonksiyonu olur,
+        # böylece önbellekten dönen karar ile yeniden hesaplanan aynıdır ve tekrar oynatma önbellek içeriğinden bağımsızdır
+        self.rng.seed((self.seed or 0) ^ position_hash ^ (unit.id * 0x9E3779B1))
+        if not strategy_to_use.cache_decisions: return strategy_to_use.choose_action(unit, self)
+        cache_key = (position_hash, unit.id, unit.grid_x, unit.grid_y, strategy_name)
+        decision = self.decision_cache.get(cache_key)
+        if decision is not None:
+            valid, command = decode_decision(decision, unit, self.game_map)
+            if valid: return command
+        command = strategy_to_use.choose_action(unit, self)
+        decision = encode_decision(command)
+        if decision is not None: self.decision_cache.put(cache_key, decision)
+        return command
+
+    def apply_ai_action(self, unit, action_command):
+        """Seçilen komutu uygular. Komut olsun olmasın birimin bu turdaki eylem hakkı biter."""
+        executed = bool(action_command) and self.execute_command(action_command)
+        unit.has_acted_this_turn = True
+        if not action_command:
+            logger.info("AI Unit %s (Player %s) using %s could not find/execute a valid action.", unit.id,
+                        unit.player_id, self.strategy_for(unit).__class__.__name__)
+        return executed
+
+    def play_ai_turn(self, player_id=PLAYER_AI_ID):
+        """Bir oyuncunun tüm birimlerini bekleme yapmadan oynatır. Uygulanan eylem sayısını döndürür."""
+        actions_taken = 0
+        for unit in self.units_to_act(player_id):
+            if self.game_over_flag: break
+            if not unit.is_alive() or unit.has_acted_this_turn: continue
+            if self.apply_ai_action(unit, self.choose_ai_action(unit)):
+                actions_taken += 1
+        if player_id == PLAYER_AI_ID: self.ai_turn_processed_this_round = True
+        return actions_taken
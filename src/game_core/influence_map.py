@@ -0,0 +1,128 @@
+# src/game_core/influence_map.py
+# Etki haritaları: her oyuncu için harita boyunda iki katman (indeks = y * cols + x)
+#   - influence: birimin gücünün (saldırı * kalan can oranı) uzaklıkla doğrusal azalarak yayılması
+#     (yarıçap = hareket + saldırı menzili); dost ve düşman etkisinin farkı karenin "kimin bölgesi" olduğunu söyler
+#   - reach_damage: oyuncunun birimlerinin bir sonraki turda (hareket + saldırı) vurabileceği kareler ve
+#     o kareye gelebilecek toplam hasar; hareket gerçek yol aramasıyla (engeller, rakip birimler) bulunur
+# Katmanlar birim başına ayak izleriyle tutulur: konum değişince (Map.position_hash) sadece değişen birimlerin
+# izi çıkarılıp yeniden eklenir, arazi değişince (Map.terrain_version) baştan kurulur.
+# DefensiveStrategy geri çekilme/bekleme kararlarını tarama yapmadan bu tablolardan okur.
+from array import array
+
+from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+from .threat_map import ring_kernel
+
+
+def _opponent(player_id):
+    return PLAYER_HUMAN_ID if player_id == PLAYER_AI_ID else PLAYER_AI_ID
+
+
+class InfluenceMaps:
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.cols, self.rows = game_map.cols, game_map.rows
+        self.terrain_version = game_map.terrain_version
+        size = self.cols * self.rows
+        self.influence = {player_id: array('d', [0.0]) * size for player_id in (PLAYER_HUMAN_ID, PLAYER_AI_ID)}
+        self.reach_damage = {player_id: array('I', [0]) * size for player_id in (PLAYER_HUMAN_ID, PLAYER_AI_ID)}
+        # unit.id -> (durum anahtarı, player_id, etki ayak izi [(idx, ağırlık)], hasar ayak izi [idx], saldırı gücü)
+        self._footprints = {}
+        self.refresh()
+
+    def refresh(self):
+        """Sadece değişen birimlerin ayak izlerini günceller: konumu/canı değişen, eklenen, kaldırılan birimler ve
+        eski/yeni karesi başka bir birimin hareket menzili içinde kalanlar (yolunu açıp kapatmış olabilir).
+        Sonuç baştan kurulan katmanlarla birebir aynıdır."""
+        spatial_index = self.game_map.spatial_index
+        changed_cells, stale, seen = [], {}, set()
+        for player_id in (PLAYER_HUMAN_ID, PLAYER_AI_ID):
+            for unit in spatial_index.units_of(player_id):
+                seen.add(unit.id)
+                state_key = (unit.grid_x, unit.grid_y, unit.health, unit.attack_power, unit.player_id)
+                footprint = self._footprints.get(unit.id)
+                if footprint and footprint[0] == state_key: continue
+                if footprint and footprint[0][:2] != state_key[:2]: changed_cells.append(footprint[0][:2])
+                if not footprint or footprint[0][:2] != state_key[:2]: changed_cells.append(state_key[:2])
+                stale[unit.id] = unit
+        for unit_id in [unit_id for unit_id in self._footprints if unit_id not in seen]:
+            footprint = self._footprints.pop(unit_id)
+            changed_cells.append(footprint[0][:2])
+            self._remove_footprint(footprint)
+        if changed_cells:
+            reach = max((u.movement_range for u in spatial_index.units_of(PLAYER_HUMAN_ID) +
+                         spatial_index.units_of(PLAYER_AI_ID)), default=0)
+            for grid_x, grid_y in changed_cells:
+                for unit in spatial_index.within(grid_x, grid_y, reach):
+                    if abs(unit.grid_x - grid_x) + abs(unit.grid_y - grid_y) <= unit.movement_range:
+                        stale[unit.id] = unit
+        for unit in stale.values():
+            footprint = self._footprints.get(unit.id)
+            if footprint: self._remove_footprint(footprint)
+            self._add_unit(unit, (unit.grid_x, unit.grid_y, unit.health, unit.attack_power, unit.player_id))
+
+    def _add_unit(self, unit, state_key):
+        influence_entries = self._influence_footprint(unit)
+        reach_indices = self._reach_footprint(unit)
+        influence, damage, power = self.influence[unit.player_id], self.reach_damage[unit.player_id], unit.attack_power
+        for idx, weight in influence_entries: influence[idx] += weight
+        for idx in reach_indices: damage[idx] += power  # Birim başına kare başına bir kez
+        self._footprints[unit.id] = (state_key, unit.player_id, influence_entries, reach_indices, power)
+
+    def _remove_footprint(self, footprint):
+        _, player_id, influence_entries, reach_indices, power = footprint
+        influence, damage = self.influence[player_id], self.reach_damage[player_id]
+        for idx, weight in influence_entries: influence[idx] -= weight
+        for idx in reach_indices: damage[idx] -= power
+
+    def _influence_footprint(self, unit):
+        cols, rows = self.cols, self.rows
+        radius = unit.movement_range + unit.attack_range
+        strength = unit.attack_power * unit.health / unit.max_health if unit.max_health > 0 else 0
+        entries = [(unit.grid_y * cols + unit.grid_x, strength)]
+        for dx, dy in ring_kernel(1, radius):
+            x, y = unit.grid_x + dx, unit.grid_y + dy
+            if 0 <= x < cols and 0 <= y < rows:
+                entries.append((y * cols + x, strength * (radius + 1 - abs(dx) - abs(dy)) / (radius + 1)))
+        return entries
+
+    def _reach_footprint(self, unit):
+        game_map, cols, rows = self.game_map, self.cols, self.rows
+        reachable, _ = game_map.find_reachable(unit.grid_x, unit.grid_y, unit.movement_range, unit.player_id)
+        kernel = ring_kernel(unit.min_attack_range, unit.attack_range)
+        hit = set()
+        for (from_x, from_y) in reachable:
+            if (from_x, from_y) != (unit.grid_x, unit.grid_y) and game_map.unit_at(from_x, from_y): continue  # Dolu kare
+            for dx, dy in kernel:
+                x, y = from_x + dx, from_y + dy
+                if 0 <= x < cols and 0 <= y < rows: hit.add(y * cols + x)
+        return tuple(hit)
+
+    # --- Sorgular (player_id açısından) ---
+    def incoming_damage(self, player_id, grid_x, grid_y):
+        """Rakibin bir sonraki turda bu kareye verebileceği toplam hasar."""
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return 0
+        return self.reach_damage[_opponent(player_id)][grid_y * self.cols + grid_x]
+
+    def balance(self, player_id, grid_x, grid_y):
+        """Dost etkisi - düşman etkisi; pozitifse kare dost bölgesinde."""
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return 0.0
+        idx = grid_y * self.cols + grid_x
+        return self.influence[player_id][idx] - self.influence[_opponent(player_id)][idx]
+
+
+class InfluenceMapCache:
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self._position_hash = None
+        self._maps = None
+        self.builds = 0
+
+    def current(self):
+        game_map = self.game_map
+        if self._maps is None or self._maps.terrain_version != game_map.terrain_version:
+            self._maps = InfluenceMaps(game_map)  # Arazi değişti: erişimler baştan hesaplanır
+            self.builds += 1
+        elif game_map.position_hash != self._position_hash:
+            self._maps.refresh()
+        self._position_hash = game_map.position_hash
+        return self._maps
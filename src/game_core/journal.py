@@ -0,0 +1,78 @@
+# src/game_core/journal.py
+# Oyunun sadece sona eklenen (append-only) komut günlüğü. JSON-lines biçiminde, satır başına bir kayıt:
+#   {"type": "level", ...}       seviye başlangıcı: seviye no, RNG tohumu, ilk birim id'si, seviye verisi
+#   {"type": "strategies", ...} seviye dosyasından farklı strateji atamaları: {birim id: strategy_id}
+#   {"type": "command", ...}     başarıyla uygulanan komut (ICommand.to_dict) ve o anki oyuncu
+#   {"type": "undo"}             son komut geri alındı
+#   {"type": "end_turn", ...}    tur bitti; ardından durum özeti (hash) ile bir kontrol noktası yazılır
+#   {"type": "checkpoint", ...}  tekrar oynatmada karşılaştırılacak GameState.state_hash() değeri
+# Tekrar oynatma motoru: replay.py
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FORMAT_VERSION = 1
+
+
+class CommandJournal:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._write({"type": "journal", "version": JOURNAL_FORMAT_VERSION})
+
+    def _write(self, record):
+        if self._file is None: return
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self._file.flush()  # Oyun çökse bile o ana kadarki kayıtlar dosyada kalsın
+
+    def begin_level(self, level_number, seed, first_unit_id, level_data):
+        self._write({"type": "level", "level_number": level_number, "seed": seed,
+                     "first_unit_id": first_unit_id, "level_data": level_data})
+
+    def record_strategies(self, unit_strategy_ids):
+        self._write({"type": "strategies", "units": {str(unit_id): strategy_id
+                                                     for unit_id, strategy_id in unit_strategy_ids.items()}})
+
+    def record_command(self, command, player_id):
+        data = command.to_dict()
+        if data is None:
+            logger.warning("Command '%s' is not serializable, journal will not replay it.", command.description)
+            return
+        data["type"] = "command"
+        data["player_id"] = player_id
+        self._write(data)
+
+    def record_undo(self):
+        self._write({"type": "undo"})
+
+    def record_end_turn(self, next_player_id, turns_taken, state_hash):
+        self._write({"type": "end_turn", "next_player_id": next_player_id})
+        self._write({"type": "checkpoint", "turns": turns_taken, "hash": state_hash})
+
+    def record_result(self, result, state_hash):
+        self._write({"type": "result", "result": result, "hash": state_hash})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def read_journal(path):
+    """Günlüğü seviye bölümlerine ayırır: [(level_kaydı, [sonraki kayıtlar...]), ...].
+    Yarım yazılmış son satır (çökme) sessizce atlanır."""
+    segments = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record["type"] == "level":
+                segments.append((record, []))
+            elif record["type"] != "journal" and segments:
+                segments[-1][1].append(record)
+    return segments
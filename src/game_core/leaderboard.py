@@ -0,0 +1,97 @@
+# src/game_core/leaderboard.py
+# Seviye başına skor tablosu dizini. Her seviye için en iyi top_k skoru bir min-heap'te tutar;
+# yeni skor kaydı O(log k) ile işlenir, skor tablosu ekranı sadece istediği sayfayı okur.
+# Kalıcı veri UserStore'dadır (SQLite'ta (seviye, skor) indeksi); heap'ler açılışta oradan doldurulur,
+# top_k'nın ötesindeki sayfalar doğrudan depodan istenir.
+import heapq
+
+DEFAULT_TOP_K = 50
+
+
+class _LevelBoard:
+    def __init__(self, rows):
+        self.heap = []  # (skor, ters_sıralı_ad, ad) min-heap; kökte tablodaki en zayıf kayıt
+        self.members = {}  # kullanıcı -> heap'teki geçerli skoru (eski kayıtlar tembel olarak atlanır)
+        self.sorted_rows = None
+        for score, username in rows: self.push(score, username)
+
+    def push(self, score, username):
+        # Eşit skorda alfabetik olarak önce gelen kullanıcı üstte olmalı; min-heap için adı ters sırala
+        # (sondaki 1, "ab"nin "a"dan zayıf sayılması için: önek olan ad daha güçlüdür)
+        heapq.heappush(self.heap, (score, tuple(-ord(c) for c in username) + (1,), username))
+        self.members[username] = score
+        self.sorted_rows = None
+
+    def pop_weakest(self):
+        while self.heap:
+            score, _, username = heapq.heappop(self.heap)
+            if self.members.get(username) == score:
+                del self.members[username]
+                self.sorted_rows = None
+                return score, username
+        return None
+
+    def weakest_score(self):
+        while self.heap and self.members.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)  # Kullanıcının skoru güncellenmiş, eski kayıt
+        return self.heap[0][0] if self.heap else None
+
+    def compact(self):
+        if len(self.heap) > 2 * max(1, len(self.members)):
+            self.heap = [entry for entry in self.heap if self.members.get(entry[2]) == entry[0]]
+            heapq.heapify(self.heap)
+
+    def rows(self):
+        if self.sorted_rows is None:
+            self.sorted_rows = sorted(((score, username) for username, score in self.members.items()),
+                                      key=lambda row: (-row[0], row[1]))
+        return self.sorted_rows
+
+
+class Leaderboard:
+    def __init__(self, store, top_k=DEFAULT_TOP_K):
+        self.store = store
+        self.top_k = top_k
+        self._boards = {}  # seviye_no -> _LevelBoard (ilk istendiğinde depodan yüklenir)
+        self._levels = None
+        self.version = 0  # Tablo değiştikçe artar
+
+    def _board(self, level_number):
+        board = self._boards.get(level_number)
+        if board is None:
+            board = self._boards[level_number] = _LevelBoard(self.store.top_scores(level_number, self.top_k))
+        return board
+
+    def levels(self):
+        if self._levels is None: self._levels = list(self.store.level_numbers())
+        return self._levels
+
+    def best_score(self, username, level_number):
+        return self.store.get_best_score(username, level_number)
+
+    def record(self, username, level_number, score):
+        """Kullanıcının seviye rekorunu günceller. (güncellendi_mi, önceki_en_iyi) döndürür.
+        Depo yazılamazsa tablo da değiştirilmez."""
+        previous_best = self.best_score(username, level_number)
+        if score <= previous_best or score <= 0: return False, previous_best
+        if not self.store.set_best_score(username, level_number, score): return False, previous_best
+
+        board = self._board(level_number)
+        if username in board.members or len(board.members) < self.top_k:
+            board.push(score, username)
+        elif score > board.weakest_score():
+            board.push(score, username)
+            board.pop_weakest()
+        board.compact()
+        if level_number not in self.levels(): self._levels = sorted(self._levels + [level_number])
+        self.version += 1
+        return True, previous_best
+
+    def page(self, level_number, page_index, page_size):
+        """Seviyenin page_index'inci sayfası: [(sıra, skor, kullanıcı), ...] (sıra 1'den başlar)."""
+        start = page_index * page_size
+        if start + page_size <= self.top_k:
+            rows = self._board(level_number).rows()[start:start + page_size]
+        else:  # Heap'te tutulmayan derin sayfalar
+            rows = self.store.top_scores(level_number, page_size, start)
+        return [(start + i + 1, score, username) for i, (score, username) in enumerate(rows)]
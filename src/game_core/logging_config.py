@@ -0,0 +1,96 @@
+# src/game_core/logging_config.py
+# Günlük (logging) ayarları. Her modül kendi logger'ını kullanır:  logger = logging.getLogger(__name__)
+# ("game_core.unit", "game_core.ai_strategy", ...). Mesajlar %-biçimli argümanlarla yazılır
+# (logger.debug("... %s", x)); seviye kapalıysa biçimlendirme hiç yapılmaz, maliyet tek bir seviye kontrolüdür.
+# Hiç yapılandırılmazsa sadece WARNING ve üstü stderr'e düşer: simülasyon/turnuva/benchmark koşuları sessizdir.
+#   configure_logging("INFO")                          konsola düz metin (oyun penceresi böyle açılır)
+#   configure_logging("DEBUG", json_path="x.jsonl")    ayrıca JSON satırları; dosyaya yazma kuyruk üzerinden
+#                                                      ayrı bir iş parçacığında yapılır, çağıran beklemez
+# Ortam değişkenleri: GAME_LOG_LEVEL (seviye), GAME_LOG_JSON (JSON satırları dosyası).
+import atexit
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+ROOT_LOGGER_NAME = "game_core"
+LOG_LEVEL_ENV = "GAME_LOG_LEVEL"
+LOG_JSON_ENV = "GAME_LOG_JSON"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Kayıt başına tek satır JSON: zaman, seviye, logger, iş parçacığı, mesaj (+ varsa hata izi)."""
+
+    def format(self, record):
+        entry = {"ts": round(record.created, 6), "level": record.levelname, "logger": record.name,
+                 "thread": record.threadName, "msg": record.getMessage()}
+        if record.exc_info: entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+_handlers = []  # configure_logging'in eklediği handler'lar (yeniden yapılandırmada kaldırılır)
+_listener = None  # Kuyruklu JSON handler'ının yazıcı iş parçacığı
+
+
+def configure_logging(level=None, json_path=None, console=True, queued=True, default_level="WARNING"):
+    """game_core logger'larını yapılandırır; tekrar çağrılırsa önceki ayarların yerine geçer.
+    level verilmezse GAME_LOG_LEVEL, o da yoksa default_level kullanılır."""
+    global _listener
+    level = level or os.environ.get(LOG_LEVEL_ENV) or default_level
+    json_path = json_path or os.environ.get(LOG_JSON_ENV)
+    shutdown_logging()
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.propagate = False
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))  # Eski print çıktısıyla aynı görünüm
+        _handlers.append(console_handler)
+    if json_path:
+        directory = os.path.dirname(json_path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(json_path, encoding='utf-8')
+        file_handler.setFormatter(JsonLinesFormatter())
+        if queued:
+            log_queue = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(log_queue, file_handler)
+            _listener.start()
+            _handlers.append(logging.handlers.QueueHandler(log_queue))
+        else:
+            _handlers.append(file_handler)
+    for handler in _handlers: root.addHandler(handler)
+    return root
+
+
+def shutdown_logging():
+    """Kuyruktaki kayıtları boşaltır, handler'ları kapatır ve game_core'u varsayılan (sessiz) hale döndürür."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # Kuyrukta kalanlar yazılana kadar bekler
+        for handler in _listener.handlers: handler.close()
+        _listener = None
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in _handlers:
+        root.removeHandler(handler)
+        handler.close()  # StreamHandler stdout'u kapatmaz
+    _handlers.clear()
+    root.setLevel(logging.NOTSET)
+    root.propagate = True
+
+
+@contextlib.contextmanager
+def quiet_logging(level=logging.WARNING):
+    """Blok boyunca game_core'un level altındaki kayıtlarını bastırır (tekrar oynatma, benchmark)."""
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    previous = root.level
+    root.setLevel(max(level, root.getEffectiveLevel()))
+    try:
+        yield
+    finally:
+        root.setLevel(previous)
+
+
+atexit.register(shutdown_logging)
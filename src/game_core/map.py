@@ -1,5 +1,24 @@
 # src/game_core/map.py
+import heapq
+import logging
+from array import array
+
 from .tile import Tile
+from .constants import NO_OWNER
+from .zobrist import unit_key
+from .spatial_index import SpatialIndex
+from .profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+EMPTY_OCCUPANT_ID = -1  # occupant katmanında boş kare
+# Tile görünümleri CHUNK_SIZE x CHUNK_SIZE'lık parçalar halinde, parçadaki bir kareye ilk erişildiğinde kurulur
+CHUNK_SHIFT = 5
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# 4 yönlü komşuluk (Manhattan hareketi)
+NEIGHBOR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
 
 
 class Map:
@@ -7,69 +26,255 @@ class Map:
         self.rows = rows
         self.cols = cols
         self.tile_size = tile_size
-        self.grid = []
+        # Arazi ve doluluk sıkıştırılmış katmanlarda (walkable/cost/occupant/owner) tutulur; Tile nesneleri
+        # bu katmanların görünümüdür ve parça parça, erişildikçe kurulur (parça indeksi -> Tile listesi)
+        self._tile_chunks = {}
+        self._chunk_cols = (cols + CHUNK_MASK) >> CHUNK_SHIFT
+        self._terrain_shared = False  # walkable/cost bir TerrainTemplate ile paylaşılıyorsa ilk yazmada kopyalanır
         self.units = []
+        self.unit_by_id = {}
+        # Birim eklenince/hareket edince/kaldırılınca haber verilecek nesneler (ör. ThreatMap).
+        # on_unit_added(unit), on_unit_moved(unit), on_unit_removed(unit) metodlarını sağlamalılar.
+        self.observers = []
+        # Oyuncuya/konuma göre birim indeksi (en yakın düşman, menzildeki düşmanlar, oyuncunun birim sayısı)
+        self.spatial_index = SpatialIndex(rows, cols)
+        self.observers.append(self.spatial_index)
+        self.terrain_version = 0  # Engel/maliyet değiştikçe artar (çizim önbelleği bunu takip eder)
+        # Birimlerin (tür, sahip, can dilimi, konum) Zobrist hash'i; hareket/hasar/kaldırmada O(1) güncellenir.
+        # AI karar önbelleği (decision_cache.py) bunu anahtar olarak kullanır.
+        self.position_hash = 0
+        self._unit_hash_keys = {}  # birim id -> hash'e şu an katılmış anahtar
+        self._allocate_layers()
         # self.create_grid() # Artık _initialize_game_for_level veya load_game içinde çağrılıyor
 
     def create_grid(self):
-        self.grid = []
+        """Her karesi yürünebilir, maliyeti 1 ve boş bir ızgara kurar (Tile'lar erişildikçe kurulur)."""
+        self._allocate_layers()
+        self.walkable[:] = b'\x01' * len(self.walkable)
+        self._reset_grid()
+
+    def create_grid_from_layers(self, walkable, cost, shared=False):
+        """create_grid gibi, ama engel/maliyet bilgisini hazır katmanlardan alır (kayıt yükleme, seviye şablonu).
+        shared ise katmanlar kopyalanmadan kullanılır ve ilk arazi değişikliğinde kopyalanır."""
+        if len(walkable) != self.rows * self.cols or len(cost) != self.rows * self.cols:
+            raise ValueError("Terrain layers do not match the map size")
+        self._allocate_layers()
+        self.walkable, self.cost = walkable, cost
+        self._reset_grid(terrain_shared=shared)
+
+    def create_grid_from_template(self, template):
+        """Seviye arazisini (terrain.TerrainTemplate) kopyalamadan paylaşarak ızgarayı kurar."""
+        self.create_grid_from_layers(template.walkable, template.cost, shared=True)
+
+    def _reset_grid(self, terrain_shared=False):
+        self._terrain_shared = terrain_shared
+        self._tile_chunks = {}
+        self.terrain_version += 1
+        for unit in self.unit_by_id.values(): self._occupy(unit, unit.grid_x, unit.grid_y)
+        self.rebuild_position_hash()
+
+    def _own_terrain(self):
+        # Copy-on-write: paylaşılan şablon katmanları ilk yazmadan önce kopyalanır
+        if self._terrain_shared:
+            self.walkable = bytearray(self.walkable)
+            self.cost = array('B', self.cost)
+            self._terrain_shared = False
+
+    def add_observer(self, observer):
+        if observer not in self.observers: self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers: self.observers.remove(observer)
+
+    def index(self, grid_x, grid_y):
+        return grid_y * self.cols + grid_x
+
+    def _allocate_layers(self):
+        # Tile nesnelerinin yanında tutulan sıkıştırılmış katmanlar (satır-öncelikli, indeks = y * cols + x).
+        # Menzil/tehdit hesapları nesne dolaşmak yerine doğrudan bu dizileri okur.
+        size = self.rows * self.cols
+        self.walkable = bytearray(size)  # 1: yürünebilir, 0: engel
+        self.occupant = array('i', [EMPTY_OCCUPANT_ID]) * size  # Karedeki birimin id'si
+        self.owner = array('b', [NO_OWNER]) * size  # Karedeki birimin oyuncusu
+        self.cost = array('B', [1]) * size  # Kareye girme maliyeti
+
+    def set_tile_walkable(self, grid_x, grid_y, is_walkable):
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return
+        self._own_terrain()
+        self.walkable[self.index(grid_x, grid_y)] = 1 if is_walkable else 0
+        self.terrain_version += 1
+
+    def set_tile_movement_cost(self, grid_x, grid_y, movement_cost):
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return
+        self._own_terrain()
+        self.cost[self.index(grid_x, grid_y)] = max(1, min(255, int(movement_cost)))
+        self.terrain_version += 1
+
+    def _occupy(self, unit, grid_x, grid_y):
+        idx = self.index(grid_x, grid_y)
+        self.occupant[idx] = unit.id
+        self.owner[idx] = unit.player_id
+
+    def _vacate(self, grid_x, grid_y):
+        idx = self.index(grid_x, grid_y)
+        self.occupant[idx] = EMPTY_OCCUPANT_ID
+        self.owner[idx] = NO_OWNER
+
+    def _rehash_unit(self, unit):
+        old_key = self._unit_hash_keys.pop(unit.id, 0)
+        new_key = 0
+        if unit.is_alive() and self.unit_by_id.get(unit.id) is unit:
+            new_key = self._unit_hash_keys[unit.id] = unit_key(unit, self.index(unit.grid_x, unit.grid_y))
+        self.position_hash ^= old_key ^ new_key
+
+    def rebuild_position_hash(self):
+        """position_hash'i birimlerden baştan hesaplar (birim nitelikleri toplu değiştiğinde, ör. snapshot geri yükleme)."""
+        self.position_hash = 0
+        self._unit_hash_keys = {}
+        for unit in self.unit_by_id.values(): self._rehash_unit(unit)
+
+    def on_unit_health_changed(self, unit):  # Unit.health_listener
+        if self.unit_by_id.get(unit.id) is unit: self._rehash_unit(unit)
+
+    def is_walkable_at(self, grid_x, grid_y):
+        return 0 <= grid_x < self.cols and 0 <= grid_y < self.rows and self.walkable[grid_y * self.cols + grid_x] == 1
+
+    def owner_at(self, grid_x, grid_y):
+        if 0 <= grid_x < self.cols and 0 <= grid_y < self.rows: return self.owner[grid_y * self.cols + grid_x]
+        return NO_OWNER
+
+    def unit_at(self, grid_x, grid_y):
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return None
+        unit_id = self.occupant[grid_y * self.cols + grid_x]
+        return self.unit_by_id.get(unit_id) if unit_id != EMPTY_OCCUPANT_ID else None
+
+    def get_tile_at_grid_coords(self, grid_x, grid_y):
+        if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows): return None
+        chunk_key = (grid_y >> CHUNK_SHIFT) * self._chunk_cols + (grid_x >> CHUNK_SHIFT)
+        chunk = self._tile_chunks.get(chunk_key)
+        if chunk is None: chunk = self._materialize_chunk(chunk_key)
+        return chunk[((grid_y & CHUNK_MASK) << CHUNK_SHIFT) + (grid_x & CHUNK_MASK)]
+
+    def _materialize_chunk(self, chunk_key):
+        # Parçanın harita dışına taşan kareleri None kalır
+        base_x = (chunk_key % self._chunk_cols) << CHUNK_SHIFT
+        base_y = (chunk_key // self._chunk_cols) << CHUNK_SHIFT
+        cols, rows = self.cols, self.rows
+        chunk = [Tile(self, base_x + dx, base_y + dy) if base_x + dx < cols and base_y + dy < rows else None
+                 for dy in range(CHUNK_SIZE) for dx in range(CHUNK_SIZE)]
+        self._tile_chunks[chunk_key] = chunk
+        return chunk
+
+    @property
+    def materialized_chunk_count(self):
+        return len(self._tile_chunks)
+
+    def iter_tiles(self):
+        """Bütün kareler satır satır (hepsini kurar; sadece tam harita çizimi/dışa aktarma için)."""
         for row_idx in range(self.rows):
-            self.grid.append([])
             for col_idx in range(self.cols):
-                # Tile'lar _initialize_game_for_level veya load_game'de temaya göre renk alacak
-                tile = Tile(col_idx, row_idx, self.tile_size)
-                self.grid[row_idx].append(tile)
-
-    def get_tile_at_grid_coords(self, grid_x, grid_y):  # (Bir öncekiyle aynı)
-        if 0 <= grid_x < self.cols and 0 <= grid_y < self.rows: return self.grid[grid_y][grid_x]
-        return None
+                yield self.get_tile_at_grid_coords(col_idx, row_idx)
 
     def get_tile_from_pixel_coords(self, pixel_x, pixel_y):  # (Bir öncekiyle aynı)
         if not (0 <= pixel_x < self.cols * self.tile_size and 0 <= pixel_y < self.rows * self.tile_size): return None
         return self.get_tile_at_grid_coords(pixel_x // self.tile_size, pixel_y // self.tile_size)
 
-    def add_unit(self, unit, grid_x, grid_y):  # (Bir öncekiyle aynı)
-        tile = self.get_tile_at_grid_coords(grid_x, grid_y)
-        if tile and tile.is_walkable and not tile.unit_on_tile:
-            tile.set_unit(unit);
+    def apply_terrain(self, level_data):
+        """Seviye dosyasındaki isteğe bağlı arazi bilgisini uygular:
+        "obstacles": [[x, y], ...] ve "terrain_costs": [[x, y, cost], ...]"""
+        for grid_x, grid_y in level_data.get("obstacles", []):
+            self.set_tile_walkable(grid_x, grid_y, False)
+        for grid_x, grid_y, cost in level_data.get("terrain_costs", []):
+            self.set_tile_movement_cost(grid_x, grid_y, cost)
+
+    def find_reachable(self, start_x, start_y, max_cost, player_id=None):
+        """(start_x, start_y)'den en fazla max_cost harcayarak ulaşılabilen kareleri bulur (Dijkstra).
+        Engeller ve düşman birimleri geçilemez; player_id'ye ait birimlerin üzerinden geçilebilir.
+        (cost_so_far, came_from) döndürür: {(x, y): maliyet} ve {(x, y): önceki (x, y)}."""
+        start = (start_x, start_y)
+        cost_so_far = {start: 0}
+        came_from = {start: None}
+        frontier = [(0, start_x, start_y)]
+        cols, rows = self.cols, self.rows
+        walkable, owner, tile_cost = self.walkable, self.owner, self.cost
+        while frontier:
+            cost, x, y = heapq.heappop(frontier)
+            if cost > cost_so_far[(x, y)]: continue  # Daha ucuz yoldan zaten işlendi
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < cols and 0 <= ny < rows): continue
+                idx = ny * cols + nx
+                if not walkable[idx]: continue
+                occupant_owner = owner[idx]
+                if occupant_owner != NO_OWNER and occupant_owner != player_id: continue  # Düşmanın içinden geçilmez
+                new_cost = cost + tile_cost[idx]
+                if new_cost > max_cost: continue  # Menzil dışı, daha ileri gitmeye gerek yok
+                if new_cost < cost_so_far.get((nx, ny), max_cost + 1):
+                    cost_so_far[(nx, ny)] = new_cost
+                    came_from[(nx, ny)] = (x, y)
+                    heapq.heappush(frontier, (new_cost, nx, ny))
+        return cost_so_far, came_from
+
+    @staticmethod
+    def get_path(came_from, target):
+        """find_reachable'ın döndürdüğü came_from ile başlangıç hariç hedefe kadar olan yolu döndürür."""
+        if target not in came_from: return []
+        path = []
+        current = target
+        while came_from[current] is not None:
+            path.append(current)
+            current = came_from[current]
+        path.reverse()
+        return path
+
+    def add_unit(self, unit, grid_x, grid_y):
+        if self.is_walkable_at(grid_x, grid_y) and self.occupant[self.index(grid_x, grid_y)] == EMPTY_OCCUPANT_ID:
             unit.grid_x = grid_x;
             unit.grid_y = grid_y
-            unit.set_pixel_pos(tile.pixel_x, tile.pixel_y, self.tile_size)
+            unit.tile_size = self.tile_size
+            self._occupy(unit, grid_x, grid_y)
             if unit not in self.units: self.units.append(unit)
+            self.unit_by_id[unit.id] = unit
+            unit.health_listener = self.on_unit_health_changed
+            self._rehash_unit(unit)
+            for observer in self.observers: observer.on_unit_added(unit)
             return True
-        # print(f"Cannot add unit {unit.id if unit else 'N/A'} to ({grid_x},{grid_y}).")
+        logger.debug("Cannot add unit %s to (%s,%s).", unit.id if unit else 'N/A', grid_x, grid_y)
         return False
 
-    def move_unit(self, unit, new_grid_x, new_grid_y):  # (Bir öncekiyle aynı)
-        if not unit.is_alive(): return False
-        old_tile = self.get_tile_at_grid_coords(unit.grid_x, unit.grid_y)
-        new_tile = self.get_tile_at_grid_coords(new_grid_x, new_grid_y)
-        if new_tile and new_tile.is_walkable and (not new_tile.unit_on_tile or new_tile.unit_on_tile == unit):
-            if old_tile and old_tile.unit_on_tile == unit: old_tile.remove_unit()
-            new_tile.set_unit(unit);
+    def move_unit(self, unit, new_grid_x, new_grid_y):
+        if not unit.is_alive() or not self.is_walkable_at(new_grid_x, new_grid_y): return False
+        if self.occupant[self.index(new_grid_x, new_grid_y)] in (EMPTY_OCCUPANT_ID, unit.id):
+            if self.unit_at(unit.grid_x, unit.grid_y) is unit: self._vacate(unit.grid_x, unit.grid_y)
+            self._occupy(unit, new_grid_x, new_grid_y)
             unit.grid_x = new_grid_x;
             unit.grid_y = new_grid_y
-            unit.set_pixel_pos(new_tile.pixel_x, new_tile.pixel_y, self.tile_size)
+            self._rehash_unit(unit)
+            for observer in self.observers: observer.on_unit_moved(unit)
             return True
         return False
 
     def remove_unit_from_map(self, unit_to_remove):  # (Bir öncekiyle aynı)
         if unit_to_remove in self.units: self.units.remove(unit_to_remove)
-        tile = self.get_tile_at_grid_coords(unit_to_remove.grid_x, unit_to_remove.grid_y)
-        if tile and tile.unit_on_tile == unit_to_remove: tile.remove_unit()
-        print(f"Unit ID {unit_to_remove.id} ({unit_to_remove.unit_type}) removed from map.")
+        if self.unit_at(unit_to_remove.grid_x, unit_to_remove.grid_y) is unit_to_remove:
+            self._vacate(unit_to_remove.grid_x, unit_to_remove.grid_y)
+        if self.unit_by_id.get(unit_to_remove.id) is unit_to_remove: del self.unit_by_id[unit_to_remove.id]
+        self._rehash_unit(unit_to_remove)
+        for observer in self.observers: observer.on_unit_removed(unit_to_remove)
+        logger.debug("Unit ID %s (%s) removed from map.", unit_to_remove.id, unit_to_remove.unit_type)
 
-    def draw(self, surface, active_theme, font_small):  # !!! font_small parametresi eklendi !!!
-        for row_idx in range(self.rows):
-            for col_idx in range(self.cols):
-                tile = self.get_tile_at_grid_coords(col_idx, row_idx)
-                if tile:
-                    tile.draw(surface, active_theme)
+    def draw(self, surface, active_theme, font_small, text_cache=None):  # !!! font_small parametresi eklendi !!!
+        with profiler.span("render.tiles"):
+            for tile in self.iter_tiles():
+                tile.draw(surface, active_theme)
+        self.draw_units(surface, active_theme, font_small, text_cache)
 
+    def draw_units(self, surface, active_theme, font_small, text_cache=None):
         for unit in self.units:
             if unit.is_alive():
-                unit.draw(surface, active_theme, font_small)  # !!! font_small'u unit.draw'a yolla !!!
+                unit.draw(surface, active_theme, font_small, text_cache)  # !!! font_small'u unit.draw'a yolla !!!
 
     def to_dict(self):  # (Bir öncekiyle aynı)
         return {"rows": self.rows, "cols": self.cols, "tile_size": self.tile_size,
-                "grid_tiles": [[tile.to_dict() for tile in row] for row in self.grid]}
\ No newline at end of file
+                "grid_tiles": [[self.get_tile_at_grid_coords(col_idx, row_idx).to_dict()
+                                for col_idx in range(self.cols)] for row_idx in range(self.rows)]}
\ No newline at end of file
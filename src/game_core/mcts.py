@@ -0,0 +1,128 @@
+# src/game_core/mcts.py
+# Monte Carlo ağaç araması (UCT). Arama durumu olarak search.SearchState kullanılır;
+# rollout'lar açgözlü politikayla (SearchState.greedy_action, SimpleAggressiveStrategy kuralları) oynanır.
+# Kök paralelleştirme: her işçi süreç aynı kökten kendi ağacını kurar, kök çocuklarının ziyaret/ödül
+# istatistikleri ana süreçte toplanır. Havuz (ProcessPoolExecutor) ilk kullanımda kurulur ve tekrar kullanılır.
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .search import WIN_SCORE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPLORATION = 1.4
+REWARD_SCALE = 300.0  # Değerlendirme puanını (can + saldırı farkı) [0, 1] ödüle çevirirken kullanılan ölçek
+
+
+class MCTSNode:
+    def __init__(self, parent, action, side, actions):
+        self.parent = parent
+        self.action = action
+        self.side = side  # Bu düğümde hamle sırası kimde
+        self.untried = actions
+        self.children = []
+        self.visits = 0
+        self.reward = 0.0  # Kök oyuncu açısından toplam ödül
+
+
+def _reward(state, root_player):
+    score = state.evaluate(root_player)
+    if score >= WIN_SCORE: return 1.0
+    if score <= -WIN_SCORE: return 0.0
+    return 0.5 + 0.5 * math.tanh(score / REWARD_SCALE)
+
+
+def run_mcts(state, root_player, time_budget=None, iterations=None, seed=None, move_candidates=4,
+             rollout_depth=20, exploration=DEFAULT_EXPLORATION):
+    """Tek süreçte UCT araması. {kök eylemi: (ziyaret, toplam ödül)} döndürür. State sonunda aynen geri bırakılır."""
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    root = MCTSNode(None, None, state.side, state.ordered_actions(move_candidates))
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+        if iterations is None and deadline is None: break
+        node, undos = root, []
+        # Seçim: tamamen açılmış düğümlerde UCB1 (sıradaki taraf kendi açısından en iyisini seçer)
+        while not node.untried and node.children and not state.is_terminal():
+            log_visits = math.log(node.visits)
+            maximizing = node.side == root_player
+            node = max(node.children, key=lambda c: (c.reward / c.visits if maximizing else 1 - c.reward / c.visits)
+                                                    + exploration * math.sqrt(log_visits / c.visits))
+            undos.append(state.apply(node.action))
+        # Genişletme
+        if node.untried and not state.is_terminal():
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            undos.append(state.apply(action))
+            child = MCTSNode(node, action, state.side,
+                             state.ordered_actions(move_candidates) if not state.is_terminal() else [])
+            node.children.append(child)
+            node = child
+        # Rollout
+        rollout_undos = []
+        for _ in range(rollout_depth):
+            if state.is_terminal() or state.current_unit() < 0: break
+            rollout_undos.append(state.apply(state.greedy_action(rng)))
+        reward = _reward(state, root_player)
+        for undo in reversed(rollout_undos): state.revert(undo)
+        for undo in reversed(undos): state.revert(undo)
+        # Geri yayılım
+        while node is not None:
+            node.visits += 1
+            node.reward += reward
+            node = node.parent
+        done += 1
+    return {child.action: (child.visits, child.reward) for child in root.children}
+
+
+def _mcts_worker(state, root_player, time_budget, iterations, seed, move_candidates, rollout_depth):
+    # İşçi süreç giriş noktası; ProcessPoolExecutor'ın gönderebilmesi için modül seviyesinde
+    return run_mcts(state, root_player, time_budget, iterations, seed, move_candidates, rollout_depth)
+
+
+class RootParallelMCTS:
+    def __init__(self, workers=None, move_candidates=4, rollout_depth=20):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.move_candidates = move_candidates
+        self.rollout_depth = rollout_depth
+        self._pool = None
+        self.last_playouts = 0
+
+    def _get_pool(self):
+        if self._pool is None and self.workers > 1:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError) as e:  # Süreç açılamayan ortamlar: tek süreçte devam
+                logger.warning("MCTS process pool unavailable (%s), searching in-process.", e)
+                self.workers = 1
+        return self._pool
+
+    def search(self, state, root_player, time_budget=None, iterations=None, seed=None):
+        """En çok ziyaret edilen kök eylemini döndürür. iterations verilirse işçiler arasında bölünür."""
+        base_seed = seed if seed is not None else random.randrange(2 ** 32)
+        pool = self._get_pool()
+        stats = {}
+        if pool:
+            per_worker = -(-iterations // self.workers) if iterations else None
+            futures = [pool.submit(_mcts_worker, state, root_player, time_budget, per_worker, base_seed + n,
+                                   self.move_candidates, self.rollout_depth) for n in range(self.workers)]
+            results = [future.result() for future in futures]
+        else:
+            results = [run_mcts(state, root_player, time_budget, iterations, base_seed, self.move_candidates,
+                                self.rollout_depth)]
+        for result in results:
+            for action, (visits, reward) in result.items():
+                total_visits, total_reward = stats.get(action, (0, 0.0))
+                stats[action] = (total_visits + visits, total_reward + reward)
+        self.last_playouts = sum(visits for visits, _ in stats.values())
+        if not stats: return None
+        return max(stats, key=lambda action: (stats[action][0], stats[action][1]))
+
+    def shutdown(self):
+        """Süreç havuzunu kapatır ve işçi süreçlerin çıkmasını bekler (bekleyen aramalar iptal edilir)."""
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,107 @@
+# src/game_core/profiler.py
+# Hafif zamanlama ölçümü: adlandırılmış aralıklar (span).
+#   with profiler.span("render.units"): ...
+# Kapalıyken span() her seferinde aynı boş bağlam yöneticisini döndürür (bir bayrak kontrolü kadar maliyet).
+# Açıkken her aralığın süresi ad başına kayan bir pencerede tutulur (p50/p95/p99) ve iz olarak saklanır;
+# iz Chrome trace biçiminde (chrome://tracing, Perfetto, speedscope) dışa aktarılabilir.
+# Oyun, ekran katmanı ve AI tek bir modül seviyesindeki örneği (profiler) paylaşır; AI iş parçacığındaki
+# aralıklar izde ayrı bir satır (tid) olarak görünür.
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_WINDOW = 240  # Ad başına tutulan son ölçüm sayısı (60 FPS'te ~4 saniye)
+DEFAULT_TRACE_CAPACITY = 200000  # İzde tutulan en fazla olay (eskiler düşer)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.started, time.perf_counter_ns() - self.started)
+        return False
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class Profiler:
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW, trace_capacity=DEFAULT_TRACE_CAPACITY):
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}  # ad -> deque(süre_ns)
+        self._trace = deque(maxlen=trace_capacity)  # (ad, başlangıç_ns, süre_ns, tid)
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name):
+        if not self.enabled: return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, started_ns, duration_ns):
+        samples = self._samples.get(name)
+        if samples is None: samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(duration_ns)
+        self._trace.append((name, started_ns, duration_ns, threading.get_ident()))
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def reset(self):
+        self._samples = {}
+        self._trace.clear()
+        self._origin_ns = time.perf_counter_ns()
+
+    def stats(self):
+        """{ad: {"count", "last_ms", "p50_ms", "p95_ms", "p99_ms"}} (kayan pencere üzerinden)."""
+        result = {}
+        for name, samples in list(self._samples.items()):
+            values = sorted(samples)
+            if not values: continue
+            result[name] = {"count": len(values), "last_ms": samples[-1] / 1e6,
+                            "p50_ms": _percentile(values, 0.50) / 1e6, "p95_ms": _percentile(values, 0.95) / 1e6,
+                            "p99_ms": _percentile(values, 0.99) / 1e6}
+        return result
+
+    def export_chrome_trace(self, path):
+        """İzi Chrome trace olay biçiminde (tam olaylar, "ph": "X") yazar; olay sayısını döndürür."""
+        pid = os.getpid()
+        thread_ids = {}
+        events = []
+        for name, started_ns, duration_ns, ident in list(self._trace):
+            tid = thread_ids.setdefault(ident, len(thread_ids))
+            events.append({"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                           "ts": (started_ns - self._origin_ns) / 1000.0, "dur": duration_ns / 1000.0})
+        main_ident = threading.main_thread().ident
+        for ident, tid in thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": "main" if ident == main_ident else f"worker-{tid}"}})
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+profiler = Profiler()  # Paylaşılan örnek
@@ -0,0 +1,138 @@
+# src/game_core/replay.py
+# Komut günlüğünü (journal.py) pencere açmadan, bekleme yapmadan yeniden oynatır ve
+# kontrol noktalarındaki durum özetlerini (GameState.state_hash) karşılaştırır.
+# Oyuncu hata raporlarını yeniden üretmek ve AI değişikliklerini toplu regresyon testinden geçirmek için:
+#   python -m game_core.replay journals/x.jsonl [--recompute-ai]
+# recompute_ai açıksa AI hamleleri günlükten okunmaz, aynı tohumla yeniden hesaplanıp günlükteki hamlelerle
+# karşılaştırılır; böylece strateji kodundaki davranış değişiklikleri ilk ayrıştıkları hamlede yakalanır.
+import argparse
+import contextlib
+import os
+import sys
+
+from .commands import command_from_dict
+from .constants import PLAYER_AI_ID
+from .game_state import GameState
+from .journal import read_journal
+from .logging_config import configure_logging, quiet_logging
+from .unit import Unit
+
+
+class ReplayEngine:
+    def __init__(self, journal_path, recompute_ai=False, ai_player_ids=(PLAYER_AI_ID,), quiet=True):
+        self.journal_path = journal_path
+        self.recompute_ai = recompute_ai
+        self.ai_player_ids = tuple(ai_player_ids)
+        self.quiet = quiet  # Komutların konsol çıktısı bastırılsın mı
+
+    def run(self):
+        """Günlükteki her seviye bölümünü oynatır; bölüm başına bir sonuç sözlüğü listesi döndürür."""
+        results = []
+        with contextlib.ExitStack() as stack:
+            if self.quiet:
+                stack.enter_context(quiet_logging())
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            for header, records in read_journal(self.journal_path):
+                results.append(self.replay_level(header, records))
+        return results
+
+    def replay_level(self, header, records):
+        state = GameState()
+        Unit._id_counter = header["first_unit_id"]
+        state.setup_level(header["level_number"], header["level_data"], is_new_game_session=False,
+                          seed=header["seed"])
+        report = {"level_number": header["level_number"], "seed": header["seed"], "commands": 0,
+                  "checkpoints": 0, "mismatches": [], "result": None}
+        mismatches = report["mismatches"]
+        ai_turn_pending = self.recompute_ai and state.current_player_id in self.ai_player_ids
+
+        idx = 0
+        while idx < len(records):
+            record = records[idx]
+            kind = record["type"]
+            if kind == "strategies":
+                state.assign_strategies({int(unit_id): strategy_id for unit_id, strategy_id in record["units"].items()})
+                idx += 1
+                continue
+            if ai_turn_pending and kind != "checkpoint":
+                ai_turn_pending = False
+                end = idx
+                while end < len(records) and records[end]["type"] == "command": end += 1
+                recorded = [self._command_key(r) for r in records[idx:end]]
+                produced = self._play_ai_turn(state)
+                report["commands"] += len(produced)
+                if produced != recorded:
+                    mismatches.append({"at": idx, "kind": "ai_decisions", "expected": recorded, "actual": produced})
+                idx = end
+                continue
+
+            if kind == "command":
+                command = command_from_dict(record, state.game_map)
+                if command is None or not state.execute_command(command):
+                    mismatches.append({"at": idx, "kind": "command_failed", "record": record})
+                else:
+                    state.game_map.unit_by_id[record["unit_id"]].has_acted_this_turn = True
+                    report["commands"] += 1
+            elif kind == "undo":
+                state.undo_last_command()
+            elif kind == "end_turn":
+                state.end_turn()
+                if state.current_player_id != record["next_player_id"]:
+                    mismatches.append({"at": idx, "kind": "turn_order", "expected": record["next_player_id"],
+                                       "actual": state.current_player_id})
+                ai_turn_pending = self.recompute_ai and state.current_player_id in self.ai_player_ids
+            elif kind == "checkpoint":
+                report["checkpoints"] += 1
+                actual_hash = state.state_hash()
+                if actual_hash != record["hash"]:
+                    mismatches.append({"at": idx, "kind": "checkpoint", "turns": record["turns"],
+                                       "expected": record["hash"], "actual": actual_hash})
+            elif kind == "result":
+                report["result"] = state.evaluate_game_over()
+                if report["result"] != record["result"] or state.state_hash() != record["hash"]:
+                    mismatches.append({"at": idx, "kind": "result", "expected": record["result"],
+                                       "actual": report["result"]})
+            idx += 1
+
+        report["final_hash"] = state.state_hash()
+        report["turns"] = state.turns_taken_this_level
+        return report
+
+    @staticmethod
+    def _command_key(record):
+        return {k: v for k, v in record.items() if k not in ("type", "player_id")}
+
+    def _play_ai_turn(self, state):
+        """GameState.play_ai_turn ile aynı sırayla oynar, uygulanan komutları günlük biçiminde döndürür."""
+        produced = []
+        for unit in state.units_to_act(state.current_player_id):
+            if state.game_over_flag: break
+            if not unit.is_alive() or unit.has_acted_this_turn: continue
+            command = state.choose_ai_action(unit)
+            if state.apply_ai_action(unit, command): produced.append(command.to_dict())
+        return produced
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a command journal headlessly and verify checkpoints.")
+    parser.add_argument("journal")
+    parser.add_argument("--recompute-ai", action="store_true",
+                        help="re-run AI strategies with the recorded seed instead of replaying their commands")
+    parser.add_argument("--verbose", action="store_true", help="show command output while replaying")
+    args = parser.parse_args(argv)
+
+    if args.verbose: configure_logging("DEBUG")
+    reports = ReplayEngine(args.journal, recompute_ai=args.recompute_ai, quiet=not args.verbose).run()
+    failed = False
+    for report in reports:
+        status = "OK" if not report["mismatches"] else f"{len(report['mismatches'])} MISMATCH(ES)"
+        print(f"Level {report['level_number']} seed={report['seed']}: {report['commands']} commands, "
+              f"{report['checkpoints']} checkpoints, result={report['result']} -> {status}")
+        for mismatch in report["mismatches"][:5]:
+            print(f"    {mismatch}")
+        failed = failed or bool(report["mismatches"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
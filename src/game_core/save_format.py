@@ -0,0 +1,136 @@
+# src/game_core/save_format.py
+# Sürümlü, kompakt kayıt dosyası biçimi (format_version 2).
+# Arazi, kare başına bir sözlük yerine satır-öncelikli katmanlar olarak saklanır:
+#   - walkable: koşu uzunluğu (RLE) kodlanmış 1/0 dizisi (ilk koşu her zaman "yürünebilir")
+#   - costs: sadece maliyeti 1'den farklı kareler için [indeks, maliyet] çiftleri
+# Birimler sütun adları + satır listesi olan paketlenmiş bir tablo olarak yazılır.
+# Dosya isteğe bağlı olarak gzip ile sıkıştırılır; okurken gzip başlığından kendiliğinden anlaşılır.
+# Eski (format_version alanı olmayan, "map_data" içeren) JSON kayıtları da okunabilir.
+import gzip
+import json
+import os
+from array import array
+
+SAVE_FORMAT_VERSION = 2
+GZIP_MAGIC = b"\x1f\x8b"
+
+UNIT_COLUMNS = ("id", "unit_type", "player_id", "grid_x", "grid_y", "health", "max_health", "attack_power",
+                "movement_range", "attack_range", "min_attack_range", "current_state_name",
+                "has_acted_this_turn", "strategy_id")
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+# --- Katman kodlama ---
+def rle_encode(values):
+    """0/1 dizisini koşu uzunluklarına çevirir. İlk koşu 1'lerin koşusudur (0 uzunlukta olabilir)."""
+    runs = []
+    current, length = 1, 0
+    for value in values:
+        value = 1 if value else 0
+        if value == current:
+            length += 1
+        else:
+            runs.append(length)
+            current, length = value, 1
+    runs.append(length)
+    return runs
+
+
+def rle_decode(runs, size):
+    layer = bytearray(size)
+    pos, value = 0, 1
+    for length in runs:
+        if value: layer[pos:pos + length] = b"\x01" * length
+        pos += length
+        value ^= 1
+    if pos != size: raise SaveFormatError(f"walkable layer has {pos} cells, expected {size}")
+    return layer
+
+
+def encode_terrain(game_map):
+    return {"rows": game_map.rows, "cols": game_map.cols, "tile_size": game_map.tile_size,
+            "walkable": rle_encode(game_map.walkable),
+            "costs": [[idx, cost] for idx, cost in enumerate(game_map.cost) if cost != 1]}
+
+
+def decode_terrain(terrain):
+    """(rows, cols, walkable bytearray, cost array) döndürür."""
+    rows, cols = terrain["rows"], terrain["cols"]
+    size = rows * cols
+    walkable = rle_decode(terrain.get("walkable", [size]), size)
+    cost = array('B', [1]) * size
+    for idx, value in terrain.get("costs", []):
+        cost[idx] = max(1, min(255, value))
+    return rows, cols, walkable, cost
+
+
+def decode_legacy_grid(map_data):
+    """Eski biçimdeki kare başına sözlük listesini ("grid_tiles") decode_terrain ile aynı katmanlara çevirir."""
+    rows, cols = map_data["rows"], map_data["cols"]
+    walkable = bytearray(rows * cols)
+    cost = array('B', [1]) * (rows * cols)
+    for row_data in map_data["grid_tiles"]:
+        for tile_data in row_data:
+            idx = tile_data["y_grid"] * cols + tile_data["x_grid"]
+            walkable[idx] = 1 if tile_data["is_walkable"] else 0
+            cost[idx] = max(1, min(255, tile_data.get("movement_cost", 1)))
+    return rows, cols, walkable, cost
+
+
+# --- Birim tablosu ---
+def encode_units(units):
+    table = []
+    for unit in units:
+        data = unit.to_dict()
+        strategy = unit.ai_strategy_instance
+        data["strategy_id"] = strategy.__class__.__name__ if strategy else None
+        table.append([data.get(column) for column in UNIT_COLUMNS])
+    return {"columns": list(UNIT_COLUMNS), "rows": table}
+
+
+def iter_unit_records(save_data):
+    """Kayıttaki birimleri sözlük olarak verir (yeni tablo ya da eski units_data listesi)."""
+    if "units" not in save_data:
+        yield from save_data.get("units_data", [])
+        return
+    columns = save_data["units"]["columns"]
+    for row in save_data["units"]["rows"]:
+        yield dict(zip(columns, row))
+
+
+# --- Dosya ---
+def build_save(game_map, units, **fields):
+    save_data = {"format_version": SAVE_FORMAT_VERSION}
+    save_data.update(fields)
+    save_data["terrain"] = encode_terrain(game_map)
+    save_data["units"] = encode_units(units)
+    return save_data
+
+
+def is_legacy_save(save_data):
+    return "format_version" not in save_data
+
+
+def write_save(path, save_data, compress=False):
+    """Kaydı geçici bir dosyaya yazıp yerine taşır; yazma yarıda kalırsa eski kayıt bozulmaz."""
+    payload = json.dumps(save_data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if compress: payload = gzip.compress(payload)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
+
+
+def read_save(path):
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if payload[:2] == GZIP_MAGIC: payload = gzip.decompress(payload)
+    save_data = json.loads(payload.decode("utf-8"))
+    version = save_data.get("format_version")
+    if version is not None and version > SAVE_FORMAT_VERSION:
+        raise SaveFormatError(f"save format {version} is newer than supported {SAVE_FORMAT_VERSION}")
+    return save_data
@@ -0,0 +1,310 @@
+# src/game_core/search.py
+# İleriye bakan (lookahead) AI için hafif arama durumu ve alfa-beta arayıcı.
+# SearchState, GameState'ten bir kez kurulur: birim nitelikleri paralel listelerde, doluluk düz bir listede durur;
+# hamle uygulama/geri alma birkaç liste ataması kadar ucuzdur (Unit/Tile nesnelerine dokunulmaz).
+# Sıra mantığı oyundakiyle aynıdır: tarafın birimleri sırayla tek eylem (hareket / saldırı / bekle) yapar,
+# hepsi bitince sıra karşı tarafa geçer. Düğüm anahtarı, birim konumları ve canlarının Zobrist hash'idir.
+import heapq
+import time
+
+from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+from .map import NEIGHBOR_OFFSETS
+from .zobrist import zobrist_key
+
+ACTION_PASS = 0
+ACTION_MOVE = 1
+ACTION_ATTACK = 2
+PASS_ACTION = (ACTION_PASS, -1, -1)
+
+WIN_SCORE = 1000000
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def other_player(player_id):
+    return PLAYER_HUMAN_ID if player_id == PLAYER_AI_ID else PLAYER_AI_ID
+
+
+class SearchState:
+    def __init__(self, game_state, first_unit=None):
+        game_map = game_state.game_map
+        self.cols, self.rows = game_map.cols, game_map.rows
+        self.walkable, self.cost = game_map.walkable, game_map.cost  # Arama sırasında arazi değişmez, kopyalanmaz
+        units = [u for u in game_map.units if u.is_alive()]
+        self.ids = [u.id for u in units]
+        self.player = [u.player_id for u in units]
+        self.x = [u.grid_x for u in units]
+        self.y = [u.grid_y for u in units]
+        self.hp = [u.health for u in units]
+        self.atk = [u.attack_power for u in units]
+        self.range_min = [u.min_attack_range for u in units]
+        self.range_max = [u.attack_range for u in units]
+        self.move = [u.movement_range for u in units]
+        self.occ = [-1] * (self.cols * self.rows)
+        self.alive = {PLAYER_HUMAN_ID: 0, PLAYER_AI_ID: 0}
+        self.hash = 0
+        for i in range(len(units)):
+            self.occ[self.y[i] * self.cols + self.x[i]] = i
+            self.alive[self.player[i]] += 1
+            self.hash ^= zobrist_key('pos', self.ids[i], self.y[i] * self.cols + self.x[i])
+            self.hash ^= zobrist_key('hp', self.ids[i], self.hp[i])
+
+        # Sıradaki taraf ve bu turda henüz oynamamış birimleri (oyunun çağıracağı sırayla)
+        side = game_state.current_player_id
+        queue = [i for i, u in enumerate(units) if u.player_id == side and not u.has_acted_this_turn]
+        if first_unit is not None and first_unit.id in self.ids:
+            first = self.ids.index(first_unit.id)
+            if first in queue: queue.remove(first); queue.insert(0, first)
+        self.side, self.queue, self.qpos, self._turn_key = side, tuple(queue), 0, 0
+        self._set_turn(side, self.queue, 0)
+        self._skip_dead()
+
+    # --- Sıra yönetimi ---
+    def _turn_component(self, side, queue, qpos):
+        # Sıradaki taraf + henüz oynamamış birimler kümesi; aynı turda sonraki çağrılar tabloyu yeniden kullanabilsin
+        key = zobrist_key('side', side)
+        for i in queue[qpos:]: key ^= zobrist_key('acts', self.ids[i])
+        return key
+
+    def _set_turn(self, side, queue, qpos):
+        new_key = self._turn_component(side, queue, qpos)
+        self.hash ^= self._turn_key ^ new_key
+        self.side, self.queue, self.qpos, self._turn_key = side, queue, qpos, new_key
+
+    def _skip_dead(self):
+        queue, qpos, hp = self.queue, self.qpos, self.hp
+        while qpos < len(queue) and hp[queue[qpos]] <= 0: qpos += 1
+        if qpos < len(queue):
+            if qpos != self.qpos: self._set_turn(self.side, queue, qpos)
+            return
+        side = other_player(self.side)  # Taraf turunu bitirdi, sıra karşıya geçer
+        self._set_turn(side, tuple(i for i in range(len(self.ids)) if self.player[i] == side and hp[i] > 0), 0)
+
+    def current_unit(self):
+        return self.queue[self.qpos] if self.qpos < len(self.queue) else -1
+
+    def is_terminal(self):
+        return self.alive[PLAYER_HUMAN_ID] == 0 or self.alive[PLAYER_AI_ID] == 0
+
+    # --- Hamle üretimi ---
+    def reachable_cells(self, i):
+        """Map.find_reachable ile aynı kurallar: engeller ve düşmanlar geçilmez, dostların üzerinden geçilir."""
+        cols, rows, walkable, tile_cost, occ, player = self.cols, self.rows, self.walkable, self.cost, self.occ, self.player
+        owner, max_cost = player[i], self.move[i]
+        start = self.y[i] * cols + self.x[i]
+        best = {start: 0}
+        frontier = [(0, start)]
+        while frontier:
+            cost, idx = heapq.heappop(frontier)
+            if cost > best[idx]: continue
+            x, y = idx % cols, idx // cols
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < cols and 0 <= ny < rows): continue
+                nidx = ny * cols + nx
+                if not walkable[nidx]: continue
+                occupant = occ[nidx]
+                if occupant != -1 and player[occupant] != owner: continue
+                new_cost = cost + tile_cost[nidx]
+                if new_cost <= max_cost and new_cost < best.get(nidx, max_cost + 1):
+                    best[nidx] = new_cost
+                    heapq.heappush(frontier, (new_cost, nidx))
+        return [idx for idx in best if occ[idx] == -1]
+
+    def attack_targets(self, i):
+        x, y, rmin, rmax, owner = self.x[i], self.y[i], self.range_min[i], self.range_max[i], self.player[i]
+        return [t for t in range(len(self.ids))
+                if self.hp[t] > 0 and self.player[t] != owner and rmin <= abs(self.x[t] - x) + abs(self.y[t] - y) <= rmax]
+
+    def nearest_enemy_distance(self, i, cell_x, cell_y):
+        owner, best = self.player[i], None
+        for t in range(len(self.ids)):
+            if self.hp[t] > 0 and self.player[t] != owner:
+                distance = abs(self.x[t] - cell_x) + abs(self.y[t] - cell_y)
+                if best is None or distance < best: best = distance
+        return best if best is not None else 0
+
+    def ordered_actions(self, move_candidates):
+        """Sıradaki birimin eylemleri: önce öldüren/zayıf hedefe saldırılar, sonra menzil mesafesine en
+        yakın move_candidates hareket, en son bekleme."""
+        i = self.current_unit()
+        if i < 0: return [PASS_ACTION]
+        atk, hp = self.atk[i], self.hp
+        targets = sorted(self.attack_targets(i), key=lambda t: (hp[t] > atk, hp[t]))
+        actions = [(ACTION_ATTACK, i, t) for t in targets]
+        cols, ideal = self.cols, self.range_max[i]
+        moves = sorted(self.reachable_cells(i),
+                       key=lambda idx: (abs(self.nearest_enemy_distance(i, idx % cols, idx // cols) - ideal), idx))
+        actions.extend((ACTION_MOVE, i, idx) for idx in moves[:move_candidates])
+        actions.append(PASS_ACTION)
+        return actions
+
+    def greedy_action(self, rng):
+        """SimpleAggressiveStrategy'nin kurallarının arama durumundaki karşılığı (MCTS rollout politikası):
+        öldürebileceği / canı en az hedefe saldır, yoksa en yakın düşmana en çok yaklaştıran kareye git."""
+        i = self.current_unit()
+        if i < 0: return PASS_ACTION
+        targets = self.attack_targets(i)
+        if targets:
+            atk, hp = self.atk[i], self.hp
+            return ACTION_ATTACK, i, min(targets, key=lambda t: (hp[t] > atk, hp[t]))
+        cells = self.reachable_cells(i)
+        if not cells: return PASS_ACTION
+        cols, ideal = self.cols, self.range_max[i]
+        scored = [(abs(self.nearest_enemy_distance(i, idx % cols, idx // cols) - ideal), idx) for idx in cells]
+        best = min(scored)[0]
+        current = abs(self.nearest_enemy_distance(i, self.x[i], self.y[i]) - ideal)
+        if best >= current: return PASS_ACTION  # Yerinde durmak zaten en iyisi
+        return ACTION_MOVE, i, rng.choice([idx for score, idx in scored if score == best])
+
+    # --- Uygula / geri al ---
+    def apply(self, action):
+        kind, i, arg = action
+        undo = (action, self.side, self.queue, self.qpos, None)
+        if kind == ACTION_MOVE:
+            old_idx = self.y[i] * self.cols + self.x[i]
+            self.occ[old_idx] = -1
+            self.occ[arg] = i
+            self.x[i], self.y[i] = arg % self.cols, arg // self.cols
+            self.hash ^= zobrist_key('pos', self.ids[i], old_idx) ^ zobrist_key('pos', self.ids[i], arg)
+            undo = (action, self.side, self.queue, self.qpos, old_idx)
+        elif kind == ACTION_ATTACK:
+            old_hp = self.hp[arg]
+            new_hp = max(0, old_hp - self.atk[i])
+            self.hp[arg] = new_hp
+            self.hash ^= zobrist_key('hp', self.ids[arg], old_hp) ^ zobrist_key('hp', self.ids[arg], new_hp)
+            if new_hp == 0:
+                cell = self.y[arg] * self.cols + self.x[arg]
+                self.occ[cell] = -1
+                self.alive[self.player[arg]] -= 1
+                self.hash ^= zobrist_key('pos', self.ids[arg], cell)
+            undo = (action, self.side, self.queue, self.qpos, old_hp)
+        self._set_turn(self.side, self.queue, self.qpos + 1)
+        self._skip_dead()
+        return undo
+
+    def revert(self, undo):
+        (kind, i, arg), side, queue, qpos, saved = undo
+        self._set_turn(side, queue, qpos)
+        if kind == ACTION_MOVE:
+            self.occ[arg] = -1
+            self.occ[saved] = i
+            self.x[i], self.y[i] = saved % self.cols, saved // self.cols
+            self.hash ^= zobrist_key('pos', self.ids[i], arg) ^ zobrist_key('pos', self.ids[i], saved)
+        elif kind == ACTION_ATTACK:
+            new_hp = self.hp[arg]
+            if new_hp == 0:
+                cell = self.y[arg] * self.cols + self.x[arg]
+                self.occ[cell] = arg
+                self.alive[self.player[arg]] += 1
+                self.hash ^= zobrist_key('pos', self.ids[arg], cell)
+            self.hp[arg] = saved
+            self.hash ^= zobrist_key('hp', self.ids[arg], new_hp) ^ zobrist_key('hp', self.ids[arg], saved)
+
+    # --- Değerlendirme ---
+    def evaluate(self, root_player):
+        """root_player açısından puan: canlı birimlerin canı + saldırı gücü farkı, düşmana yaklaşmaya küçük ödül."""
+        if self.alive[root_player] == 0: return -WIN_SCORE
+        if self.alive[other_player(root_player)] == 0: return WIN_SCORE
+        score = 0
+        for i in range(len(self.ids)):
+            if self.hp[i] <= 0: continue
+            value = self.hp[i] + 2 * self.atk[i]
+            distance_penalty = abs(self.nearest_enemy_distance(i, self.x[i], self.y[i]) - self.range_max[i])
+            score += (value - distance_penalty) if self.player[i] == root_player else -(value - distance_penalty)
+        return score
+
+
+class AlphaBetaSearch:
+    """Yinelemeli derinleştirmeli alfa-beta; derinlik birim eylemi (ply) cinsindendir."""
+
+    def __init__(self, max_depth=8, move_candidates=4, tt_max_entries=200000):
+        self.max_depth = max_depth
+        self.move_candidates = move_candidates
+        self.tt_max_entries = tt_max_entries
+        self._tables = {}  # kök oyuncu -> {Zobrist hash: (derinlik, değer, bayrak, en iyi eylem)}
+        self.table = None
+        self.nodes = 0
+        self.completed_depth = 0
+        self._deadline = None
+
+    def search(self, state, root_player, time_budget):
+        """Süre bitene veya max_depth'e ulaşana kadar derinleştirir. (en iyi eylem, değer) döndürür."""
+        self.table = self._tables.setdefault(root_player, {})  # Değerler kök oyuncunun bakış açısından
+        if len(self.table) > self.tt_max_entries: self.table.clear()
+        self._deadline = time.perf_counter() + time_budget
+        self.nodes = 0
+        self.completed_depth = 0
+        best_action, best_value = None, None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value = self._alphabeta(state, depth, -WIN_SCORE - 1, WIN_SCORE + 1, root_player)
+            except SearchTimeout:
+                break
+            entry = self.table.get(state.hash)
+            best_action, best_value = (entry[3] if entry else None), value
+            self.completed_depth = depth
+            if abs(value) >= WIN_SCORE: break  # Kesin sonuç bulundu
+        if best_action is None:  # İlk derinlik bile bitmediyse en iyi sıralanmış eylem
+            best_action = state.ordered_actions(self.move_candidates)[0]
+        return best_action, best_value
+
+    def principal_variation(self, state, player, limit):
+        """Tablodaki en iyi eylemleri izleyerek player'ın art arda eylemlerini [(hash, eylem)] olarak çıkarır."""
+        line, undos = [], []
+        while len(line) < limit and state.side == player and not state.is_terminal():
+            entry = self.table.get(state.hash)
+            if not entry or entry[3] is None: break
+            line.append((state.hash, entry[3]))
+            undos.append(state.apply(entry[3]))
+        for undo in reversed(undos): state.revert(undo)
+        return line
+
+    def _alphabeta(self, state, depth, alpha, beta, root_player):
+        self.nodes += 1
+        if self.nodes & 255 == 0 and time.perf_counter() > self._deadline: raise SearchTimeout()
+        if depth == 0 or state.is_terminal() or state.current_unit() < 0:
+            return state.evaluate(root_player)
+
+        key = state.hash
+        entry = self.table.get(key)
+        tt_action = None
+        if entry:
+            entry_depth, entry_value, entry_flag, tt_action = entry
+            if entry_depth >= depth:
+                if entry_flag == TT_EXACT: return entry_value
+                if entry_flag == TT_LOWER: alpha = max(alpha, entry_value)
+                elif entry_flag == TT_UPPER: beta = min(beta, entry_value)
+                if alpha >= beta: return entry_value
+
+        actions = state.ordered_actions(self.move_candidates)
+        if tt_action in actions:
+            actions.remove(tt_action)
+            actions.insert(0, tt_action)
+
+        maximizing = state.side == root_player
+        alpha_orig, beta_orig = alpha, beta
+        best_value = -WIN_SCORE - 1 if maximizing else WIN_SCORE + 1
+        best_action = None
+        for action in actions:
+            undo = state.apply(action)
+            try:
+                value = self._alphabeta(state, depth - 1, alpha, beta, root_player)
+            finally:
+                state.revert(undo)
+            if maximizing:
+                if value > best_value: best_value, best_action = value, action
+                alpha = max(alpha, value)
+            else:
+                if value < best_value: best_value, best_action = value, action
+                beta = min(beta, value)
+            if alpha >= beta: break
+
+        if best_value <= alpha_orig: flag = TT_UPPER
+        elif best_value >= beta_orig: flag = TT_LOWER
+        else: flag = TT_EXACT
+        self.table[key] = (depth, best_value, flag, best_action)
+        return best_value
@@ -0,0 +1,75 @@
+# src/game_core/simulator.py
+# Bir seviyeyi pencere açmadan ve bekleme yapmadan sonuna kadar oynatır (AI - AI).
+# CI ve denge ayarı için binlerce oyunu hızlıca koşturmak amacıyla kullanılır.
+from .game_state import GameState, load_level_data, RESULT_LEVEL_CLEARED
+from .journal import CommandJournal
+from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+
+RESULT_TURN_LIMIT = "turn_limit"
+DEFAULT_MAX_TURNS = 100
+
+
+class Simulator:
+    def __init__(self, level_number=1, level_data=None, human_strategy_id="SimpleAggressiveStrategy",
+                 ai_strategy_id=None, max_turns=None, seed=None, journal_path=None,
+                 record_decision_times=False):
+        self.level_number = level_number
+        self.level_data = level_data if level_data is not None else load_level_data(level_number)
+        self.human_strategy_id = human_strategy_id
+        self.ai_strategy_id = ai_strategy_id  # None ise seviye dosyasındaki strategy_id'ler kullanılır
+        self.max_turns = max_turns if max_turns is not None else self.level_data.get("max_turns", DEFAULT_MAX_TURNS)
+        self.seed = seed  # None ise rastgele seçilir; sonuçta "seed" olarak döner
+        self.state = GameState()
+        if journal_path: self.state.journal = CommandJournal(journal_path)
+        if record_decision_times: self.state.decision_times = []  # Sonuçta "decision_times" olarak döner
+
+    def _assign_strategies(self):
+        strategies = self.state.ai_strategies
+        human_strategy_id = self.human_strategy_id if self.human_strategy_id in strategies else "SimpleAggressiveStrategy"
+        ai_override_id = self.ai_strategy_id if self.ai_strategy_id in strategies else None
+        assignments = {}
+        for unit in self.state.game_map.units:
+            if unit.player_id == PLAYER_HUMAN_ID:
+                assignments[unit.id] = human_strategy_id
+            elif ai_override_id:
+                assignments[unit.id] = ai_override_id
+        self.state.assign_strategies(assignments)
+
+    def close(self):
+        """Günlüğü ve stratejilerin süreç havuzlarını kapatır (run sonunda kendiliğinden çağrılır)."""
+        self.state.close()
+        if self.state.journal: self.state.journal.close()
+
+    def run(self):
+        """Oyunu bitene veya tur sınırına ulaşana kadar oynatır ve sonucu sözlük olarak döndürür."""
+        state = self.state
+        try:
+            state.setup_level(self.level_number, self.level_data, is_new_game_session=True, seed=self.seed)
+            self._assign_strategies()
+
+            result = state.evaluate_game_over()
+            while result is None and state.turns_taken_this_level < self.max_turns:
+                state.play_ai_turn(state.current_player_id)
+                result = state.evaluate_game_over()
+                if result is None:
+                    state.end_turn()
+            if result is None:
+                result = RESULT_TURN_LIMIT
+        finally:
+            self.close()
+
+        human_units_left = len(state.living_units(PLAYER_HUMAN_ID))
+        winner = None
+        if result == RESULT_LEVEL_CLEARED:
+            winner = PLAYER_HUMAN_ID
+        elif human_units_left == 0 and state.living_units(PLAYER_AI_ID):
+            winner = PLAYER_AI_ID
+        score = state.calculate_score(state.turns_taken_this_level, human_units_left) \
+            if result == RESULT_LEVEL_CLEARED else 0
+
+        summary = {"level_number": self.level_number, "seed": state.seed, "result": result, "winner": winner,
+                   "turns": state.turns_taken_this_level, "score": score,
+                   "human_units_left": human_units_left,
+                   "ai_units_left": len(state.living_units(PLAYER_AI_ID))}
+        if state.decision_times is not None: summary["decision_times"] = state.decision_times
+        return summary
@@ -0,0 +1,57 @@
+# src/game_core/snapshot.py
+# GameState'in kopyalanabilir, kompakt anlık görüntüsü (snapshot).
+# Sadece birim nitelikleri (konum, can, eylem bayrağı) diziler halinde saklanır; harita doluluk katmanları
+# (occupant/owner) kopyalanmaz, geri yüklemede yeri değişen birimlerin kareleri birim konumlarından yeniden yazılır.
+# Unit/Tile nesneleri derin kopyalanmaz. Alma ve geri yükleme harita boyutundan bağımsız, O(birim sayısı):
+#   - geri alma (undo) her komuttan önceki görüntüye döner, ölen birimler de geri gelir
+#   - AI araması hamleyi uygulayıp görüntüye dönerek binlerce kez deneme yapabilir
+from array import array
+
+
+class StateSnapshot:
+    def __init__(self, state):
+        game_map = state.game_map
+        self.game_map = game_map
+        self.units = [u for u in game_map.units if u.is_alive()]  # Sıra korunur (AI birim sırası buna bağlı)
+        self.xs = array('h', [u.grid_x for u in self.units])
+        self.ys = array('h', [u.grid_y for u in self.units])
+        self.health = array('i', [u.health for u in self.units])
+        self.acted = bytearray(1 if u.has_acted_this_turn else 0 for u in self.units)
+        self.current_player_id = state.current_player_id
+        self.turns_taken_this_level = state.turns_taken_this_level
+        self.game_over_flag = state.game_over_flag
+
+    def restore(self, state):
+        game_map = self.game_map
+        if state.game_map is not game_map: raise ValueError("Snapshot belongs to a different map")
+        snapshot_ids = {u.id for u in self.units}
+        for unit in list(game_map.units):  # Görüntüden sonra eklenmiş birimler
+            if unit.id not in snapshot_ids: game_map.remove_unit_from_map(unit)
+
+        # Birim nitelikleri geri yazılır; yeri değişen ya da haritaya geri dönen birimlerin eski kareleri boşaltılır
+        units_by_id = game_map.unit_by_id
+        changed = []
+        for i, unit in enumerate(self.units):
+            x, y = self.xs[i], self.ys[i]
+            on_map = units_by_id.get(unit.id) is unit
+            moved = unit.grid_x != x or unit.grid_y != y
+            if moved and on_map and game_map.occupant[game_map.index(unit.grid_x, unit.grid_y)] == unit.id:
+                game_map._vacate(unit.grid_x, unit.grid_y)
+            unit.health = self.health[i]
+            unit.has_acted_this_turn = self.acted[i] == 1
+            unit.grid_x, unit.grid_y = x, y
+            unit.tile_size = game_map.tile_size
+            if moved or not on_map: changed.append((unit, on_map))
+
+        game_map.units = list(self.units)
+        game_map.unit_by_id = {u.id: u for u in self.units}
+        for unit, _ in changed: game_map._occupy(unit, unit.grid_x, unit.grid_y)  # Tüm eski kareler boşaldıktan sonra
+        state.current_player_id = self.current_player_id
+        state.turns_taken_this_level = self.turns_taken_this_level
+        state.game_over_flag = self.game_over_flag
+        game_map.rebuild_position_hash()
+
+        for unit, was_on_map in changed:  # Tehdit haritaları sadece değişen birimler için güncellenir
+            for observer in game_map.observers:
+                if was_on_map: observer.on_unit_moved(unit)
+                else: observer.on_unit_added(unit)
@@ -0,0 +1,123 @@
+# src/game_core/spatial_index.py
+# Birimlerin oyuncuya ve konuma göre indeksi. Harita gözlemcisi olarak çalışır (Map kendisi kurar):
+#   - oyuncu başına birim kümeleri: "oyuncunun kaç birimi kaldı", "oyuncunun birimleri" sorguları O(1)/O(k)
+#   - BUCKET_SIZE x BUCKET_SIZE karelik kovalar: en yakın k düşman ve d mesafedeki düşmanlar sorguları
+#     sadece ilgili kovaları gezer, bütün birim listesini taramaz.
+# Mesafe her yerde Manhattan mesafesidir; eşit mesafede küçük id'li birim önce gelir.
+import heapq
+
+BUCKET_SIZE = 8
+
+
+class SpatialIndex:
+    def __init__(self, rows, cols, bucket_size=BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.bucket_cols = (cols + bucket_size - 1) // bucket_size
+        self.bucket_rows = (rows + bucket_size - 1) // bucket_size
+        self.clear()
+
+    def clear(self):
+        self._players = {}  # player_id -> {unit.id: unit} (ekleme sırası korunur)
+        self._buckets = {}  # (bx, by) -> {unit.id: unit}
+        self._where = {}  # unit.id -> (bx, by)
+        self._versions = {}  # player_id -> o oyuncunun birimleri eklendikçe/hareket ettikçe/kaldırıldıkça artar
+
+    def _bucket_of(self, grid_x, grid_y):
+        return grid_x // self.bucket_size, grid_y // self.bucket_size
+
+    # --- Harita gözlemcisi ---
+    def on_unit_added(self, unit):
+        self._players.setdefault(unit.player_id, {})[unit.id] = unit
+        self.on_unit_moved(unit)
+
+    def on_unit_moved(self, unit):
+        self._bump(unit.player_id)
+        bucket = self._bucket_of(unit.grid_x, unit.grid_y)
+        old_bucket = self._where.get(unit.id)
+        if old_bucket == bucket: return
+        if old_bucket is not None: self._discard_from_bucket(unit, old_bucket)
+        self._buckets.setdefault(bucket, {})[unit.id] = unit
+        self._where[unit.id] = bucket
+
+    def on_unit_removed(self, unit):
+        self._bump(unit.player_id)
+        members = self._players.get(unit.player_id)
+        if members and members.get(unit.id) is unit: del members[unit.id]
+        old_bucket = self._where.pop(unit.id, None)
+        if old_bucket is not None: self._discard_from_bucket(unit, old_bucket)
+
+    def _bump(self, player_id):
+        self._versions[player_id] = self._versions.get(player_id, 0) + 1
+
+    def _discard_from_bucket(self, unit, bucket):
+        members = self._buckets.get(bucket)
+        if members is None: return
+        members.pop(unit.id, None)
+        if not members: del self._buckets[bucket]
+
+    # --- Sorgular ---
+    def version(self, player_id):
+        """Oyuncunun birim konumları değiştikçe artan sayaç (akış alanı gibi önbellekler için)."""
+        return self._versions.get(player_id, 0)
+
+    def units_of(self, player_id):
+        """Oyuncunun haritadaki canlı birimleri (haritaya eklenme sırasıyla)."""
+        return [u for u in self._players.get(player_id, {}).values() if u.is_alive()]
+
+    def count(self, player_id):
+        return sum(1 for u in self._players.get(player_id, {}).values() if u.is_alive())
+
+    def has_units(self, player_id):
+        return any(u.is_alive() for u in self._players.get(player_id, {}).values())
+
+    def has_enemies(self, player_id):
+        return any(self.has_units(other) for other in self._players if other != player_id)
+
+    def within(self, grid_x, grid_y, distance, enemy_of=None):
+        """(grid_x, grid_y)'ye en fazla distance uzaklıktaki canlı birimler (enemy_of verilirse sadece onun düşmanları),
+        (mesafe, id) sırasıyla."""
+        size = self.bucket_size
+        found = []
+        for by in range(max(0, (grid_y - distance) // size), min(self.bucket_rows - 1, (grid_y + distance) // size) + 1):
+            for bx in range(max(0, (grid_x - distance) // size),
+                            min(self.bucket_cols - 1, (grid_x + distance) // size) + 1):
+                for unit in self._buckets.get((bx, by), {}).values():
+                    if enemy_of is not None and unit.player_id == enemy_of: continue
+                    d = abs(unit.grid_x - grid_x) + abs(unit.grid_y - grid_y)
+                    if d <= distance and unit.is_alive(): found.append((d, unit.id, unit))
+        found.sort(key=lambda entry: entry[:2])
+        return [unit for _, _, unit in found]
+
+    def nearest(self, grid_x, grid_y, k=1, enemy_of=None):
+        """En yakın k canlı birim (enemy_of verilirse sadece onun düşmanları), (mesafe, id) sırasıyla.
+        Kovalar merkezden halka halka gezilir; bir halkanın en yakın noktası bile bulunan k'ıncı birimden
+        uzaksa arama durur."""
+        size = self.bucket_size
+        cbx, cby = self._bucket_of(grid_x, grid_y)
+        best = []  # (-mesafe, -id, unit) en kötüsü başta olan en fazla k elemanlı yığın
+        max_ring = max(cbx, cby, self.bucket_cols - 1 - cbx, self.bucket_rows - 1 - cby)
+        for ring in range(max_ring + 1):
+            if len(best) == k and ring > 0:
+                # Bu halkadaki bir kareye en az mesafe: merkez kovanın kenarına uzaklık + aradaki tam kovalar
+                nearest_possible = min(grid_x - cbx * size, (cbx + 1) * size - 1 - grid_x,
+                                       grid_y - cby * size, (cby + 1) * size - 1 - grid_y) + 1 + (ring - 1) * size
+                if nearest_possible > -best[0][0]: break
+            for bx, by in self._ring_buckets(cbx, cby, ring):
+                for unit in self._buckets.get((bx, by), {}).values():
+                    if (enemy_of is not None and unit.player_id == enemy_of) or not unit.is_alive(): continue
+                    entry = (-(abs(unit.grid_x - grid_x) + abs(unit.grid_y - grid_y)), -unit.id, unit)
+                    if len(best) < k: heapq.heappush(best, entry)
+                    elif entry[:2] > best[0][:2]: heapq.heapreplace(best, entry)
+        best.sort(key=lambda entry: entry[:2], reverse=True)
+        return [unit for _, _, unit in best]
+
+    def _ring_buckets(self, cbx, cby, ring):
+        if ring == 0:
+            yield cbx, cby
+            return
+        for bx in range(max(0, cbx - ring), min(self.bucket_cols - 1, cbx + ring) + 1):
+            for by in (cby - ring, cby + ring):
+                if 0 <= by < self.bucket_rows: yield bx, by
+        for by in range(max(0, cby - ring + 1), min(self.bucket_rows - 1, cby + ring - 1) + 1):
+            for bx in (cbx - ring, cbx + ring):
+                if 0 <= bx < self.bucket_cols: yield bx, by
@@ -0,0 +1,46 @@
+# src/game_core/terrain.py
+# Seviye arazisi şablonları. Bir seviyenin walkable/cost katmanları seviye verisinden (boyut, "obstacles",
+# "terrain_costs") bir kez kurulur ve aynı seviyeyle açılan her Map tarafından kopyalanmadan paylaşılır;
+# Map araziyi ilk değiştirdiğinde kendi kopyasını alır (copy-on-write, Map._own_terrain).
+# Böylece seviye yeniden başlatma, turnuva ve tekrar oynatma her oyunda araziyi baştan kurmaz.
+from array import array
+from collections import OrderedDict
+
+TEMPLATE_CACHE_SIZE = 8  # Bellekte tutulan en fazla şablon (büyük haritalarda her biri ~2 bayt/kare)
+
+
+class TerrainTemplate:
+    __slots__ = ("rows", "cols", "walkable", "cost")
+
+    def __init__(self, rows, cols, walkable, cost):
+        self.rows = rows
+        self.cols = cols
+        self.walkable = walkable  # Paylaşılır: yerinde değiştirilmemeli
+        self.cost = cost
+
+    @classmethod
+    def from_level_data(cls, level_data, rows, cols):
+        size = rows * cols
+        walkable = bytearray(b"\x01") * size
+        cost = array('B', [1]) * size
+        for grid_x, grid_y in level_data.get("obstacles", []):
+            if 0 <= grid_x < cols and 0 <= grid_y < rows: walkable[grid_y * cols + grid_x] = 0
+        for grid_x, grid_y, value in level_data.get("terrain_costs", []):
+            if 0 <= grid_x < cols and 0 <= grid_y < rows: cost[grid_y * cols + grid_x] = max(1, min(255, int(value)))
+        return cls(rows, cols, walkable, cost)
+
+
+_templates = OrderedDict()  # anahtar -> TerrainTemplate (LRU)
+
+
+def level_terrain(level_data, rows, cols):
+    """Seviye verisinin arazi şablonu; aynı boyut ve arazi için önbellekteki şablon döndürülür."""
+    key = (rows, cols, tuple(map(tuple, level_data.get("obstacles", []))),
+           tuple(map(tuple, level_data.get("terrain_costs", []))))
+    template = _templates.get(key)
+    if template is not None:
+        _templates.move_to_end(key)
+        return template
+    template = _templates[key] = TerrainTemplate.from_level_data(level_data, rows, cols)
+    if len(_templates) > TEMPLATE_CACHE_SIZE: _templates.popitem(last=False)
+    return template
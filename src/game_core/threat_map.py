@@ -0,0 +1,123 @@
+# src/game_core/threat_map.py
+# Bir oyuncunun birimlerinin saldırabileceği kareleri kare başına sayaç olarak tutar.
+# Harita gözlemcisi olarak çalışır: bir birim eklenince/hareket edince/ölünce sadece
+# o birimin ayak izi (footprint) güncellenir, her turda bütün harita yeniden taranmaz.
+from array import array
+
+_RING_KERNEL_CACHE = {}
+
+
+def ring_kernel(min_range, max_range):
+    """min_range <= |dx| + |dy| <= max_range olan (dx, dy) ofsetleri. (min, max) çifti başına bir kez hesaplanır."""
+    key = (min_range, max_range)
+    kernel = _RING_KERNEL_CACHE.get(key)
+    if kernel is None:
+        kernel = tuple((dx, dy)
+                       for dy in range(-max_range, max_range + 1)
+                       for dx in range(-max_range, max_range + 1)
+                       if (dx or dy) and min_range <= abs(dx) + abs(dy) <= max_range)
+        _RING_KERNEL_CACHE[key] = kernel
+    return kernel
+
+
+class ThreatMap:
+    def __init__(self, game_map, player_id):
+        self.game_map = game_map
+        self.player_id = player_id
+        size = game_map.rows * game_map.cols
+        self.counts = array('H', [0]) * size  # Kareyi tehdit eden birim sayısı
+        self.total_damage = array('I', [0]) * size  # Kareye gelebilecek toplam hasar
+        # Saldırı gücü başına sayaç; en yüksek hasarı silme sonrasında da O(farklı güç sayısı) ile bulmak için
+        self._power_counts = {}
+        self._footprints = {}  # unit.id -> (attack_power, kare indeksleri)
+        self.version = 0  # Her değişiklikte artar; çizim tarafı önbelleğini buna göre yeniler
+        self._coords_cache = None
+        self._coords_cache_version = -1
+        self._max_damage_cache = None
+        self._max_damage_cache_version = -1
+
+    # --- Harita gözlemcisi ---
+    def on_unit_added(self, unit):
+        if unit.player_id == self.player_id: self.update_unit(unit)
+
+    def on_unit_moved(self, unit):
+        if unit.player_id == self.player_id: self.update_unit(unit)
+
+    def on_unit_removed(self, unit):
+        if unit.player_id == self.player_id: self.remove_unit(unit)
+
+    # --- Güncelleme ---
+    def rebuild(self):
+        size = self.game_map.rows * self.game_map.cols
+        self.counts = array('H', [0]) * size
+        self.total_damage = array('I', [0]) * size
+        self._power_counts = {}
+        self._footprints = {}
+        for unit in self.game_map.units:
+            if unit.player_id == self.player_id: self.update_unit(unit)
+        self.version += 1
+
+    def update_unit(self, unit):
+        self.remove_unit(unit)
+        if not unit.is_alive(): return
+        game_map = self.game_map
+        cols, rows = game_map.cols, game_map.rows
+        indices = []
+        for dx, dy in ring_kernel(unit.min_attack_range, unit.attack_range):
+            x, y = unit.grid_x + dx, unit.grid_y + dy
+            if 0 <= x < cols and 0 <= y < rows: indices.append(y * cols + x)
+        power = unit.attack_power
+        power_counts = self._power_counts.get(power)
+        if power_counts is None:
+            power_counts = self._power_counts[power] = array('H', [0]) * (rows * cols)
+        counts, total_damage = self.counts, self.total_damage
+        for idx in indices:
+            counts[idx] += 1
+            total_damage[idx] += power
+            power_counts[idx] += 1
+        self._footprints[unit.id] = (power, indices)
+        self.version += 1
+
+    def remove_unit(self, unit):
+        footprint = self._footprints.pop(unit.id, None)
+        if not footprint: return
+        power, indices = footprint
+        counts, total_damage, power_counts = self.counts, self.total_damage, self._power_counts[power]
+        for idx in indices:
+            counts[idx] -= 1
+            total_damage[idx] -= power
+            power_counts[idx] -= 1
+        self.version += 1
+
+    # --- Sorgular ---
+    def threat_count(self, grid_x, grid_y):
+        if not (0 <= grid_x < self.game_map.cols and 0 <= grid_y < self.game_map.rows): return 0
+        return self.counts[grid_y * self.game_map.cols + grid_x]
+
+    def is_threatened(self, grid_x, grid_y):
+        return self.threat_count(grid_x, grid_y) > 0
+
+    def max_damage_at(self, grid_x, grid_y):
+        """Kareye tek bir birimden gelebilecek en yüksek hasar."""
+        if not self.is_threatened(grid_x, grid_y): return 0
+        idx = grid_y * self.game_map.cols + grid_x
+        return max((power for power, power_counts in self._power_counts.items() if power_counts[idx]), default=0)
+
+    def max_damage_layer(self):
+        """max_damage_at'in tüm harita için dizi hali (indeks = y * cols + x), değişene kadar önbellekte."""
+        if self._max_damage_cache_version != self.version:
+            layer = array('I', [0]) * len(self.counts)
+            for power, power_counts in self._power_counts.items():
+                for idx, count in enumerate(power_counts):
+                    if count and power > layer[idx]: layer[idx] = power
+            self._max_damage_cache = layer
+            self._max_damage_cache_version = self.version
+        return self._max_damage_cache
+
+    def threatened_coords(self):
+        """Tehdit altındaki (x, y) kareleri. Sonuç, harita değişene kadar önbellekte tutulur."""
+        if self._coords_cache_version != self.version:
+            cols = self.game_map.cols
+            self._coords_cache = [(idx % cols, idx // cols) for idx, count in enumerate(self.counts) if count]
+            self._coords_cache_version = self.version
+        return self._coords_cache
@@ -1,21 +1,59 @@
 # src/game_core/tile.py
-import pygame
+# Tile, haritadaki bir karenin hafif görünümüdür (view): sadece (harita, x, y) tutar. Yürünebilirlik,
+# hareket maliyeti ve karedeki birim Map'in sıkıştırılmış katmanlarından (walkable/cost/occupant) okunur,
+# piksel konumu ve Rect ızgara konumu ile kare boyutundan gerektiğinde hesaplanır.
+# Map, Tile'ları parça (chunk) parça ve sadece erişildiğinde kurar; aynı kare için hep aynı nesneyi döndürür.
 
 
 class Tile:
-    def __init__(self, x_grid, y_grid, size, color=(200, 200, 200), is_walkable=True):
+    __slots__ = ("game_map", "x_grid", "y_grid")
+    base_color = (200, 200, 200)  # Temadan bağımsız varsayılan renk (artık pek kullanılmayacak)
+
+    def __init__(self, game_map, x_grid, y_grid):
+        self.game_map = game_map
         self.x_grid = x_grid
         self.y_grid = y_grid
-        self.size = size
-        self.base_color = color  # Temadan bağımsız varsayılan renk (artık pek kullanılmayacak)
-        self.is_walkable = is_walkable
-        self.unit_on_tile = None
 
-        self.pixel_x = self.x_grid * self.size
-        self.pixel_y = self.y_grid * self.size
-        self.rect = pygame.Rect(self.pixel_x, self.pixel_y, self.size, self.size)
+    @property
+    def size(self):
+        return self.game_map.tile_size
+
+    @property
+    def is_walkable(self):
+        return self.game_map.walkable[self.game_map.index(self.x_grid, self.y_grid)] == 1
+
+    @is_walkable.setter
+    def is_walkable(self, value):
+        self.game_map.set_tile_walkable(self.x_grid, self.y_grid, value)
+
+    @property
+    def movement_cost(self):  # Bu kareye girmenin hareket maliyeti
+        return self.game_map.cost[self.game_map.index(self.x_grid, self.y_grid)]
+
+    @movement_cost.setter
+    def movement_cost(self, value):
+        self.game_map.set_tile_movement_cost(self.x_grid, self.y_grid, value)
+
+    @property
+    def unit_on_tile(self):
+        return self.game_map.unit_at(self.x_grid, self.y_grid)
 
-    def draw(self, surface, active_theme):  # !!! active_theme parametresi eklendi !!!
+    @property
+    def pixel_x(self):
+        return self.x_grid * self.size
+
+    @property
+    def pixel_y(self):
+        return self.y_grid * self.size
+
+    @property
+    def rect(self):
+        # pygame sadece çizim sırasında gerekli; simülasyon (GameState) pygame olmadan çalışabilmeli
+        import pygame
+        return pygame.Rect(self.pixel_x, self.pixel_y, self.size, self.size)
+
+    def draw(self, surface, active_theme, offset_x=0, offset_y=0):  # offset: surface'in harita pikselindeki sol üstü
+        import pygame
         # Tema renklerini al, eğer temada yoksa varsayılan renkleri kullan
         default_walkable_color = active_theme.get("tile_walkable_default_color", (200, 200, 200))
         obstacle_color = active_theme.get("tile_obstacle_color",
@@ -31,17 +69,9 @@ class Tile:
         # if self.unit_on_tile and self.unit_on_tile.is_graphically_selected:
         #     pass # Özel bir şey yapma, birim kendini çizecek
 
-        pygame.draw.rect(surface, current_fill_color, self.rect)
-        pygame.draw.rect(surface, border_color, self.rect, 1)
-
-    def set_unit(self, unit):
-        self.unit_on_tile = unit
-        # Pixel pos ayarı Map.add_unit veya Map.move_unit içinde yapılmalı
-        # if unit:
-        #     unit.set_pixel_pos(self.pixel_x, self.pixel_y, self.size)
-
-    def remove_unit(self):
-        self.unit_on_tile = None
+        rect = pygame.Rect(self.pixel_x - offset_x, self.pixel_y - offset_y, self.size, self.size)
+        pygame.draw.rect(surface, current_fill_color, rect)
+        pygame.draw.rect(surface, border_color, rect, 1)
 
     def to_dict(self):
         tile_data = {
@@ -49,12 +79,9 @@ class Tile:
             "y_grid": self.y_grid,
             "is_walkable": self.is_walkable,
         }
+        if self.movement_cost != 1:  # Eski kayıtlarla uyumlu kalmak için sadece farklıysa yaz
+            tile_data["movement_cost"] = self.movement_cost
         return tile_data
 
-    @classmethod
-    def from_dict(cls, data, tile_size):
-        return cls(data["x_grid"], data["y_grid"], tile_size,
-                   is_walkable=data["is_walkable"])
-
     def __str__(self):
         return f"Tile ({self.x_grid}, {self.y_grid}) - Unit: {self.unit_on_tile.unit_type if self.unit_on_tile else 'None'}"
\ No newline at end of file
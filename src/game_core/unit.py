@@ -1,10 +1,19 @@
 # src/game_core/unit.py
-import pygame
+import logging
+
 from .unit_states import IdleState  # __init__ içinde import ediliyor
-from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+from .constants import PLAYER_HUMAN_ID, PLAYER_AI_ID, NO_OWNER
+from .threat_map import ring_kernel
+
+logger = logging.getLogger(__name__)
 
 
 class Unit:
+    # Örnek başına __dict__ yok; piksel konumu ızgara konumundan türetilir, durum nesnesi ilk kullanımda kurulur
+    __slots__ = ("id", "grid_x", "grid_y", "unit_type", "player_id", "base_color", "size", "tile_size",
+                 "is_graphically_selected", "has_acted_this_turn", "ai_strategy_instance", "health_listener",
+                 "max_health", "health", "attack_power", "attack_range", "min_attack_range", "movement_range",
+                 "current_state_name", "_state")
     _id_counter = 0
 
     def __init__(self, grid_x, grid_y, unit_type, player_id, color=(128, 128, 128), size=30):  # Varsayılan renk gri
@@ -17,12 +26,11 @@ class Unit:
         self.player_id = player_id
         self.base_color = color  # Artık Unit.draw içinde temadan alınacak birincil renk
         self.size = size
-        self.pixel_x = 0
-        self.pixel_y = 0
-        self.rect = None
+        self.tile_size = None  # Haritaya eklenince atanır; o zamana kadar çizilmez
         self.is_graphically_selected = False
         self.has_acted_this_turn = False
         self.ai_strategy_instance = None
+        self.health_listener = None  # Haritaya eklenince Map.on_unit_health_changed atanır (konum hash'i için)
 
         # Varsayılan Savaş Değerleri (Alt sınıflar bunları ezecek)
         self.max_health = 100
@@ -32,16 +40,19 @@ class Unit:
         self.min_attack_range = 1
         self.movement_range = 1
 
-        # from .unit_states import IdleState # __init__ anında import yerine en üste alındı
+        # Varsayılan IdleState ilk erişimde kurulur (simülasyonda çoğu birim hiç ihtiyaç duymaz)
         self.current_state_name = IdleState.__name__
-        self.current_state = IdleState(self)
-        if self.current_state:  # None değilse
-            self.current_state.enter_state(game_instance=None)  # Unit __init__'te game_instance henüz yok
+        self._state = None
+
+    @property
+    def current_state(self):
+        if self._state is None and self.current_state_name == IdleState.__name__: self._state = IdleState(self)
+        return self._state
 
     def set_state(self, new_state_instance, game_instance=None):
         if self.current_state:
             self.current_state.exit_state(game_instance)
-        self.current_state = new_state_instance
+        self._state = new_state_instance
         if self.current_state:  # new_state_instance None değilse adını al
             self.current_state_name = new_state_instance.__class__.__name__
             self.current_state.enter_state(game_instance)
@@ -56,15 +67,30 @@ class Unit:
         if self.current_state:
             self.current_state.update(dt)
 
-    def set_pixel_pos(self, pixel_x, pixel_y, tile_size):
-        offset = (tile_size - self.size) / 2
-        self.pixel_x = pixel_x + offset;
-        self.pixel_y = pixel_y + offset
-        self.rect = pygame.Rect(self.pixel_x, self.pixel_y, self.size, self.size)
+    @property
+    def has_pixel_pos(self):
+        return self.tile_size is not None
+
+    @property
+    def pixel_x(self):  # Birim karenin ortasına hizalanır
+        return self.grid_x * self.tile_size + (self.tile_size - self.size) / 2
 
-    def draw(self, surface, active_theme, font_small):
-        if not self.is_alive() or not self.rect:
+    @property
+    def pixel_y(self):
+        return self.grid_y * self.tile_size + (self.tile_size - self.size) / 2
+
+    @property
+    def rect(self):
+        # Rect her harekette yeniden kurulmuyor, sadece çizerken gerekiyor (simülasyon pygame'siz çalışır)
+        if not self.has_pixel_pos: return None
+        import pygame
+        return pygame.Rect(self.pixel_x, self.pixel_y, self.size, self.size)
+
+    def draw(self, surface, active_theme, font_small, text_cache=None):
+        if not self.is_alive() or not self.has_pixel_pos:
             return
+        import pygame
+        rect = self.rect
 
         player_type_str = "human" if self.player_id == PLAYER_HUMAN_ID else "ai"
         unit_type_str = self.unit_type.lower()
@@ -82,7 +108,7 @@ class Unit:
                                   int(unit_theme_color[1] * dim_factor),
                                   int(unit_theme_color[2] * dim_factor))
 
-        pygame.draw.rect(surface, current_draw_color, self.rect)
+        pygame.draw.rect(surface, current_draw_color, rect)
 
         health_bar_bg_color = active_theme.get("health_bar_bg", (150, 0, 0))
         health_bar_fg_color = active_theme.get("health_bar_fg", (0, 200, 0))
@@ -98,33 +124,36 @@ class Unit:
 
         if self.is_graphically_selected:
             selected_border_color = active_theme.get("unit_selected_border_color", (255, 255, 0))
-            pygame.draw.rect(surface, selected_border_color, self.rect, 3)
+            pygame.draw.rect(surface, selected_border_color, rect, 3)
 
         label_text_color = active_theme.get("unit_label_text_color", (0, 0, 0))
-        label_surf = font_small.render(self.unit_type, True, label_text_color)
-        label_rect = label_surf.get_rect(center=(self.rect.centerx, self.rect.top - 6))
+        # Etiket her karede aynı; önbellek verildiyse tekrar rasterize edilmez
+        if text_cache:
+            label_surf = text_cache.render(font_small, self.unit_type, True, label_text_color)
+        else:
+            label_surf = font_small.render(self.unit_type, True, label_text_color)
+        label_rect = label_surf.get_rect(center=(rect.centerx, rect.top - 6))
         if self.health < self.max_health and label_rect.bottom > (self.pixel_y - bar_y_offset - 2):
-            label_rect.center = (self.rect.centerx, self.rect.bottom + 8)
+            label_rect.center = (rect.centerx, rect.bottom + 8)
         surface.blit(label_surf, label_rect)
 
     def get_tiles_in_movement_range(self, game_map):  # !!! BU METODUN TANIMI !!!
         in_range_tiles = []
         if not self.is_alive() or self.has_acted_this_turn: return in_range_tiles
-        for r_offset in range(-self.movement_range, self.movement_range + 1):
-            for c_offset in range(-self.movement_range, self.movement_range + 1):
-                # Manhattan mesafesi
-                distance = abs(r_offset) + abs(c_offset)
-                if distance == 0 or distance > self.movement_range:  # Kendisi veya menzil dışı
-                    continue
-
-                check_x = self.grid_x + c_offset
-                check_y = self.grid_y + r_offset
-
-                tile = game_map.get_tile_at_grid_coords(check_x, check_y)
-                if tile and tile.is_walkable and not tile.unit_on_tile:
-                    in_range_tiles.append(tile)
+        # Engelleri ve düşman birimlerini dolaşan gerçek yol araması (sadece ulaşılabilen kareler gezilir)
+        reachable, _ = game_map.find_reachable(self.grid_x, self.grid_y, self.movement_range, self.player_id)
+        for (check_x, check_y), cost in reachable.items():
+            if cost == 0: continue  # Kendisi
+            tile = game_map.get_tile_at_grid_coords(check_x, check_y)
+            if tile and not tile.unit_on_tile:  # Dost birimin üzerinden geçilebilir ama üzerinde durulamaz
+                in_range_tiles.append(tile)
         return in_range_tiles
 
+    def get_movement_paths(self, game_map):
+        """Hareket menzilindeki kareler için önceki-kare haritasını döndürür (Map.get_path ile yol çıkarılır)."""
+        _, came_from = game_map.find_reachable(self.grid_x, self.grid_y, self.movement_range, self.player_id)
+        return came_from
+
     def get_tiles_in_attack_range(self, game_map):  # !!! BU METODUN TANIMI (min_attack_range KULLANILIYOR) !!!
         in_range_attack_tiles = []  # Sadece saldırılabilecek düşmanların olduğu tile'ları tutar
         if not self.is_alive() or self.has_acted_this_turn: return in_range_attack_tiles
@@ -141,8 +170,11 @@ class Unit:
                 check_x = self.grid_x + c_offset
                 check_y = self.grid_y + r_offset
 
+                # Önce sıkıştırılmış owner katmanına bak, sadece düşman olan karelerde Tile nesnesine in
+                occupant_owner = game_map.owner_at(check_x, check_y)
+                if occupant_owner == NO_OWNER or occupant_owner == self.player_id: continue
                 tile = game_map.get_tile_at_grid_coords(check_x, check_y)
-                if tile and tile.unit_on_tile and tile.unit_on_tile.is_alive() and tile.unit_on_tile.player_id != self.player_id:
+                if tile and tile.unit_on_tile and tile.unit_on_tile.is_alive():
                     in_range_attack_tiles.append(tile)
         return in_range_attack_tiles
 
@@ -156,38 +188,32 @@ class Unit:
         if not self.is_alive():  # Eylem yapmış olması önemli değil, potansiyel menzili gösteriyoruz
             return attack_zone_coords
 
-        for r_offset in range(-self.attack_range, self.attack_range + 1):
-            for c_offset in range(-self.attack_range, self.attack_range + 1):
-                if r_offset == 0 and c_offset == 0:  # Kendi hücresi
-                    continue
-
-                distance = abs(r_offset) + abs(c_offset)
-
-                # Minimum ve maksimum saldırı menzili içinde mi?
-                if not (self.min_attack_range <= distance <= self.attack_range):
-                    continue
+        # Minimum ve maksimum saldırı menzili arasındaki halka ofsetleri önceden hesaplanmış çekirdekten gelir
+        for c_offset, r_offset in ring_kernel(self.min_attack_range, self.attack_range):
+            check_x = self.grid_x + c_offset
+            check_y = self.grid_y + r_offset
 
-                check_x = self.grid_x + c_offset
-                check_y = self.grid_y + r_offset
-
-                # Harita sınırları içinde mi diye kontrol et
-                if 0 <= check_x < game_map.cols and 0 <= check_y < game_map.rows:
-                    # Bu kareye saldırılabilir (üzerinde ne olduğu önemli değil)
-                    # Engel kontrolü de eklenebilir (eğer tile'larda is_targetable_through gibi bir özellik olsaydı)
-                    attack_zone_coords.add((check_x, check_y))
+            # Harita sınırları içinde mi diye kontrol et
+            if 0 <= check_x < game_map.cols and 0 <= check_y < game_map.rows:
+                # Bu kareye saldırılabilir (üzerinde ne olduğu önemli değil)
+                attack_zone_coords.add((check_x, check_y))
 
         return attack_zone_coords
 
+    def set_health(self, value):
+        self.health = value
+        if self.health_listener: self.health_listener(self)
+
     def take_damage(self, amount):
-        self.health -= amount
-        print(f"P{self.player_id} {self.unit_type}(ID:{self.id}) took {amount} dmg, HP:{self.health}")
-        if self.health <= 0: self.health = 0; self.die()
+        self.set_health(max(0, self.health - amount))
+        logger.debug("P%s %s(ID:%s) took %s dmg, HP:%s", self.player_id, self.unit_type, self.id, amount, self.health)
+        if self.health <= 0: self.die()
 
     def is_alive(self):
         return self.health > 0
 
     def die(self):
-        print(f"P{self.player_id} {self.unit_type}(ID:{self.id}) at ({self.grid_x},{self.grid_y}) died!")
+        logger.debug("P%s %s(ID:%s) at (%s,%s) died!", self.player_id, self.unit_type, self.id, self.grid_x, self.grid_y)
 
     def to_dict(self):
         return {"id": self.id, "unit_type": self.unit_type, "player_id": self.player_id,
@@ -202,6 +228,8 @@ class Unit:
 
 
 class Piyade(Unit):
+    __slots__ = ()
+
     def __init__(self, grid_x, grid_y, player_id):
         # Renk ve size Unit.draw ve tema tarafından yönetilecek, buradaki color geçici
         super().__init__(grid_x, grid_y, "Piyade", player_id, color=(0, 0, 0), size=28)
@@ -214,6 +242,8 @@ class Piyade(Unit):
 
 
 class Tank(Unit):
+    __slots__ = ()
+
     def __init__(self, grid_x, grid_y, player_id):
         super().__init__(grid_x, grid_y, "Tank", player_id, color=(0, 0, 0), size=32)
         self.max_health = 180;
@@ -225,6 +255,8 @@ class Tank(Unit):
 
 
 class Topcu(Unit):
+    __slots__ = ()
+
     def __init__(self, grid_x, grid_y, player_id):
         super().__init__(grid_x, grid_y, "Topcu", player_id, color=(0, 0, 0), size=26)
         self.max_health = 70;
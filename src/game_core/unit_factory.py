@@ -1,5 +1,11 @@
 # src/game_core/unit_factory.py
+import logging
+
 from .unit import Piyade, Tank, Topcu
+
+logger = logging.getLogger(__name__)
+
+
 class UnitFactory:
     @staticmethod
     def create_unit(unit_type, grid_x, grid_y, player_id):
@@ -10,5 +16,5 @@ class UnitFactory:
         elif unit_type == "Topcu": # !!! YENİ BLOK !!!
             return Topcu(grid_x, grid_y, player_id)
         else:
-            print(f"Uyarı: Bilinmeyen birim tipi '{unit_type}'. Varsayılan olarak Piyade oluşturuluyor.")
+            logger.warning("Bilinmeyen birim tipi '%s'. Varsayılan olarak Piyade oluşturuluyor.", unit_type)
             return Piyade(grid_x, grid_y, player_id)
\ No newline at end of file
@@ -1,7 +1,10 @@
 # src/game_core/unit_states.py
-import pygame
+import logging
+
 from .commands import MoveUnitCommand, AttackCommand
 
+logger = logging.getLogger(__name__)
+
 
 class UnitState:
     def __init__(self, unit):
@@ -36,7 +39,7 @@ class IdleState(UnitState):
 
         # !!! YENİ KONTROL: Eğer birim bu tur zaten eylem yaptıysa, tekrar seçilemez !!!
         if self.unit.has_acted_this_turn:
-            print(f"{self.unit.unit_type} (ID:{self.unit.id}) has already acted this turn.")
+            logger.info("%s (ID:%s) has already acted this turn.", self.unit.unit_type, self.unit.id)
             game_instance.show_feedback_message("Unit has already acted!", game_instance.feedback_message_duration // 2)
             # Seçimi temizle (eğer başka bir birim seçiliyse)
             if game_instance.selected_unit and game_instance.selected_unit != self.unit:
@@ -61,7 +64,7 @@ class SelectedState(UnitState):
         # Eğer birim zaten eylem yapmışsa bu duruma hiç girmemeli (IdleState kontrol etmeli)
         # Ama ek bir kontrol olarak burada da yapılabilir.
         if game_instance and self.unit.has_acted_this_turn:
-            print(f"Attempted to select an already acted unit (ID:{self.unit.id}). Reverting to Idle.")
+            logger.info("Attempted to select an already acted unit (ID:%s). Reverting to Idle.", self.unit.id)
             self.unit.set_state(IdleState(self.unit), game_instance)
             return
 
@@ -106,7 +109,7 @@ class SelectedState(UnitState):
                 if game_instance.execute_command(move_command):
                     action_command_executed = True
             else:
-                print(f"Target tile for movement out of range or invalid for {self.unit.unit_type}.")
+                logger.info("Target tile for movement out of range or invalid for %s.", self.unit.unit_type)
 
         elif clicked_tile.unit_on_tile and clicked_tile.unit_on_tile.player_id != self.unit.player_id:  # Saldırı
             target_unit = clicked_tile.unit_on_tile
@@ -115,10 +118,10 @@ class SelectedState(UnitState):
                 if game_instance.execute_command(attack_command):
                     action_command_executed = True
             else:
-                print(f"Target unit for attack out of range or invalid for {self.unit.unit_type}.")
+                logger.info("Target unit for attack out of range or invalid for %s.", self.unit.unit_type)
 
         else:
-            print(f"Invalid action or target on selected unit. {self.unit.unit_type} remains selected.")
+            logger.info("Invalid action or target on selected unit. %s remains selected.", self.unit.unit_type)
             return  # Geçersiz tıklamada state değişmiyor, seçili kalıyor.
 
         if action_command_executed:
@@ -0,0 +1,274 @@
+# src/game_core/user_store.py
+# Kullanıcı hesapları, tema tercihleri ve seviye skorları için depolama katmanı.
+# Game dosya biçimini bilmez, sadece UserStore arayüzünü kullanır:
+#   - JsonUserStore: eski users.json dosyası (bellekte tutulur, sadece değişiklikte yazılır)
+#   - SqliteUserStore: WAL kipinde SQLite; tek satırlık upsert'ler, kullanıcı adı ve (seviye, skor) indeksleri.
+#     İlk açılışta mevcut users.json içeriğini kendiliğinden içeri aktarır.
+import json
+import logging
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THEME_ID = "default"
+
+
+def level_key(level_number):
+    return f"level{level_number}"
+
+
+def level_number_from_key(level_id):
+    return int(str(level_id).replace("level", ""))
+
+
+def normalize_user_record(record):
+    """Eski kayıt biçimlerini ({"user": "şifre"}) {"password", "theme", "scores"} sözlüğüne çevirir."""
+    if isinstance(record, str): return {"password": record, "theme": DEFAULT_THEME_ID, "scores": {}}
+    if not isinstance(record, dict): return {"password": "", "theme": DEFAULT_THEME_ID, "scores": {}}
+    return {"password": record.get("password", ""), "theme": record.get("theme", DEFAULT_THEME_ID),
+            "scores": dict(record.get("scores", {}))}
+
+
+class UserStore(ABC):
+    """Depolama arka uçlarının ortak arayüzü. Skorlar seviye numarası (int) ile adreslenir.
+    Soyut metotların hepsini gerçeklemeyen arka uç örneklenemez (TypeError)."""
+    version = 0  # Skorlar değiştikçe artar; skor tablosu gibi okuyucular önbelleklerini buna göre yeniler
+
+    @abstractmethod
+    def user_exists(self, username): ...
+
+    @abstractmethod
+    def create_user(self, username, password, theme=DEFAULT_THEME_ID): ...
+
+    @abstractmethod
+    def check_password(self, username, password): ...
+
+    @abstractmethod
+    def get_theme(self, username): ...
+
+    @abstractmethod
+    def set_theme(self, username, theme): ...
+
+    @abstractmethod
+    def get_best_score(self, username, level_number): ...
+
+    @abstractmethod
+    def set_best_score(self, username, level_number, score): ...
+
+    @abstractmethod
+    def level_scores(self):
+        """{seviye_no: [(skor, kullanıcı), ...]} döndürür (sıralama çağırana kalır)."""
+
+    def level_numbers(self):
+        """Skoru olan seviyelerin numaraları (küçükten büyüğe)."""
+        return sorted(self.level_scores())
+
+    def top_scores(self, level_number, limit, offset=0):
+        """Seviyenin skor sıralamasından [offset, offset + limit) aralığı: [(skor, kullanıcı), ...].
+        Sıra: yüksek skor önce, eşitlikte kullanıcı adına göre."""
+        rows = sorted(self.level_scores().get(level_number, []), key=lambda row: (-row[0], row[1]))
+        return rows[offset:offset + limit]
+
+    def close(self): pass
+
+
+class JsonUserStore(UserStore):
+    def __init__(self, path):
+        self.path = path
+        self.version = 0
+        self._users = None
+
+    def _data(self):
+        if self._users is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._users = data if isinstance(data, dict) else {}
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._users = {}
+        return self._users
+
+    def _record(self, username):
+        users = self._data()
+        record = users.get(username)
+        if not isinstance(record, dict) or "scores" not in record:
+            record = users[username] = normalize_user_record(record)
+        return record
+
+    def _flush(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data(), f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except IOError:
+            return False
+
+    def user_exists(self, username):
+        return username in self._data()
+
+    def create_user(self, username, password, theme=DEFAULT_THEME_ID):
+        if self.user_exists(username): return False
+        self._data()[username] = {"password": password, "theme": theme, "scores": {}}
+        return self._flush()
+
+    def check_password(self, username, password):
+        record = self._data().get(username)
+        if record is None: return False
+        if isinstance(record, str):  # Eski biçim: kullanıcı -> şifre; doğrulanınca yeni biçime yükselt
+            if record != password: return False
+            self._record(username)
+            self._flush()
+            return True
+        return isinstance(record, dict) and record.get("password") == password
+
+    def get_theme(self, username):
+        record = self._data().get(username)
+        return record.get("theme", DEFAULT_THEME_ID) if isinstance(record, dict) else DEFAULT_THEME_ID
+
+    def set_theme(self, username, theme):
+        record = self._record(username)
+        if record["theme"] == theme: return True
+        record["theme"] = theme
+        return self._flush()
+
+    def get_best_score(self, username, level_number):
+        record = self._data().get(username)
+        if not isinstance(record, dict): return 0
+        return record.get("scores", {}).get(level_key(level_number), 0)
+
+    def set_best_score(self, username, level_number, score):
+        self._record(username)["scores"][level_key(level_number)] = score
+        self.version += 1
+        return self._flush()
+
+    def level_scores(self):
+        result = {}
+        for username, record in self._data().items():
+            if not isinstance(record, dict): continue
+            for level_id, score in record.get("scores", {}).items():
+                result.setdefault(level_number_from_key(level_id), []).append((score, username))
+        return result
+
+
+class SqliteUserStore(UserStore):
+    def __init__(self, db_path, legacy_json_path=None):
+        self.db_path = db_path
+        self.version = 0
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # WAL ile güvenli, her commit'te fsync yapmaz
+        self._create_schema()
+        if legacy_json_path: self._migrate_from_json(legacy_json_path)
+
+    def _create_schema(self):
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    password TEXT NOT NULL,
+                    theme TEXT NOT NULL DEFAULT 'default');
+                CREATE TABLE IF NOT EXISTS scores (
+                    username TEXT NOT NULL,
+                    level INTEGER NOT NULL,
+                    score INTEGER NOT NULL,
+                    PRIMARY KEY (username, level));
+                CREATE INDEX IF NOT EXISTS idx_scores_level_score ON scores (level, score DESC, username);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+
+    def _migrate_from_json(self, json_path):
+        """users.json içeriğini bir kez içeri aktarır; dosyaya dokunmaz, tekrar açılışta atlanır."""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone(): return
+        users = JsonUserStore(json_path)._data() if os.path.exists(json_path) else {}
+        with self.conn:
+            for username, raw_record in users.items():
+                record = normalize_user_record(raw_record)
+                self.conn.execute("INSERT OR IGNORE INTO users (username, password, theme) VALUES (?, ?, ?)",
+                                  (username, record["password"], record["theme"]))
+                for level_id, score in record["scores"].items():
+                    self.conn.execute(
+                        "INSERT INTO scores (username, level, score) VALUES (?, ?, ?) "
+                        "ON CONFLICT (username, level) DO UPDATE SET score = MAX(score, excluded.score)",
+                        (username, level_number_from_key(level_id), score))
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (json_path,))
+        if users: logger.info("Migrated %s users from '%s' to '%s'.", len(users), json_path, self.db_path)
+
+    def _write(self, sql, params):
+        try:
+            with self.conn:
+                self.conn.execute(sql, params)
+            return True
+        except sqlite3.Error as e:
+            logger.warning("User store write failed: %s", e)
+            return False
+
+    def user_exists(self, username):
+        return self.conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def create_user(self, username, password, theme=DEFAULT_THEME_ID):
+        try:
+            with self.conn:
+                self.conn.execute("INSERT INTO users (username, password, theme) VALUES (?, ?, ?)",
+                                  (username, password, theme))
+            return True
+        except sqlite3.IntegrityError:  # Kullanıcı adı zaten alınmış
+            return False
+        except sqlite3.Error as e:
+            logger.warning("User store write failed: %s", e)
+            return False
+
+    def check_password(self, username, password):
+        row = self.conn.execute("SELECT password FROM users WHERE username = ?", (username,)).fetchone()
+        return row is not None and row[0] == password
+
+    def get_theme(self, username):
+        row = self.conn.execute("SELECT theme FROM users WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else DEFAULT_THEME_ID
+
+    def set_theme(self, username, theme):
+        return self._write("INSERT INTO users (username, password, theme) VALUES (?, '', ?) "
+                           "ON CONFLICT (username) DO UPDATE SET theme = excluded.theme", (username, theme))
+
+    def get_best_score(self, username, level_number):
+        row = self.conn.execute("SELECT score FROM scores WHERE username = ? AND level = ?",
+                                (username, level_number)).fetchone()
+        return row[0] if row else 0
+
+    def set_best_score(self, username, level_number, score):
+        ok = self._write("INSERT INTO scores (username, level, score) VALUES (?, ?, ?) "
+                         "ON CONFLICT (username, level) DO UPDATE SET score = excluded.score",
+                         (username, level_number, score))
+        if ok: self.version += 1
+        return ok
+
+    def level_scores(self):
+        result = {}
+        for level, score, username in self.conn.execute(
+                "SELECT level, score, username FROM scores ORDER BY level, score DESC"):
+            result.setdefault(level, []).append((score, username))
+        return result
+
+    def level_numbers(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT level FROM scores ORDER BY level")]
+
+    def top_scores(self, level_number, limit, offset=0):
+        # idx_scores_level_score sayesinde sadece istenen sayfa okunur
+        return self.conn.execute("SELECT score, username FROM scores WHERE level = ? "
+                                 "ORDER BY score DESC, username LIMIT ? OFFSET ?",
+                                 (level_number, limit, offset)).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+def create_user_store(db_path, legacy_json_path):
+    """Varsayılan arka uç SQLite; sqlite3 kullanılamazsa eski JSON dosyasına düşülür."""
+    try:
+        return SqliteUserStore(db_path, legacy_json_path)
+    except sqlite3.Error as e:
+        logger.warning("SQLite user store unavailable (%s), falling back to '%s'.", e, legacy_json_path)
+        return JsonUserStore(legacy_json_path)
@@ -0,0 +1,25 @@
+# src/game_core/zobrist.py
+# Zobrist anahtarları: her (tür, ...) demetine demetten türetilen sabit, 64 bitlik sözde rastgele bir sayı.
+# Bir konumun hash'i, içindeki parçaların anahtarlarının XOR'udur; parça değişince sadece
+# eski anahtar çıkarılıp yenisi eklenir (XOR), böylece hash O(1) güncellenir.
+# Kullananlar: search.SearchState (arama düğümleri), Map.position_hash (karar önbelleği).
+import hashlib
+
+_ZOBRIST_KEYS = {}  # Türetilmiş anahtarların önbelleği (değer önbellekten bağımsız, sadece hız için)
+
+HP_BUCKET_SIZE = 5  # Harita hash'inde can bu genişlikte dilimlere ayrılır
+
+
+def zobrist_key(*parts):
+    """(tür, ...) demeti için 64 bitlik anahtar. Anahtar demetin kendisinden (blake2b) türetilir: hangi anahtarın
+    önce istendiğine, süreçteki önceki oyunlara ve süreç/oturuma bağlı değildir, aynı tohumlu oyun hep aynı oynanır."""
+    key = _ZOBRIST_KEYS.get(parts)
+    if key is None:
+        key = _ZOBRIST_KEYS[parts] = int.from_bytes(
+            hashlib.blake2b(repr(parts).encode(), digest_size=8).digest(), "big")
+    return key
+
+
+def unit_key(unit, cell_index):
+    """Birimin harita hash'ine katkısı: tür, sahip, can dilimi ve konum (birim id'si dahil değil, yer değiştirmeler eşleşir)."""
+    return zobrist_key('unit', unit.unit_type, unit.player_id, unit.health // HP_BUCKET_SIZE, cell_index)
@@ -1,7 +1,10 @@
 from game_core.game import Game
+from game_core.logging_config import configure_logging
 import os
 
 if __name__ == "__main__":
+    configure_logging(default_level="INFO")  # GAME_LOG_LEVEL=DEBUG ile AI kararları da görünür
+
     game_width = 15 * 40
     game_height = 10 * 40
 
@@ -0,0 +1,155 @@
+# src/tournament.py
+# Pencere açmadan toplu AI - AI turnuvası: levels/ altındaki her seviye, her (insan tarafı, AI tarafı)
+# strateji çifti için N oyun. Oyunlar bütün çekirdeklere bir süreç havuzuyla dağıtılır; her oyunun tohumu
+# (--seed + oyun sırası) sonuçta yazılır. Bir işçi süreç birden fazla oyun oynasa da oyunlar birbirini etkilemez
+# (Zobrist anahtarları süreç geçmişine bağlı değil): süre sınırı olmayan stratejilerle (SimpleAggressive, Defensive)
+# tek bir oyun Simulator(seed=...) ile birebir tekrar oynatılabilir. Lookahead/MCTS aramaları süre bütçelidir,
+# sonuçları makine hızına ve yüke göre değişebilir.
+# Çıktılar (--out klasörü):
+#   games.csv     oyun başına bir satır
+#   summary.json  seviye + strateji çifti başına kazanma oranları, ortalama tur, skor dağılımı, karar süreleri
+# Kullanım: python tournament.py --games 20 [--levels 1 3] [--strategies SimpleAggressiveStrategy DefensiveStrategy]
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_core.constants import PLAYER_HUMAN_ID, PLAYER_AI_ID
+from game_core.game_state import LEVELS_DIR, create_ai_strategies, load_level_data
+from game_core.simulator import Simulator
+
+GAME_CSV_COLUMNS = ("level_number", "human_strategy", "ai_strategy", "seed", "result", "winner", "turns", "score",
+                    "human_units_left", "ai_units_left", "decisions", "mean_decision_ms", "max_decision_ms",
+                    "wall_time_s")
+
+
+def discover_levels():
+    """levels/levelN.json dosyalarının numaraları (sıralı)."""
+    numbers = []
+    for path in glob.glob(os.path.join(LEVELS_DIR, "level*.json")):
+        match = re.fullmatch(r"level(\d+)\.json", os.path.basename(path))
+        if match: numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values: return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _distribution(values):
+    values = sorted(values)
+    if not values: return {}
+    return {"min": values[0], "p25": _percentile(values, 0.25), "median": statistics.median(values),
+            "p75": _percentile(values, 0.75), "max": values[-1], "mean": statistics.fmean(values)}
+
+
+def _run_game(job):
+    # İşçi süreçte tek oyun; game_core günlüğü yapılandırılmadığı için sadece uyarılar görünür
+    level_number, human_strategy, ai_strategy, seed, max_turns = job
+    started = time.perf_counter()
+    simulator = Simulator(level_number, load_level_data(level_number), human_strategy_id=human_strategy,
+                          ai_strategy_id=ai_strategy, max_turns=max_turns, seed=seed, record_decision_times=True)
+    mcts = simulator.state.ai_strategies.get("MCTSStrategy")
+    if mcts: mcts.search.workers = 1  # Turnuva zaten her çekirdeği kullanıyor; iç içe süreç havuzu açılmasın
+    result = simulator.run()
+    times_ms = [t * 1000.0 for t in result.pop("decision_times")]
+    result.update({"human_strategy": human_strategy, "ai_strategy": ai_strategy, "decisions": len(times_ms),
+                   "mean_decision_ms": round(statistics.fmean(times_ms), 3) if times_ms else 0.0,
+                   "max_decision_ms": round(max(times_ms), 3) if times_ms else 0.0,
+                   "wall_time_s": round(time.perf_counter() - started, 3), "_decision_times_ms": times_ms})
+    return result
+
+
+def build_jobs(levels, strategies, games, base_seed, max_turns):
+    jobs = []
+    for level_number in levels:
+        for human_strategy in strategies:
+            for ai_strategy in strategies:
+                for game_index in range(games):
+                    jobs.append((level_number, human_strategy, ai_strategy, base_seed + game_index, max_turns))
+    return jobs
+
+
+def summarize(results):
+    groups = {}
+    for result in results:
+        groups.setdefault((result["level_number"], result["human_strategy"], result["ai_strategy"]), []).append(result)
+    summary = []
+    for (level_number, human_strategy, ai_strategy), group in sorted(groups.items()):
+        games = len(group)
+        decision_times = sorted(t for r in group for t in r["_decision_times_ms"])
+        summary.append({
+            "level_number": level_number, "human_strategy": human_strategy, "ai_strategy": ai_strategy,
+            "games": games,
+            "human_win_rate": sum(r["winner"] == PLAYER_HUMAN_ID for r in group) / games,
+            "ai_win_rate": sum(r["winner"] == PLAYER_AI_ID for r in group) / games,
+            "undecided_rate": sum(r["winner"] is None for r in group) / games,
+            "avg_turns": statistics.fmean(r["turns"] for r in group),
+            "score": _distribution([r["score"] for r in group]),
+            "decision_ms": {"count": len(decision_times),
+                            "mean": statistics.fmean(decision_times) if decision_times else None,
+                            "p50": _percentile(decision_times, 0.5), "p95": _percentile(decision_times, 0.95),
+                            "max": decision_times[-1] if decision_times else None},
+        })
+    return summary
+
+
+def run_tournament(levels, strategies, games, base_seed=0, max_turns=None, workers=None):
+    jobs = build_jobs(levels, strategies, games, base_seed, max_turns)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        results = [_run_game(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_game, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return results, summarize(results)
+
+
+def write_outputs(out_dir, results, summary):
+    os.makedirs(out_dir, exist_ok=True)
+    games_path = os.path.join(out_dir, "games.csv")
+    with open(games_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=GAME_CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    summary_path = os.path.join(out_dir, "summary.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return games_path, summary_path
+
+
+def main(argv=None):
+    available = list(create_ai_strategies())
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI games for every level and strategy pair.")
+    parser.add_argument("--games", type=int, default=10, help="games per level and strategy pair")
+    parser.add_argument("--levels", type=int, nargs="*", help="level numbers (default: every file in levels/)")
+    parser.add_argument("--strategies", nargs="*", choices=available, default=available,
+                        help="strategies to pair up (default: all registered)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game in each pairing")
+    parser.add_argument("--max-turns", type=int, default=None, help="turn limit (default: level's max_turns)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--out", default="tournament_results", help="output directory for games.csv / summary.json")
+    args = parser.parse_args(argv)
+
+    levels = args.levels or discover_levels()
+    started = time.perf_counter()
+    results, summary = run_tournament(levels, args.strategies, args.games, args.seed, args.max_turns, args.workers)
+    games_path, summary_path = write_outputs(args.out, results, summary)
+
+    print(f"{len(results)} games in {time.perf_counter() - started:.1f}s -> {games_path}, {summary_path}")
+    for row in summary:
+        print(f"Level {row['level_number']} {row['human_strategy']} vs {row['ai_strategy']}: "
+              f"human {row['human_win_rate']:.0%} / ai {row['ai_win_rate']:.0%}, avg turns {row['avg_turns']:.1f}, "
+              f"decision p95 {row['decision_ms']['p95'] or 0:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
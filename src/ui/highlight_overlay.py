@@ -0,0 +1,58 @@
+# src/ui/highlight_overlay.py
+# Hareket, saldırı ve AI tehdit vurgularını tek bir yarı saydam Surface'te birleştirir.
+# Kare başına kullanılan renkli "damgalar" (stamp) tema/renk/karo boyutu başına bir kez oluşturulur;
+# birleşik Surface ise sadece vurgu kümeleri, tehdit haritası veya görünen alan (viewport) değiştiğinde yeniden
+# kurulur. Surface harita değil viewport boyutundadır; viewport dışındaki vurgular atlanır.
+import pygame
+
+
+class HighlightOverlay:
+    def __init__(self):
+        self._stamps = {}
+        self._theme_id = None
+        self._surface = None
+        self._key = None
+
+    def invalidate(self):
+        self._stamps.clear()
+        self._surface = None
+        self._key = None
+
+    def stamp(self, color, tile_size):
+        key = (tuple(color), tile_size)
+        stamp_surf = self._stamps.get(key)
+        if stamp_surf is None:
+            stamp_surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+            stamp_surf.fill(color)
+            self._stamps[key] = stamp_surf
+        return stamp_surf
+
+    def surface(self, viewport, tile_size, active_theme, move_coords, attack_coords, threat_coords=None,
+                threat_version=None):
+        """Birleşik vurgu Surface'ini döndürür (viewport boyutunda, ekranda viewport'un sol üstüne blit edilir).
+        viewport harita piksel koordinatlarında Rect; move/attack_coords (x, y) demetleri; threat_coords ve
+        threat_version sadece tehdit gösterimi açıkken verilir (version değişmedikçe yeniden çizilmez)."""
+        theme_id = active_theme.get("id")
+        if theme_id != self._theme_id:  # Tema değişti: eski renklerdeki damgalar geçersiz
+            self.invalidate()
+            self._theme_id = theme_id
+        key = (tuple(viewport), tile_size, tuple(move_coords), tuple(attack_coords),
+               threat_version if threat_coords is not None else None)
+        if key == self._key and self._surface is not None:
+            return self._surface
+
+        overlay = pygame.Surface(viewport.size, pygame.SRCALPHA)
+        min_x, min_y = viewport.left // tile_size, viewport.top // tile_size
+        max_x, max_y = (viewport.right - 1) // tile_size, (viewport.bottom - 1) // tile_size
+        layers = [(move_coords, active_theme.get("highlight_move", (0, 255, 0, 80))),
+                  (attack_coords, active_theme.get("highlight_attack", (255, 0, 0, 80)))]
+        if threat_coords is not None:
+            layers.append((threat_coords, active_theme.get("ai_threat_range_color", (128, 0, 128, 70))))
+        for coords, color in layers:
+            stamp_surf = self.stamp(color, tile_size)
+            for gx, gy in coords:
+                if min_x <= gx <= max_x and min_y <= gy <= max_y:
+                    overlay.blit(stamp_surf, (gx * tile_size - viewport.x, gy * tile_size - viewport.y))
+        self._surface = overlay
+        self._key = key
+        return overlay
@@ -0,0 +1,81 @@
+# src/ui/map_renderer.py
+# Oyun ekranı için katmanlı çizim yardımcıları.
+# Karo (tile) katmanı haritanın ekranda görünen kısmı (viewport) için seviye/tema/viewport başına bir kez
+# önceden çizilip Surface olarak saklanır; her karede sadece bu Surface blit edilir. Katman ekran boyutunu
+# aşmaz ve sadece görünen karelerin Tile parçaları kurulur: büyük haritalar da aynı maliyetle çizilir. Ayrıca bir önceki kareyle karşılaştırılarak
+# hiçbir şey değişmediyse çizim tamamen atlanır, sadece birimler değiştiyse kirli alanlar güncellenir.
+import pygame
+
+
+class MapRenderer:
+    def __init__(self):
+        self._static_layer = None
+        self._static_key = None
+        self._last_frame_key = None
+        self._last_unit_states = None
+
+    def invalidate(self):
+        """Statik katmanı ve kare önbelleğini geçersiz kılar (tema/seviye değişimi)."""
+        self._static_layer = None
+        self._static_key = None
+        self.invalidate_frame()
+
+    def invalidate_frame(self):
+        """Bir sonraki karenin tamamen yeniden çizilip flip edilmesini sağlar (ör. başka ekrandan dönüşte)."""
+        self._last_frame_key = None
+        self._last_unit_states = None
+
+    @staticmethod
+    def viewport(game_map, screen_size, origin=(0, 0)):
+        """Haritanın ekranda görünen kısmı (harita piksel koordinatlarında Rect); harita ekrandan büyükse kırpılır."""
+        map_rect = pygame.Rect(0, 0, game_map.cols * game_map.tile_size, game_map.rows * game_map.tile_size)
+        return pygame.Rect(origin, screen_size).clip(map_rect)
+
+    def static_layer(self, game_map, active_theme, viewport):
+        """viewport boyutunda karo katmanı; ekranda viewport'un sol üstüne denk gelen noktaya blit edilir."""
+        key = (id(game_map), game_map.terrain_version, active_theme.get("id"),
+               game_map.rows, game_map.cols, game_map.tile_size, tuple(viewport))
+        if key != self._static_key:
+            tile_size = game_map.tile_size
+            layer = pygame.Surface(viewport.size)
+            for grid_y in range(viewport.top // tile_size, (viewport.bottom + tile_size - 1) // tile_size):
+                for grid_x in range(viewport.left // tile_size, (viewport.right + tile_size - 1) // tile_size):
+                    game_map.get_tile_at_grid_coords(grid_x, grid_y).draw(layer, active_theme, viewport.x, viewport.y)
+            self._static_layer = layer
+            self._static_key = key
+        return self._static_layer
+
+    @staticmethod
+    def _unit_states(game_map):
+        return {u.id: (u.pixel_x, u.pixel_y, u.size, u.health, u.has_acted_this_turn, u.is_graphically_selected)
+                for u in game_map.units if u.is_alive()}
+
+    @staticmethod
+    def _unit_dirty_rect(unit_state, tile_size):
+        # Birimin kendisi + üstündeki can barı + altına/üstüne taşabilen etiket yazısı
+        pixel_x, pixel_y, size = unit_state[0], unit_state[1], unit_state[2]
+        return pygame.Rect(int(pixel_x) - tile_size, int(pixel_y) - tile_size // 2 - 4,
+                           size + 2 * tile_size, size + tile_size + 8)
+
+    def plan_frame(self, game_map, overlay_key):
+        """Bu karenin nasıl çizileceğine karar verir. (needs_draw, dirty_rects) döndürür;
+        dirty_rects None ise tüm ekran flip edilmeli, liste ise sadece o alanlar güncellenmeli.
+        overlay_key, birimler dışında ekranda görünen her şeyi (vurgular, HUD yazıları) temsil etmeli."""
+        unit_states = self._unit_states(game_map)
+        frame_key = (self._static_key, overlay_key)
+        if frame_key == self._last_frame_key and unit_states == self._last_unit_states:
+            return False, []  # Boşta kare: hiçbir şey değişmedi
+
+        dirty_rects = None
+        if frame_key == self._last_frame_key and self._last_unit_states is not None:
+            # Sadece birimler değişti: eski ve yeni konumlarını güncellemek yeterli
+            dirty_rects = []
+            for unit_id in set(unit_states) | set(self._last_unit_states):
+                old_state = self._last_unit_states.get(unit_id)
+                new_state = unit_states.get(unit_id)
+                if old_state == new_state: continue
+                for state in (old_state, new_state):
+                    if state: dirty_rects.append(self._unit_dirty_rect(state, game_map.tile_size))
+        self._last_frame_key = frame_key
+        self._last_unit_states = unit_states
+        return True, dirty_rects
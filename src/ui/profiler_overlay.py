@@ -0,0 +1,57 @@
+# src/ui/profiler_overlay.py
+# Profiler istatistiklerini (p50/p95/p99, ms) ekranın sağ üstünde yarı saydam bir panelde gösterir.
+# Panel her karede değil REFRESH_FRAMES karede bir yeniden kurulur; değişen sayılar yazı önbelleğini
+# (TextSurfaceCache) doldurmasın diye yazılar doğrudan font.render ile çizilir (sütunlar için eş aralıklı font).
+import pygame
+
+REFRESH_FRAMES = 30
+MAX_ROWS = 18
+PANEL_BG = (10, 10, 10, 190)
+PANEL_TEXT = (220, 230, 160)
+LINE_HEIGHT = 16
+
+
+class ProfilerOverlay:
+    def __init__(self):
+        self.visible = False
+        self.version = 0  # Panel yeniden çizildikçe artar (render_gameplay'in kare anahtarı için)
+        self._surface = None
+        self._frames_until_refresh = 0
+        self._font = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._surface = None
+        self._frames_until_refresh = 0
+        return self.visible
+
+    def frame_key(self):
+        """Her karede bir kez çağrılır; panelin bu karedeki sürümünü (gizliyse None) döndürür.
+        REFRESH_FRAMES karede bir sürüm artar ve panel bir sonraki surface() çağrısında yeniden kurulur."""
+        if not self.visible: return None
+        if self._frames_until_refresh <= 0:
+            self._surface = None
+            self.version += 1
+            self._frames_until_refresh = REFRESH_FRAMES
+        else:
+            self._frames_until_refresh -= 1
+        return self.version
+
+    def surface(self, profiler):
+        """Güncel panel Surface'i (sürüm değişmedikçe aynı Surface)."""
+        if self._surface is not None: return self._surface
+        if self._font is None: self._font = pygame.font.SysFont("monospace", 13)
+        font = self._font
+        stats = profiler.stats()
+        rows = sorted(stats.items(), key=lambda item: -item[1]["p95_ms"])[:MAX_ROWS]
+        lines = [f"{'span':<26}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        lines += [f"{name[:25]:<26}{s['p50_ms']:8.2f}{s['p95_ms']:8.2f}{s['p99_ms']:8.2f}" for name, s in rows]
+        if not rows: lines.append("(no samples yet)")
+        rendered = [font.render(line, True, PANEL_TEXT) for line in lines]
+        width = max(r.get_width() for r in rendered) + 12
+        panel = pygame.Surface((width, LINE_HEIGHT * len(rendered) + 8), pygame.SRCALPHA)
+        panel.fill(PANEL_BG)
+        for i, text_surf in enumerate(rendered):
+            panel.blit(text_surf, (6, 4 + i * LINE_HEIGHT))
+        self._surface = panel
+        return panel
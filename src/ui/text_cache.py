@@ -0,0 +1,37 @@
+# src/ui/text_cache.py
+# font.render() her çağrıda yazıyı yeniden rasterize eder. Birim etiketleri, HUD ve menü yazıları
+# çoğu karede aynı kaldığı için oluşturulan Surface'ler (font, yazı, renk, antialias) anahtarıyla saklanır.
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class TextSurfaceCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """font.render(text, antialias, color) ile aynı, ama sonucu LRU önbellekte tutar."""
+        key = (font, text, tuple(color), bool(antialias))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # En uzun süredir kullanılmayanı at
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self._surfaces), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
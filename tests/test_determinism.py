@@ -0,0 +1,41 @@
+# tests/test_determinism.py
+# Aynı tohumlu oyun, süreçte daha önce ne oynandığından bağımsız olarak aynı sonucu vermeli
+# (Zobrist anahtarları, karar önbelleği ve AI RNG'si süreç geçmişine bağlı olmamalı).
+#   python -m unittest discover tests   ya da   python -m pytest tests
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path: sys.path.insert(0, SRC_DIR)
+
+from game_core.simulator import Simulator  # noqa: E402
+
+LEVEL, SEED, STRATEGY = 3, 42, "SimpleAggressiveStrategy"
+
+_RUN_SNIPPET = (
+    "import json, sys; from game_core.simulator import Simulator; "
+    "print(json.dumps(Simulator(level_number=int(sys.argv[1]), seed=int(sys.argv[2]), human_strategy_id=sys.argv[3], "
+    "ai_strategy_id=sys.argv[3]).run()))")
+
+
+def _summary(result):
+    return {k: result[k] for k in ("result", "winner", "turns", "score", "human_units_left", "ai_units_left")}
+
+
+class SeededGameDeterminismTest(unittest.TestCase):
+    def test_same_seed_cold_and_after_another_level(self):
+        cold = subprocess.run([sys.executable, "-c", _RUN_SNIPPET, str(LEVEL), str(SEED), STRATEGY], cwd=SRC_DIR,
+                              capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONPATH=SRC_DIR))
+        cold_result = json.loads(cold.stdout.strip().splitlines()[-1])
+
+        Simulator(level_number=1, seed=7, human_strategy_id=STRATEGY, ai_strategy_id=STRATEGY).run()
+        warm_result = Simulator(level_number=LEVEL, seed=SEED, human_strategy_id=STRATEGY,
+                                ai_strategy_id=STRATEGY).run()
+        self.assertEqual(_summary(cold_result), _summary(warm_result))
+
+
+if __name__ == "__main__":
+    unittest.main()